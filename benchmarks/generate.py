@@ -0,0 +1,120 @@
+import os
+import uuid
+import random
+import datetime
+import argparse
+
+from core.event import Event
+from core.file_format import FILE_ENCODING, header_line, schedule_line, recurrence_line, to_do_line
+
+# Words used for synthetic event and task descriptions
+DESCRIPTION_WORDS = ['meeting', 'review', 'lunch', 'call', 'gym', 'lecture', 'standup', 'dentist', 'project', 'deadline',
+                     'groceries', 'report', 'planning', 'interview', 'workshop', 'commute', 'reading', 'practice']
+
+# Recurrence frequencies and the long amounts used for synthetic recurring events
+RECURRENCE_FREQUENCIES = ['daily', 'weekly', 'monthly', 'yearly']
+RECURRENCE_AMOUNTS = [90, 180, 365, 999]
+
+def description(generator, length):
+    """
+    Returns a synthetic description
+
+    generator: Random number generator, random.Random
+    length: Maximum length of the description, int
+    return: Description, string
+    """
+    words = []
+    size = generator.randint(min(10, length), length)
+
+    while sum(len(word) + 1 for word in words) < size:
+        words.append(generator.choice(DESCRIPTION_WORDS))
+
+    return ' '.join(words)[:size].strip()
+
+def event(generator, recurrence_id, frequency, amount, description_length):
+    """
+    Returns a synthetic event
+
+    generator: Random number generator, random.Random
+    recurrence_id: Unique identifier of the recurrence, UUID, string
+    frequency: Event recurrence frequency, string
+    amount: Event recurrence amount, int
+    description_length: Maximum length of the description, int
+    return: Event information, Event
+    """
+    return Event(generator.randrange(24 * 60 // 5) * 5,
+                    generator.choice([0, 15, 30, 60, 90, 120]),
+                    generator.randrange(0x1000000),
+                    recurrence_id,
+                    frequency,
+                    amount,
+                    description(generator, description_length))
+
+def generate(directory, number_events, events_per_day=20, number_recurrences=None, number_tasks=None, description_length=200, seed=0):
+    """
+    Writes synthetic schedule, recurrences, and to-do list files centered on the current day
+
+    directory: Directory to write the files to, string
+    number_events: Number of events in the schedule file, int
+    events_per_day: Number of events on each scheduled day, int
+    number_recurrences: Number of recurring events, int, or None for one per hundred events
+    number_tasks: Number of to-do list tasks, int, or None for one per hundred events
+    description_length: Maximum length of descriptions, int
+    seed: Seed of the random number generator, int
+    """
+    generator = random.Random(seed)
+
+    if number_recurrences is None:
+        number_recurrences = max(1, number_events // 100)
+
+    if number_tasks is None:
+        number_tasks = max(1, number_events // 100)
+
+    os.makedirs(directory, exist_ok=True)
+
+    # Dense days around the current day
+    number_days = max(1, number_events // events_per_day)
+    first = datetime.date.today().toordinal() - number_days // 2
+
+    with open(os.path.join(directory, 'schedule.txt'), 'w', encoding=FILE_ENCODING) as opened_file:
+        opened_file.write(header_line())
+
+        # Lines in day order, as the application writes them; the first days take the events left over
+        for day in range(number_days):
+            key = first + day
+
+            for i in range(number_events // number_days + (1 if day < number_events % number_days else 0)):
+                event_id = str(uuid.UUID(int=generator.getrandbits(128)))
+                opened_file.write(schedule_line(key, event_id, event(generator, str(uuid.UUID(int=generator.getrandbits(128))), 'none', 1, description_length)))
+
+    # Long recurrences starting around the first scheduled day
+    with open(os.path.join(directory, 'recurrences.txt'), 'w', encoding=FILE_ENCODING) as opened_file:
+        opened_file.write(header_line())
+
+        for i in range(number_recurrences):
+            recurrence_id = str(uuid.UUID(int=generator.getrandbits(128)))
+            rule = {'key': first + generator.randrange(number_days),
+                    'leap_years': generator.random() < 0.5,
+                    'exceptions': set(),
+                    'event_info': event(generator, recurrence_id, generator.choice(RECURRENCE_FREQUENCIES), generator.choice(RECURRENCE_AMOUNTS), description_length)}
+            opened_file.write(recurrence_line(recurrence_id, rule))
+
+    with open(os.path.join(directory, 'tasks.txt'), 'w', encoding=FILE_ENCODING) as opened_file:
+        opened_file.write(header_line())
+
+        for i in range(number_tasks):
+            item = {'key': str(uuid.UUID(int=generator.getrandbits(128))), 'completion': str(generator.randint(0, 1)), 'description': description(generator, description_length)}
+            opened_file.write(to_do_line(item))
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Writes synthetic hourglass data files.')
+    parser.add_argument('directory', help='directory to write schedule.txt, recurrences.txt, and tasks.txt to')
+    parser.add_argument('--events', type=int, default=10000, help='number of events')
+    parser.add_argument('--events-per-day', type=int, default=20, help='number of events on each scheduled day')
+    parser.add_argument('--recurrences', type=int, default=None, help='number of recurring events')
+    parser.add_argument('--tasks', type=int, default=None, help='number of to-do list tasks')
+    parser.add_argument('--description-length', type=int, default=200, help='maximum length of descriptions')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the random number generator')
+    arguments = parser.parse_args()
+
+    generate(arguments.directory, arguments.events, arguments.events_per_day, arguments.recurrences, arguments.tasks, arguments.description_length, arguments.seed)
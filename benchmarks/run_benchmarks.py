@@ -0,0 +1,323 @@
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import datetime
+import tempfile
+import subprocess
+import tracemalloc
+
+from core.hourglass_model import HourglassModel
+from core.notification_scheduler import NotificationScheduler
+
+from benchmarks.generate import generate
+
+# Default numbers of events to benchmark with
+DEFAULT_SIZES = [10000, 100000]
+
+# Slowdown relative to the baseline above which a benchmark counts as a regression
+DEFAULT_THRESHOLD = 0.2
+
+def measure(run, setup=None, repeat=1, memory=True):
+    """
+    Times a function and, optionally, measures the peak memory it allocates
+
+    run: Function to measure, called with the values returned by setup, function
+    setup: Function returning a tuple of arguments for run, excluded from the measurements, function, or None
+    repeat: Number of timed runs; the fastest is reported, int
+    memory: Whether to measure the peak memory in a separate run, boolean
+    return: Dictionary, {'seconds': float, 'peak_bytes': int or None}
+    """
+    seconds = None
+
+    for i in range(repeat):
+        arguments = setup() if setup is not None else ()
+        start = time.perf_counter()
+        run(*arguments)
+        elapsed = time.perf_counter() - start
+
+        if seconds is None or elapsed < seconds:
+            seconds = elapsed
+
+    peak_bytes = None
+
+    if memory:
+        tracemalloc.start()
+        arguments = setup() if setup is not None else ()
+        tracemalloc.reset_peak()
+        run(*arguments)
+        peak_bytes = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    return {'seconds': seconds, 'peak_bytes': peak_bytes}
+
+def week_range(today):
+    """
+    Returns the first and last day of the week containing the given day, starting on Sunday
+
+    today: Day, datetime.date
+    return: Tuple of dates, (sunday, saturday)
+    """
+    sunday = today - datetime.timedelta(days=today.isoweekday() % 7)
+    return (sunday, sunday + datetime.timedelta(days=6))
+
+def core_benchmarks(directory, memory):
+    """
+    Runs the benchmarks that do not need a display
+
+    directory: Directory holding the schedule, recurrences, and to-do list files, string
+    memory: Whether to measure peak memory, boolean
+    return: Dictionary, {name: {'seconds': float, 'peak_bytes': int or None}}
+    """
+    results = {}
+    today = datetime.date.today()
+    sunday, saturday = week_range(today)
+
+    # Reading the schedule, recurrences, and to-do list files
+    results['load'] = measure(lambda model: model.open('text'), setup=lambda: (HourglassModel(directory),), memory=memory)
+
+    # Reading only the displayed week and the notified days, as done at a fast startup
+    results['load_week'] = measure(lambda model: model.open('text', sunday, max(saturday, today + datetime.timedelta(days=1))), setup=lambda: (HourglassModel(directory),), memory=memory)
+
+    model = HourglassModel(directory)
+    model.open('text')
+
+    # The partial read must find the same events of the week as the full read, or the fast startup time is meaningless
+    partial_model = HourglassModel(directory)
+    partial_model.open('text', sunday, max(saturday, today + datetime.timedelta(days=1)))
+
+    def week_events(week_model):
+        return sorted((key, event_id, event_info.fields()) for key, events in week_model.events_between(sunday, saturday).items() for event_id, event_info in events.items())
+
+    if week_events(partial_model) != week_events(model):
+        raise RuntimeError('partial read of the week differs from the full read')
+
+    # Writing the schedule, recurrences, and to-do list files
+    results['save'] = measure(model.save, memory=memory)
+
+    # Events of the displayed week
+    results['week'] = measure(lambda: model.events_between(sunday, saturday), repeat=20, memory=memory)
+
+    # Events of the next year, expanding long recurrences
+    results['year'] = measure(lambda: model.events_between(today, today + datetime.timedelta(days=365)), repeat=5, memory=memory)
+
+    # Planning and checking notifications for the current day and the next day
+    def notify():
+        now = datetime.datetime.now()
+        scheduler = NotificationScheduler()
+        scheduler.plan(model.events_between(today, today + datetime.timedelta(days=1)), now)
+        scheduler.next_time()
+        scheduler.due(now + datetime.timedelta(minutes=10), mark=False)
+
+    results['notify'] = measure(notify, repeat=20, memory=memory)
+
+    # Editing then removing an event of the displayed week, as done from the week view
+    def next_event():
+        week = model.events_between(sunday, saturday)
+        key = next(key for key in sorted(week) if week[key])
+        return (key, next(iter(week[key])))
+
+    def edit_remove(key, event_id):
+        event_info = model.schedule_event(key, event_id)
+        model.schedule_edit_occurrence(key, event_id, event_info.replace(description='edited'))
+
+        for edited_id, edited_info in model.events_between(sunday, saturday).get(key, {}).items():
+            if edited_info.description == 'edited':
+                model.schedule_remove_occurrence(key, edited_id)
+
+    results['edit_remove'] = measure(edit_remove, setup=next_event, repeat=5, memory=memory)
+
+    return results
+
+def gui_benchmarks(directory, memory):
+    """
+    Runs the benchmarks of the GUI; needs a display
+
+    directory: Directory holding the data directory of the application, string
+    memory: Whether to measure peak memory, boolean
+    return: Dictionary, {name: {'seconds': float, 'peak_bytes': int or None}}
+    """
+    # The application reads its files from the data directory of the working directory
+    from hourglass import Hourglass
+
+    results = {}
+    working_directory = os.getcwd()
+    os.chdir(directory)
+
+    try:
+        # Reading the files and building the window
+        hourglass = None
+
+        def startup():
+            nonlocal hourglass
+            hourglass = Hourglass()
+            hourglass._root.update()
+
+        start = time.perf_counter()
+        startup()
+        results['gui_startup'] = {'seconds': time.perf_counter() - start, 'peak_bytes': None}
+
+        # Wait for the rest of the schedule read in the background, then report each startup phase
+        while not any(phase == 'whole schedule' for phase, seconds in hourglass.startup_times):
+            hourglass._root.update()
+            time.sleep(0.01)
+
+        for phase, seconds in hourglass.startup_times:
+            results['gui_' + phase.replace(' ', '_')] = {'seconds': seconds, 'peak_bytes': None}
+
+        # Redrawing the displayed week
+        def update_week():
+            hourglass.update_week()
+            hourglass._root.update()
+
+        results['gui_update_week'] = measure(update_week, repeat=10, memory=memory)
+
+        # Checking for due notifications without showing them
+        hourglass.notify_mode = False
+        results['gui_notify'] = measure(hourglass._notify, repeat=10, memory=memory)
+
+        # Editing then removing an event of the displayed week, then redrawing it
+        sunday, saturday = week_range(hourglass.displayed_sunday.date())
+
+        def edit_remove():
+            week = hourglass.model.events_between(sunday, saturday)
+            key = next(key for key in sorted(week) if week[key])
+            event_id = next(iter(week[key]))
+            hourglass.model.schedule_remove_occurrence(key, event_id)
+            update_week()
+
+        results['gui_edit_remove'] = measure(edit_remove, repeat=5, memory=memory)
+
+        hourglass._root.destroy()
+        hourglass.close()
+    finally:
+        os.chdir(working_directory)
+
+    return results
+
+def start_virtual_display():
+    """
+    Starts a virtual X server and points the DISPLAY environment variable to it
+
+    return: Virtual X server process, subprocess.Popen
+    """
+    if shutil.which('Xvfb') is None:
+        raise RuntimeError('Xvfb is not installed')
+
+    number = 99
+
+    while os.path.exists('/tmp/.X11-unix/X' + str(number)):
+        number += 1
+
+    process = subprocess.Popen(['Xvfb', ':' + str(number), '-screen', '0', '1920x1080x24'], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    # Wait until the server accepts connections
+    for i in range(50):
+        if os.path.exists('/tmp/.X11-unix/X' + str(number)):
+            break
+
+        time.sleep(0.1)
+
+    os.environ['DISPLAY'] = ':' + str(number)
+    return process
+
+def compare(results, baseline, threshold):
+    """
+    Returns the benchmarks slower than the baseline by more than the threshold
+
+    results: Dictionary, {size: {name: {'seconds': float, 'peak_bytes': int or None}}}
+    baseline: Dictionary in the same form as results
+    threshold: Allowed slowdown as a fraction of the baseline time, float
+    return: List of tuples, (size, name, seconds, baseline seconds)
+    """
+    regressions = []
+
+    for size, benchmarks in results.items():
+        for name, result in benchmarks.items():
+            expected = baseline.get(size, {}).get(name)
+
+            if expected is not None and result.get('seconds') > expected.get('seconds') * (1 + threshold):
+                regressions.append((size, name, result.get('seconds'), expected.get('seconds')))
+
+    return regressions
+
+def report(results, baseline):
+    """
+    Prints the results as a table
+
+    results: Dictionary, {size: {name: {'seconds': float, 'peak_bytes': int or None}}}
+    baseline: Dictionary in the same form as results, or None
+    """
+    print('{:>9}  {:<16}{:>12}{:>12}{:>10}'.format('events', 'benchmark', 'ms', 'peak MiB', 'change'))
+
+    for size, benchmarks in results.items():
+        for name, result in benchmarks.items():
+            peak = '-' if result.get('peak_bytes') is None else '{:.1f}'.format(result.get('peak_bytes') / 2**20)
+            change = ''
+            expected = (baseline or {}).get(size, {}).get(name)
+
+            if expected is not None and expected.get('seconds'):
+                change = '{:+.0%}'.format(result.get('seconds') / expected.get('seconds') - 1)
+
+            print('{:>9}  {:<16}{:>12.2f}{:>12}{:>10}'.format(size, name, result.get('seconds') * 1000, peak, change))
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmarks loading, saving, rendering, and notifying with synthetic hourglass data.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help='numbers of events to benchmark with')
+    parser.add_argument('--events-per-day', type=int, default=20, help='number of events on each scheduled day')
+    parser.add_argument('--description-length', type=int, default=200, help='maximum length of descriptions')
+    parser.add_argument('--gui', action='store_true', help='also benchmark the GUI; needs a display')
+    parser.add_argument('--xvfb', action='store_true', help='run the GUI benchmarks under a virtual X server')
+    parser.add_argument('--no-memory', action='store_true', help='do not measure peak memory')
+    parser.add_argument('--save-baseline', metavar='FILE', help='store the results as a baseline')
+    parser.add_argument('--compare', metavar='FILE', help='compare the results with a stored baseline')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, help='allowed slowdown relative to the baseline, as a fraction')
+    arguments = parser.parse_args()
+
+    baseline = None
+
+    if arguments.compare is not None:
+        with open(arguments.compare, 'r') as opened_file:
+            baseline = json.load(opened_file)
+
+    display = None
+
+    if arguments.xvfb:
+        display = start_virtual_display()
+
+    results = {}
+
+    try:
+        for size in arguments.sizes:
+            directory = tempfile.mkdtemp(prefix='hourglass_benchmark_')
+
+            try:
+                data_directory = os.path.join(directory, 'data')
+                generate(data_directory, size, arguments.events_per_day, description_length=arguments.description_length)
+
+                results[str(size)] = core_benchmarks(data_directory + '/', not arguments.no_memory)
+
+                if arguments.gui or arguments.xvfb:
+                    results[str(size)].update(gui_benchmarks(directory, not arguments.no_memory))
+            finally:
+                shutil.rmtree(directory)
+    finally:
+        if display is not None:
+            display.terminate()
+
+    report(results, baseline)
+
+    if arguments.save_baseline is not None:
+        with open(arguments.save_baseline, 'w') as opened_file:
+            json.dump(results, opened_file, indent=4)
+
+    if baseline is not None:
+        regressions = compare(results, baseline, arguments.threshold)
+
+        for size, name, seconds, expected in regressions:
+            print('regression: {} with {} events took {:.2f} ms, baseline {:.2f} ms'.format(name, size, seconds * 1000, expected * 1000))
+
+        if regressions:
+            sys.exit(1)
@@ -0,0 +1,107 @@
+import threading
+
+class BackgroundWriter:
+    """
+    Class for the thread that writes files in the background
+
+    Jobs are submitted by name and run one at a time in the order they were first submitted; a job submitted again before it
+    started replaces the waiting one, so repeated requests coalesce into a single write of the latest state
+    """
+    def __init__(self):
+        """
+        Initializes the BackgroundWriter class; the thread is started with the first job
+        """
+        self._condition = threading.Condition()
+        self._thread = None
+        self._closing = False
+
+        # Jobs waiting to run, in order of first submission, {name: job}
+        self._pending = {}
+
+        # Name of the job running, or None
+        self._running = None
+
+        # Jobs finished since the last poll, [(name, exception or None), ... ]
+        self._finished = []
+
+    def submit(self, name, job):
+        """
+        Queues a job, replacing a waiting job of the same name
+
+        name: Name of the job, string
+        job: Function taking no arguments, function
+        """
+        with self._condition:
+            self._pending[name] = job
+            self._condition.notify_all()
+
+            if self._thread is None or not self._thread.is_alive():
+                self._closing = False
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        """
+        Runs waiting jobs until closed
+        """
+        while True:
+            with self._condition:
+                while not self._pending and not self._closing:
+                    self._condition.wait()
+
+                if not self._pending:
+                    return
+
+                name = next(iter(self._pending))
+                job = self._pending.pop(name)
+                self._running = name
+
+            try:
+                job()
+                error = None
+            except Exception as exception:
+                error = exception
+
+            with self._condition:
+                self._running = None
+                self._finished.append((name, error))
+                self._condition.notify_all()
+
+    def poll(self):
+        """
+        Returns the jobs finished since the last poll
+
+        return: List of tuples, (name, exception raised by the job, or None)
+        """
+        with self._condition:
+            finished, self._finished = self._finished, []
+
+        return finished
+
+    def is_busy(self):
+        """
+        Returns whether a job is running or waiting
+
+        return: Whether the writer is busy, boolean
+        """
+        with self._condition:
+            return bool(self._pending) or self._running is not None
+
+    def wait(self):
+        """
+        Waits until all submitted jobs have finished
+        """
+        with self._condition:
+            while self._pending or self._running is not None:
+                self._condition.wait()
+
+    def close(self):
+        """
+        Finishes all submitted jobs, then stops the thread
+        """
+        with self._condition:
+            self._closing = True
+            self._condition.notify_all()
+
+        if self._thread is not None:
+            self._thread.join()
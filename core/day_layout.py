@@ -0,0 +1,51 @@
+import heapq
+
+def overlap_columns(intervals):
+    """
+    Returns where to place intervals of a day so overlapping ones sit side by side
+
+    Intervals are swept in order of start, keeping the ends of the active intervals in a heap; each interval takes the lowest
+    column freed by an interval that ended before it starts. A group of overlapping intervals ends once none of them is active,
+    so only the intervals of a group share its width. Takes O(n log n) time for n intervals
+
+    intervals: Iterable of tuples, (start, end, identifier), with end greater than start
+    return: Dictionary, {identifier: (column, number of columns of its group)}
+    """
+    layout = {}
+
+    # Ends and columns of the active intervals, and the columns freed within the current group
+    active = []
+    free = []
+
+    # Intervals of the current group, and the number of columns it uses
+    group = []
+    columns = 0
+
+    for start, end, identifier in sorted(intervals, key=lambda interval: (interval[0], interval[1])):
+        # Free the columns of the intervals ended by now
+        while active and active[0][0] <= start:
+            heapq.heappush(free, heapq.heappop(active)[1])
+
+        # A new group starts once every interval of the current one has ended
+        if not active:
+            for member in group:
+                layout[member] = (layout.get(member), columns)
+
+            group = []
+            free = []
+            columns = 0
+
+        if free:
+            column = heapq.heappop(free)
+        else:
+            column = columns
+            columns += 1
+
+        heapq.heappush(active, (end, column))
+        layout[identifier] = column
+        group.append(identifier)
+
+    for member in group:
+        layout[member] = (layout.get(member), columns)
+
+    return layout
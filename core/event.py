@@ -0,0 +1,126 @@
+import sys
+
+from utilities.constants import NUMBER_HOURS_IN_DAY, NUMBER_MINUTES_IN_HOUR, EVENT_RECURRENCE_FREQUENCY_DAYS
+
+class Event:
+    """
+    Class for the information of a scheduled event
+
+    Times are kept as minutes and the color as a packed RGB integer; strings are only formatted for files and display.
+    Events are not changed once created, edits replace them with new events
+    """
+    __slots__ = ('start', 'duration', 'color', 'recurrence_id', 'frequency', 'amount', 'description')
+
+    def __init__(self, start, duration, color, recurrence_id, frequency, amount, description):
+        """
+        Initializes the Event class
+
+        start: Start time as the number of minutes after midnight, int
+        duration: Duration in minutes, int
+        color: Color as a packed RGB integer, 0xrrggbb, int
+        recurrence_id: Unique identifier of the recurrence, UUID, string
+        frequency: Event recurrence frequency, either 'none', 'daily', 'weekly', 'monthly', or 'yearly', string
+        amount: Event recurrence amount, int
+        description: Event description, string
+        """
+        self.start = start
+        self.duration = duration
+        self.color = color
+        self.recurrence_id = recurrence_id
+        self.frequency = sys.intern(frequency.strip())
+        self.amount = amount
+        self.description = description
+
+    @classmethod
+    def from_fields(cls, hour, minute, duration_hour, duration_minute, hex_color, recurrence_id, frequency, amount, description):
+        """
+        Returns the event described by the string fields used in files and menus
+
+        hour: Event start time hour, hh, string
+        minute: Event start minute, mm, string
+        duration_hour: Event duration hour, hh, string
+        duration_minute: Event duration minute, mm, string
+        hex_color: Hex color, #rrggbb, string
+        recurrence_id: Unique identifier of the recurrence, UUID, string
+        frequency: Event recurrence frequency, string
+        amount: Event recurrence amount, string
+        description: Event description, string
+        return: Event
+        """
+        hour = int(hour)
+        minute = int(minute)
+        duration_hour = int(duration_hour)
+        duration_minute = int(duration_minute)
+
+        # Reject fields that do not describe an event
+        if not 0 <= hour < NUMBER_HOURS_IN_DAY or not 0 <= minute < NUMBER_MINUTES_IN_HOUR or duration_hour < 0 or not 0 <= duration_minute < NUMBER_MINUTES_IN_HOUR:
+            raise ValueError('invalid event time')
+
+        if len(hex_color) != 7 or hex_color[0] != '#':
+            raise ValueError('invalid event color')
+
+        if frequency.strip() not in EVENT_RECURRENCE_FREQUENCY_DAYS:
+            raise ValueError('invalid event recurrence frequency')
+
+        return cls(hour * NUMBER_MINUTES_IN_HOUR + minute,
+                    duration_hour * NUMBER_MINUTES_IN_HOUR + duration_minute,
+                    int(hex_color[1:], 16),
+                    recurrence_id,
+                    frequency,
+                    int(amount),
+                    description.strip())
+
+    def fields(self):
+        """
+        Returns the string fields used in files, in file order
+
+        return: Tuple of strings, (hour, minute, duration_hour, duration_minute, hex_color, recurrence_id, frequency, amount, description)
+        """
+        return (str(self.hour).zfill(2),
+                str(self.minute).zfill(2),
+                str(self.duration // NUMBER_MINUTES_IN_HOUR).zfill(2),
+                str(self.duration % NUMBER_MINUTES_IN_HOUR).zfill(2),
+                self.hex_color,
+                self.recurrence_id,
+                self.frequency.rjust(7),
+                str(self.amount).zfill(3),
+                self.description)
+
+    def replace(self, **changes):
+        """
+        Returns a copy of the event with the given attributes changed
+
+        changes: New values of attributes, keyword arguments
+        return: Event
+        """
+        values = {name: getattr(self, name) for name in self.__slots__}
+        values.update(changes)
+        return Event(**values)
+
+    @property
+    def hour(self):
+        """
+        Event start hour, int
+        """
+        return self.start // NUMBER_MINUTES_IN_HOUR
+
+    @property
+    def minute(self):
+        """
+        Event start minute, int
+        """
+        return self.start % NUMBER_MINUTES_IN_HOUR
+
+    @property
+    def hex_color(self):
+        """
+        Event color, #rrggbb, string
+        """
+        return '#' + format(self.color, '06x')
+
+    @property
+    def rgb(self):
+        """
+        Event color, (r, g, b), tuple of ints
+        """
+        return (self.color >> 16, (self.color >> 8) & 0xff, self.color & 0xff)
@@ -0,0 +1,321 @@
+import os
+import time
+import uuid
+
+from core.event import Event
+from core.recurrence import key_to_string, string_to_key
+
+# Version of the schedule, recurrences, and to-do list file formats, written in a header line; files without one are version 1,
+# which stored no event or task identifiers
+FORMAT_VERSION = 2
+
+# Start of the header line
+HEADER_PREFIX = '#hourglass '
+
+# Length of the string form of a UUID
+ID_LENGTH = 36
+
+# Encoding of the schedule, recurrences, to-do list, and journal files, the same whatever the locale
+FILE_ENCODING = 'utf-8'
+
+def header_line():
+    """
+    Returns the header line holding the current file format version
+
+    return: Line, string
+    """
+    return HEADER_PREFIX + str(FORMAT_VERSION) + '\n'
+
+def read_version(file_location):
+    """
+    Returns the format version of a file from its header line; empty files are of the current version
+
+    file_location: Location of the file, string
+    return: Version, int
+    """
+    with open(file_location, 'rb') as opened_file:
+        line = opened_file.readline().decode(FILE_ENCODING, 'replace')
+
+    if not line:
+        return FORMAT_VERSION
+
+    if line.startswith(HEADER_PREFIX):
+        return int(line[len(HEADER_PREFIX):])
+
+    return 1
+
+def parse_id(string):
+    """
+    Returns an identifier stored in a file, checking its form
+
+    string: Identifier, UUID, string
+    return: Identifier, UUID, string
+    """
+    if len(string) != ID_LENGTH or string.count('-') != 4:
+        raise ValueError('invalid identifier')
+
+    return string
+
+def schedule_line(key, event_id, event_info):
+    """
+    Returns the line storing an event in the schedule file
+
+    key: Day ordinal, int
+    event_id: Unique identifier of the event, UUID, string
+    event_info: Event information, Event
+    return: Line, string
+    """
+    return key_to_string(key) + event_id + ''.join(event_info.fields()) + '\n'
+
+def parse_schedule_line(line):
+    """
+    Returns the event stored in a line of the schedule file
+
+    line: Line, string
+    return: Tuple, (key, event_id, event_info)
+    """
+    return (string_to_key(line[:8]), parse_id(line[8:8 + ID_LENGTH]), parse_schedule_event(line, 8 + ID_LENGTH))
+
+def parse_schedule_line_v1(line):
+    """
+    Returns the event stored in a line of a version 1 schedule file, which has no event identifier, with a new identifier
+
+    line: Line, string
+    return: Tuple, (key, event_id, event_info)
+    """
+    return (string_to_key(line[:8]), str(uuid.uuid4()), parse_schedule_event(line))
+
+def parse_schedule_event(line, offset=8):
+    """
+    Returns the event stored in a line of the schedule file, ignoring its date and identifier
+
+    line: Line, string
+    offset: Position of the event fields in the line, after the date and any identifier, int
+    return: Event information, Event
+    """
+    return Event.from_fields(line[offset:offset + 2], line[offset + 2:offset + 4], line[offset + 4:offset + 6], line[offset + 6:offset + 8], line[offset + 8:offset + 15], line[offset + 15:offset + 51], line[offset + 51:offset + 58], line[offset + 58:offset + 61], line[offset + 61:])
+
+def to_do_line(item):
+    """
+    Returns the line storing an item in the to-do list file
+
+    item: To-do list item, dict with the keys 'key', 'completion', and 'description'
+    return: Line, string
+    """
+    return item.get('key') + item.get('completion') + item.get('description').strip() + '\n'
+
+def parse_to_do_line(line):
+    """
+    Returns the item stored in a line of the to-do list file
+
+    line: Line, string
+    return: To-do list item, dict
+    """
+    contents = line[ID_LENGTH:].strip()
+
+    return {'key': parse_id(line[:ID_LENGTH]), 'completion': contents[0], 'description': contents[1:]}
+
+def parse_to_do_line_v1(line):
+    """
+    Returns the item stored in a line of a version 1 to-do list file, which has no key, with a new key
+
+    line: Line, string
+    return: To-do list item, dict
+    """
+    contents = line.strip()
+
+    return {'key': str(uuid.uuid4()), 'completion': contents[0], 'description': contents[1:]}
+
+def recurrence_line(recurrence_id, rule):
+    """
+    Returns the line storing a recurring event in the recurrences file
+
+    The line holds the first occurrence in the schedule file format up to the recurrence amount, then the leap years flag,
+    the number of removed occurrences, the removed occurrences, and the description
+
+    recurrence_id: Unique identifier of the recurrence, UUID, string
+    rule: Recurrence rule, dict with the keys 'key', 'leap_years', 'exceptions', and 'event_info'
+    return: Line, string
+    """
+    fields = rule.get('event_info').fields()
+    exceptions = sorted(rule.get('exceptions'))
+
+    return key_to_string(rule.get('key')) + ''.join(fields[:8]) + str(int(rule.get('leap_years'))) + str(len(exceptions)).zfill(3) + ''.join(key_to_string(exception) for exception in exceptions) + fields[8] + '\n'
+
+def parse_recurrence_line(line):
+    """
+    Returns the recurring event stored in a line of the recurrences file
+
+    line: Line, string
+    return: Tuple, (recurrence_id, rule)
+    """
+    key = string_to_key(line[:8])
+
+    leap_years = line[69] == '1'
+    number_exceptions = int(line[70:73])
+    exceptions = set()
+
+    for i in range(number_exceptions):
+        exceptions.add(string_to_key(line[73 + i * 8:81 + i * 8]))
+
+    event_info = Event.from_fields(line[8:10], line[10:12], line[12:14], line[14:16], line[16:23], line[23:59], line[59:66], line[66:69], line[73 + number_exceptions * 8:])
+
+    return (event_info.recurrence_id, {'key': key, 'leap_years': leap_years, 'exceptions': exceptions, 'event_info': event_info})
+
+# Size of the buffer used to read files line by line in bytes
+READ_BUFFER_SIZE = 1024 * 1024
+
+class ReadReport:
+    """
+    Class for the statistics of reading a file line by line
+    """
+    def __init__(self, file_location, quarantine_file_location):
+        """
+        Initializes the ReadReport class
+
+        file_location: Location of the file read, string
+        quarantine_file_location: Location of the file that malformed lines are moved to, string
+        """
+        self.file_location = file_location
+        self.quarantine_file_location = quarantine_file_location
+        self.lines = 0
+        self.characters = 0
+        self.records = 0
+        self.quarantined = 0
+        self.seconds = 0.0
+
+    def lines_per_second(self):
+        """
+        Returns the number of lines read per second
+
+        return: Throughput, float
+        """
+        return self.lines / self.seconds if self.seconds > 0 else 0.0
+
+    def summary(self):
+        """
+        Returns a description of the read for the user
+
+        return: Summary, string
+        """
+        summary = 'read ' + str(self.records) + ' of ' + str(self.lines) + ' lines from ' + os.path.basename(self.file_location) + ' in ' + '{:.2f}'.format(self.seconds) + ' s (' + str(int(self.lines_per_second())) + ' lines/s)'
+
+        if self.quarantined:
+            summary = summary + '; moved ' + str(self.quarantined) + ' malformed lines to ' + os.path.basename(self.quarantine_file_location)
+
+        return summary
+
+def read_records(file_location, parse, report):
+    """
+    Yields the records parsed from each line of a file, reading one line at a time so memory use does not depend on the size of the file
+
+    Blank lines and the header line are skipped; lines that cannot be parsed are appended to the quarantine file with their line number, then skipped;
+    bytes that are not valid in the file encoding, as in files written in another encoding, are read as replacement characters
+
+    file_location: Location of the file to read from, string
+    parse: Function returning the record stored in a line, raising ValueError, IndexError, or KeyError if the line is malformed, function
+    report: Statistics of the read, updated as lines are read, ReadReport
+    """
+    start = time.perf_counter()
+    quarantine_file = None
+
+    try:
+        with open(file_location, 'r', encoding=FILE_ENCODING, errors='replace', buffering=READ_BUFFER_SIZE) as opened_file:
+            for line_number, line in enumerate(opened_file, 1):
+                report.lines += 1
+                report.characters += len(line)
+
+                if not line.strip() or (line_number == 1 and line.startswith(HEADER_PREFIX)):
+                    continue
+
+                try:
+                    record = parse(line)
+                except (ValueError, IndexError, KeyError):
+                    # Keep the malformed line, with its line number, instead of giving up on the whole file
+                    if quarantine_file is None:
+                        quarantine_file = open(report.quarantine_file_location, 'a', encoding=FILE_ENCODING)
+
+                    quarantine_file.write(str(line_number) + '\t' + line.rstrip('\n') + '\n')
+                    report.quarantined += 1
+                    continue
+
+                report.records += 1
+                yield record
+    finally:
+        if quarantine_file is not None:
+            quarantine_file.close()
+
+        report.seconds = time.perf_counter() - start
+
+def read_records_between(file_location, parse, first, last):
+    """
+    Yields the records parsed from the lines of a file sorted by day whose days fall within the given range
+
+    The first line in the range is found by binary search over byte offsets, so only the lines in the range are read;
+    the header line sorts before every day
+
+    file_location: Location of the file to read from, lines starting with yyyymmdd in increasing order, string
+    parse: Function returning the record stored in a line, raising ValueError, IndexError, or KeyError if the line is malformed;
+    lines that cannot be decoded or parsed raise as well, so that the caller reads the whole file instead, function
+    first: First day of the range, day ordinal, int
+    last: Last day of the range, day ordinal, int
+    """
+    first_string = key_to_string(first).encode()
+    last_string = key_to_string(last).encode()
+
+    with open(file_location, 'rb') as opened_file:
+        def line_at(offset):
+            # Returns the first complete line starting at or after the given offset
+            opened_file.seek(offset)
+
+            if offset > 0:
+                opened_file.readline()
+
+            return opened_file.readline()
+
+        # Smallest offset after which the first line is in the range or past it
+        low = 0
+        high = os.fstat(opened_file.fileno()).st_size
+
+        while low < high:
+            middle = (low + high) // 2
+            line = line_at(middle)
+
+            if not line or line[:8] >= first_string:
+                high = middle
+            else:
+                low = middle + 1
+
+        opened_file.seek(low)
+
+        if low > 0:
+            opened_file.readline()
+
+        for line in opened_file:
+            if line[:8] > last_string:
+                break
+
+            if line[:8] < first_string:
+                continue
+
+            yield parse(line.decode(FILE_ENCODING))
+
+def write_lines_atomic(file_location, lines, encoding=FILE_ENCODING, newline=None):
+    """
+    Writes lines to a temporary file next to the given file, then replaces the given file with it
+
+    The given file is either left untouched or fully replaced, even if writing is interrupted
+
+    file_location: Location of the file to write to, string
+    lines: Iterable of lines, string
+    encoding: Encoding of the file, string
+    newline: Line break translation, as for open, string, or None to translate to the line break of the platform
+    """
+    temporary_file_location = file_location + '.tmp'
+
+    with open(temporary_file_location, 'w', encoding=encoding, newline=newline) as opened_file:
+        opened_file.writelines(lines)
+        opened_file.flush()
+        os.fsync(opened_file.fileno())
+
+    os.replace(temporary_file_location, file_location)
@@ -0,0 +1,1411 @@
+import os
+import uuid
+import heapq
+import functools
+import itertools
+import bisect
+import datetime
+import threading
+
+from utilities.constants import CHECKBUTTON_ON, CHECKBUTTON_OFF, ICS_IMPORT_BATCH_SIZE
+
+from core.event import Event
+from core.recurrence import key_to_date, date_to_key, key_to_string, string_to_key, recurrence_keys
+from core.sqlite_storage import SQLiteStorage
+from core.journal import Journal
+from core.background_writer import BackgroundWriter
+from core.profiling import profiled
+from core.search_index import SearchIndex, query_tokens, text_matches
+from core.icalendar import ImportReport, read_events, calendar_lines
+from core.file_format import FILE_ENCODING, FORMAT_VERSION, ReadReport, header_line, read_version, read_records, read_records_between, schedule_line, parse_schedule_line, parse_schedule_line_v1, parse_schedule_event, recurrence_line, parse_recurrence_line, to_do_line, parse_to_do_line, parse_to_do_line_v1, write_lines_atomic
+
+class StorageError(Exception):
+    """
+    Raised when the schedule, recurrences, or to-do list cannot be read or written; the message is meant for the user
+    """
+
+class HourglassModel:
+    """
+    Class for the data of the Hourglass application
+
+    Holds the schedule, recurring events, and to-do list and stores them in text files or in a database; does not use the GUI
+    """
+    def __init__(self, file_location):
+        """
+        Initializes the HourglassModel class
+
+        file_location: Location of the directory holding the schedule and to-do list files, string
+        """
+        # Schedule dictionary, keyed by day ordinal
+        # {day: {{event_id: Event},
+        #        {event_id: Event}, ... }}
+        self.schedule = {}
+
+        # Days of the schedule dictionary in order, for range queries
+        # [day, day, ... ]
+        self._schedule_days = []
+
+        # Recurrence index
+        # {recurrence_id: {(key, event_id), (key, event_id), ... }}
+        self.recurrence_index = {}
+
+        # Number of events and booked minutes of each day of the schedule dictionary, kept up to date with it
+        # {day: [events, minutes]}
+        self._day_totals = {}
+
+        # Search index over the descriptions of the schedule dictionary, by (key, event_id), and of the to-do list, by item key;
+        # each is built at its first search and kept up to date from then on
+        self._search_index = None
+        self._to_do_search_index = None
+
+        # Recurring events, stored once as rules and expanded on demand
+        # {recurrence_id: {'key': day, 'leap_years': bool,
+        #                  'exceptions': {day, ... }, 'event_info': Event}}
+        self.recurrences = {}
+
+        # To-do list, in order
+        self.to_do_list = []
+
+        # To-do list items by key, and the index of each key; indices are only known below _to_do_positions_valid, as moving
+        # or removing an item shifts the items after it
+        # {key: item}, {key: index}
+        self._to_do_items = {}
+        self._to_do_positions = {}
+        self._to_do_positions_valid = 0
+
+        # Location and name of schedule and tasks files
+        self._file_location = file_location
+        self._schedule_file_name = 'schedule.txt'
+        self._to_do_list_file_name = 'tasks.txt'
+        self._recurrences_file_name = 'recurrences.txt'
+        self._schedule_old_file_name = 'schedule_old.txt'
+        self._to_do_list_old_file_name = 'tasks_old.txt'
+        self._recurrences_old_file_name = 'recurrences_old.txt'
+        self._database_file_name = 'hourglass.db'
+        self._database_old_file_name = 'hourglass_old.db'
+        self._journal_file_name = 'schedule.journal'
+
+        # Format version of each schedule, recurrences, and to-do list file read, {file_name: version}
+        self._file_versions = {}
+
+        # Storage backend; None when reading and writing whole text files
+        self._storage = None
+
+        # Days of the schedule read from the storage backend, {day, ... }
+        self._loaded_days = set()
+
+        # Journal of schedule changes since the schedule files were last written; None with a storage backend
+        self._journal = None
+        self._compaction_thread = None
+
+        # Whether the last compaction written on a separate thread failed
+        self.compaction_failed = False
+
+        # Thread writing saves in the background
+        self._writer = BackgroundWriter()
+
+        # Number of changes to the schedule and to the to-do list so far, and as of the last autosave
+        self.schedule_generation = 0
+        self.to_do_generation = 0
+        self._schedule_saved_generation = 0
+        self._to_do_saved_generation = 0
+
+        # Statistics of reading the schedule and recurrences files, [ReadReport, ... ]
+        self.read_reports = []
+
+        # Days of the schedule read so far when only part of it was read at first; None once all of it is read
+        self._partial_range = None
+
+        # Rest of the schedule read on a separate thread, merged once read
+        self._rest_thread = None
+        self._rest = None
+
+        # Functions called after each change to the schedule
+        self._listeners = []
+
+    def open(self, backend='text', first=None, last=None):
+        """
+        Reads the schedule, recurrences, and to-do list
+
+        With the text backend and a range of days, only the days of the schedule in that range are read; the rest is read by
+        load_rest and merged by poll_rest
+
+        backend: Storage backend, either 'text' (whole text files written on close) or 'sqlite' (every change stored as it happens), string
+        first: First day of the schedule to read at first, datetime.date, or None to read all of it
+        last: Last day of the schedule to read at first, datetime.date, or None to read all of it
+        """
+        self.read_reports = []
+
+        # Files of an older format version are read whole, with new identifiers, then rewritten in the current version
+        self._file_versions = {file_name: self._file_version(file_name) for file_name in [self._schedule_file_name, self._recurrences_file_name, self._to_do_list_file_name]}
+        outdated = any(version < FORMAT_VERSION for version in self._file_versions.values())
+
+        if backend == 'sqlite':
+            self._storage_open(self._database_file_name)
+        else:
+            # Read from schedule, recurrences, and to-do list files
+            if first is not None and last is not None and not outdated:
+                try:
+                    self._partial_range = range(date_to_key(first), date_to_key(last) + 1)
+                    self._schedule_read_between(self._schedule_file_name, self._partial_range)
+                except StorageError:
+                    # A line in the range could not be read; read the whole file, which moves malformed lines to the quarantine file
+                    self._partial_range = None
+                    self._schedule_read(self._schedule_file_name)
+            else:
+                self._schedule_read(self._schedule_file_name)
+
+            self._recurrences_read(self._recurrences_file_name)
+            self._to_do_read(self._to_do_list_file_name)
+
+            # Replay changes made after the schedule files were written
+            self._journal_open(self._journal_file_name)
+
+            if outdated:
+                self._migrate()
+            elif self._partial_range is None:
+                self._quarantine_rewrite()
+
+    def _file_version(self, file_name):
+        """
+        Returns the format version of a schedule, recurrences, or to-do list file; missing files are of the current version
+
+        file_name: Name of the file, string
+        return: Version, int
+        """
+        file_location = os.path.join(self._file_location, file_name)
+
+        try:
+            version = read_version(file_location) if os.path.exists(file_location) else FORMAT_VERSION
+        except (OSError, ValueError) as exception:
+            raise StorageError('unable to read from ' + file_name + '.') from exception
+
+        if version > FORMAT_VERSION:
+            raise StorageError(file_name + ' was written by a newer version of hourglass.')
+
+        return version
+
+    def _migrate(self):
+        """
+        Rewrites the schedule, recurrences, and to-do list files in the current format version, covering the journal records
+        replayed onto them
+        """
+        self._journal.rotate()
+        self._schedule_snapshot_write([(key, dict(self.schedule[key])) for key in self._schedule_days], list(self.recurrences.items()))
+
+        if self.compaction_failed:
+            raise StorageError('unable to write to schedule file.')
+
+        self._to_do_write(self._to_do_list_file_name)
+        self._file_versions = {}
+
+    def load_rest(self):
+        """
+        Starts reading the whole schedule file on a separate thread, after only part of it was read by open
+        """
+        if self._partial_range is not None and self._rest_thread is None:
+            self._rest_thread = threading.Thread(target=self._schedule_read_rest, args=(self._schedule_file_name,))
+            self._rest_thread.start()
+
+    def poll_rest(self, wait=False):
+        """
+        Merges the rest of the schedule into the in-memory schedule once it has been read
+
+        wait: Whether to wait until the rest of the schedule has been read, boolean
+        return: Whether the whole schedule is now in memory, boolean
+        """
+        if self._partial_range is None:
+            return True
+
+        if self._rest_thread is None:
+            self.load_rest()
+
+        if self._rest_thread.is_alive():
+            if not wait:
+                return False
+
+            self._rest_thread.join()
+
+        self._schedule_merge_rest()
+        self._changed(None, None, None)
+        return True
+
+    def _quarantine_rewrite(self):
+        """
+        Rewrites the schedule, recurrences, and to-do list files without the malformed lines, which are kept in the quarantine files
+        """
+        if any(report.quarantined for report in self.read_reports):
+            self._schedule_snapshot_write([(key, dict(self.schedule[key])) for key in self._schedule_days], list(self.recurrences.items()))
+
+            if self.compaction_failed:
+                raise StorageError('unable to write to schedule file.')
+
+            self._to_do_write(self._to_do_list_file_name)
+
+    def close(self):
+        """
+        Stores the schedule, recurrences, and to-do list, then closes their files
+        """
+        # Finish saves still being written
+        self._writer.close()
+
+        # Changes are already stored by the storage backend
+        if self._storage is not None:
+            self._storage.close()
+            return
+
+        # Write to schedule, recurrences, and to-do list files
+        self.poll_rest(wait=True)
+
+        if self._compaction_thread is not None:
+            self._compaction_thread.join()
+
+        self.compact(background=False)
+        self._journal.close()
+        self._to_do_write(self._to_do_list_file_name)
+
+    def add_listener(self, listener):
+        """
+        Registers a function to call after each change to the schedule
+
+        The function is called with the day, event identifier, and new event information (None if removed) of a changed event,
+        or with None for all three after a change that may affect several days, such as a change to a recurring event
+
+        listener: Function taking (key, event_id, event_info), function
+        """
+        self._listeners.append(listener)
+
+    def _changed(self, key, event_id, event_info):
+        """
+        Calls the registered listeners after a change to the schedule
+
+        key: Day ordinal, int, or None
+        event_id: Unique identifier of the event, UUID, string, or None
+        event_info: Event information, Event, or None
+        """
+        self.schedule_generation += 1
+
+        for listener in self._listeners:
+            listener(key, event_id, event_info)
+
+    @profiled('model._schedule_read')
+    def _schedule_read(self, file_name):
+        """
+        Reads from schedule file
+
+        file_name: Name of the file to read from, string
+        """
+        try:
+            # If the schedule file does not exist, create it
+            self._schedule_file_location = os.path.join(self._file_location, file_name)
+
+            if not os.path.exists(self._schedule_file_location):
+                with open(self._schedule_file_location, 'x', encoding=FILE_ENCODING) as opened_file:
+                    self._schedule_file = opened_file
+            
+            # Schedule dictionary
+            # {day: {{event_id: Event},
+            #        {event_id: Event}, ... }}
+            self.schedule = {}
+            self._schedule_days = []
+            self.recurrence_index = {}
+            self._day_totals = {}
+            self._search_index = None
+
+            # Read events from file one line at a time, moving malformed lines to the quarantine file
+            report = ReadReport(self._schedule_file_location, self._quarantine_file_location(file_name))
+            self.read_reports.append(report)
+
+            # Events of version 1 files are given new identifiers
+            parse = parse_schedule_line if self._file_versions.get(file_name, FORMAT_VERSION) >= FORMAT_VERSION else parse_schedule_line_v1
+
+            for key, event_id, event_info in read_records(self._schedule_file_location, parse, report):
+                self._index_event(key, event_id, event_info)
+        except Exception as exception:
+            raise StorageError('unable to read from schedule file.') from exception
+    
+    @profiled('model._schedule_read_between')
+    def _schedule_read_between(self, file_name, days):
+        """
+        Reads the events of a range of days from the schedule file, written in day order
+
+        file_name: Name of the file to read from, string
+        days: Days to read, range of day ordinals
+        """
+        try:
+            self._schedule_file_location = os.path.join(self._file_location, file_name)
+
+            self.schedule = {}
+            self._schedule_days = []
+            self.recurrence_index = {}
+            self._day_totals = {}
+            self._search_index = None
+
+            if os.path.exists(self._schedule_file_location):
+                for key, event_id, event_info in read_records_between(self._schedule_file_location, parse_schedule_line, days[0], days[-1]):
+                    self._index_event(key, event_id, event_info)
+        except Exception as exception:
+            raise StorageError('unable to read from schedule file.') from exception
+
+    @profiled('model._schedule_read_rest')
+    def _schedule_read_rest(self, file_name):
+        """
+        Reads every event of the schedule file without changing the in-memory schedule; runs on a separate thread
+
+        file_name: Name of the file to read from, string
+        """
+        try:
+            file_location = os.path.join(self._file_location, file_name)
+            report = ReadReport(file_location, self._quarantine_file_location(file_name))
+            events = []
+            in_order = True
+
+            if os.path.exists(file_location):
+                for key, event_id, event_info in read_records(file_location, parse_schedule_line, report):
+                    if events and key < events[-1][0]:
+                        in_order = False
+
+                    events.append((key, event_id, event_info))
+
+            self._rest = (events, in_order, report, None)
+        except Exception as exception:
+            self._rest = ([], True, None, exception)
+
+    @profiled('model._schedule_merge_rest')
+    def _schedule_merge_rest(self):
+        """
+        Merges the events read by _schedule_read_rest into the in-memory schedule, then replays the journal onto them
+
+        Days read at first are kept as they are when the schedule file is in day order, as they already hold every change
+        """
+        events, in_order, report, exception = self._rest
+        days = self._partial_range
+
+        self._rest = None
+        self._rest_thread = None
+        self._partial_range = None
+
+        if exception is not None:
+            raise StorageError('unable to read from schedule file.') from exception
+
+        self.read_reports.append(report)
+
+        try:
+            if in_order:
+                # Add the days not read at first, then the changes to them
+                for key, event_id, event_info in events:
+                    if key not in days:
+                        self._index_event(key, event_id, event_info)
+
+                for record in self._journal.records():
+                    self._journal_apply(record, days=lambda key: key not in days, rules=False)
+            else:
+                # The days read at first may be incomplete, so rebuild the schedule from the file and the journal
+                self.schedule = {}
+                self._schedule_days = []
+                self.recurrence_index = {}
+                self._day_totals = {}
+                self._search_index = None
+
+                for key, event_id, event_info in events:
+                    self._index_event(key, event_id, event_info)
+
+                for record in self._journal.records():
+                    self._journal_apply(record)
+        except Exception as exception:
+            raise StorageError('unable to read from schedule journal.') from exception
+
+        self._quarantine_rewrite()
+
+    @profiled('model._recurrences_read')
+    def _recurrences_read(self, file_name):
+        """
+        Reads from recurrences file
+
+        file_name: Name of the file to read from, string
+        """
+        try:
+            # If the recurrences file does not exist, create it
+            self._recurrences_file_location = os.path.join(self._file_location, file_name)
+
+            if not os.path.exists(self._recurrences_file_location):
+                with open(self._recurrences_file_location, 'x', encoding=FILE_ENCODING) as opened_file:
+                    self._recurrences_file = opened_file
+            
+            # Recurring events
+            self.recurrences = {}
+
+            # Read recurring events from file one line at a time, moving malformed lines to the quarantine file
+            report = ReadReport(self._recurrences_file_location, self._quarantine_file_location(file_name))
+            self.read_reports.append(report)
+
+            for recurrence_id, rule in read_records(self._recurrences_file_location, parse_recurrence_line, report):
+                self.recurrences[recurrence_id] = rule
+        except Exception as exception:
+            raise StorageError('unable to read from recurrences file.') from exception
+    
+    def _quarantine_file_location(self, file_name):
+        """
+        Returns the location of the file that malformed lines of the given file are moved to
+
+        file_name: Name of the file read from, string
+        return: Location of the quarantine file, string
+        """
+        return os.path.join(self._file_location, os.path.splitext(file_name)[0] + '_quarantine.txt')
+
+    @profiled('model._to_do_read')
+    def _to_do_read(self, file_name):
+        """
+        Reads from to-do list file
+
+        file_name: Name of the file to read from, string
+        """
+        try:
+            # If the to-do list file does not exist, create it
+            self._to_do_list_file_location = os.path.join(self._file_location, file_name)
+
+            if not os.path.exists(self._to_do_list_file_location):
+                with open(self._to_do_list_file_location, 'x', encoding=FILE_ENCODING) as opened_file:
+                    self._to_do_list_file = opened_file
+
+            # Read items from file one line at a time, moving malformed lines to the quarantine file; items of version 1 files are
+            # given new keys
+            report = ReadReport(self._to_do_list_file_location, self._quarantine_file_location(file_name))
+            self.read_reports.append(report)
+
+            parse = parse_to_do_line if self._file_versions.get(file_name, FORMAT_VERSION) >= FORMAT_VERSION else parse_to_do_line_v1
+
+            self.to_do_list = list(read_records(self._to_do_list_file_location, parse, report))
+            self._to_do_reindex()
+        except Exception as exception:
+            raise StorageError('unable to read from to-do list file.') from exception
+
+    @profiled('model._to_do_write')
+    def _to_do_write(self, file_name, items=None):
+        """
+        Writes to to-do list file, replacing it only once fully written; safe to run on a separate thread given a copy of the items
+
+        file_name: Name of the file to write to, string
+        items: Copy of the to-do list, [item, ... ], or None to write the to-do list itself
+        """
+        if items is None:
+            items = self.to_do_list
+
+        try:
+            write_lines_atomic(os.path.join(self._file_location, file_name), itertools.chain([header_line()], (to_do_line(item) for item in items)))
+        except Exception as exception:
+            raise StorageError('unable to write to to-do list file.') from exception
+
+    def _journal_open(self, file_name):
+        """
+        Opens the schedule journal and replays its records onto the schedule read from the schedule files
+
+        Records are keyed by event identifier, or, for records written before identifiers were stored, by day and recurrence
+        identifier, so replaying a record more than once has no further effect
+
+        file_name: Name of the journal file, string
+        """
+        try:
+            self._journal = Journal(os.path.join(self._file_location, file_name))
+
+            # Changes to days not read yet are replayed once they are read
+            days = None if self._partial_range is None else self._partial_range.__contains__
+
+            for record in self._journal.records():
+                self._journal_apply(record, days=days)
+        except Exception as exception:
+            raise StorageError('unable to read from schedule journal.') from exception
+
+    def _journal_apply(self, record, days=None, rules=True):
+        """
+        Applies a journal record to the in-memory schedule
+
+        record: Journal record, string
+        days: Function returning whether the record applies to the given day, function, or None for every day
+        rules: Whether to apply records changing recurring events, boolean
+        """
+        kind = record[0]
+
+        # Added or edited event
+        if kind == 'A':
+            key, event_id, event_info = parse_schedule_line(record[1:])
+
+            if days is not None and not days(key):
+                return
+
+            self._unindex_event(key, event_id)
+            self._index_event(key, event_id, event_info)
+
+        # Removed event
+        elif kind == 'X':
+            key = string_to_key(record[1:9])
+
+            if days is None or days(key):
+                self._unindex_event(key, record[9:45])
+
+        # Added or edited event, written before identifiers were stored
+        elif kind == 'E':
+            key, event_id, event_info = parse_schedule_line_v1(record[1:])
+
+            if days is not None and not days(key):
+                return
+
+            event_ids = [event_id for date_key, event_id in self.schedule_recurrences(event_info.recurrence_id) if date_key == key]
+            event_id = event_ids[0] if event_ids else event_id
+
+            self._unindex_event(key, event_id)
+            self._index_event(key, event_id, event_info)
+
+        # Removed event, written before identifiers were stored
+        elif kind == 'D':
+            key = string_to_key(record[1:9])
+
+            if days is not None and not days(key):
+                return
+
+            for date_key, event_id in self.schedule_recurrences(record[9:45]):
+                if date_key == key:
+                    self._unindex_event(key, event_id)
+
+        # Added or edited recurring event
+        elif kind == 'R' and rules:
+            recurrence_id, rule = parse_recurrence_line(record[1:])
+            self.recurrences[recurrence_id] = rule
+
+        # Edited series
+        elif kind == 'U':
+            event_info = parse_schedule_event(record[1:])
+            recurrence_id = event_info.recurrence_id
+
+            for date_key, event_id in self.schedule_recurrences(recurrence_id):
+                if days is None or days(date_key):
+                    self._unindex_event(date_key, event_id)
+                    self._index_event(date_key, event_id, event_info)
+
+            if rules and recurrence_id in self.recurrences:
+                self.recurrences[recurrence_id]['event_info'] = event_info
+
+        # Removed series
+        elif kind == 'S':
+            for date_key, event_id in self.schedule_recurrences(record[1:37]):
+                if days is None or days(date_key):
+                    self._unindex_event(date_key, event_id)
+
+            if rules:
+                self.recurrences.pop(record[1:37], None)
+
+    def _journal_append(self, record):
+        """
+        Appends a record to the schedule journal, if there is one
+
+        record: Journal record, string
+        """
+        if self._journal is not None:
+            self._journal.append(record)
+
+    def compact(self, background=True):
+        """
+        Writes the schedule and recurrences files from the in-memory schedule and discards the journal records they now cover
+
+        The schedule is copied on the calling thread and, in the background, written on a separate thread; a failed background
+        write is reported through compaction_failed
+
+        background: Whether to write on a separate thread, boolean
+        """
+        # Days not read yet would be left out of the schedule files
+        if self._journal is None or self._partial_range is not None:
+            return
+
+        if (self._compaction_thread is None or not self._compaction_thread.is_alive()) and not self._journal.is_empty():
+            self.compaction_failed = False
+            self._journal.rotate()
+
+            # Event information is replaced rather than changed, so copying references is enough
+            days = [(key, dict(self.schedule[key])) for key in self._schedule_days]
+            rules = [(recurrence_id, dict(rule, exceptions=set(rule.get('exceptions')))) for recurrence_id, rule in self.recurrences.items()]
+
+            if background:
+                self._compaction_thread = threading.Thread(target=self._schedule_snapshot_write, args=(days, rules))
+                self._compaction_thread.start()
+            else:
+                self._schedule_snapshot_write(days, rules)
+
+                if self.compaction_failed:
+                    raise StorageError('unable to write to schedule file.')
+
+    @profiled('model._schedule_snapshot_write')
+    def _schedule_snapshot_write(self, days, rules):
+        """
+        Replaces the schedule and recurrences files with a copy of the schedule; safe to run on a separate thread
+
+        days: List of tuples, (key, {event_id: event_info, ... })
+        rules: List of tuples, (recurrence_id, rule)
+        """
+        try:
+            write_lines_atomic(os.path.join(self._file_location, self._schedule_file_name), itertools.chain([header_line()], (schedule_line(key, event_id, event_info) for key, events in days for event_id, event_info in events.items())))
+            write_lines_atomic(os.path.join(self._file_location, self._recurrences_file_name), itertools.chain([header_line()], (recurrence_line(recurrence_id, rule) for recurrence_id, rule in rules)))
+
+            self._journal.compacted()
+        except:
+            # Journal records moved aside are kept and replayed on the next start
+            self.compaction_failed = True
+
+    def _storage_open(self, file_name):
+        """
+        Opens the SQLite storage backend, importing the schedule, recurrences, and to-do list files into it if it is empty
+
+        Only the recurring events and the to-do list are read at startup; days of the schedule are read when first needed
+
+        file_name: Name of the database file, string
+        """
+        try:
+            self._storage = SQLiteStorage(os.path.join(self._file_location, file_name))
+
+            if self._storage.is_empty():
+                self._schedule_read(self._schedule_file_name)
+                self._recurrences_read(self._recurrences_file_name)
+                self._to_do_read(self._to_do_list_file_name)
+
+                # Changes journaled by the text backend that were not yet compacted into the schedule files
+                self._journal_open(self._journal_file_name)
+
+                self._storage.add_events((key, event_id, event_info) for key, events in self.schedule.items() for event_id, event_info in events.items())
+                self._storage.add_tasks(self.to_do_list)
+
+                for recurrence_id, rule in self.recurrences.items():
+                    self._storage.add_recurrence(recurrence_id, rule)
+
+                self._loaded_days = set(self.schedule)
+
+                # Compact the journal into the schedule files, so its records are never replayed again
+                self._journal.rotate()
+                self._schedule_snapshot_write([(key, dict(self.schedule[key])) for key in self._schedule_days], list(self.recurrences.items()))
+                self._journal.close()
+                self._journal = None
+            else:
+                self.recurrences = dict(self._storage.recurrences())
+                self.to_do_list = self._storage.tasks()
+                self._to_do_reindex()
+        except Exception as exception:
+            raise StorageError('unable to read from database file.') from exception
+
+    def _load_days(self, first, last):
+        """
+        Reads the days of the schedule between two dates, inclusive, from the storage backend, unless already read
+
+        first: First date, datetime.date
+        last: Last date, datetime.date
+        """
+        keys = range(date_to_key(first), date_to_key(last) + 1)
+
+        if all(key in self._loaded_days for key in keys):
+            return
+
+        for key, event_id, event_info in self._storage.events_between(keys[0], keys[-1]):
+            if key not in self._loaded_days:
+                self._index_event(key, event_id, event_info)
+
+        self._loaded_days.update(keys)
+
+    def _index_event(self, key, event_id, event_info):
+        """
+        Adds an event to the in-memory schedule and to the recurrence index
+
+        key: Day ordinal, int
+        event_id: Unique identifier of the event, UUID, string
+        event_info: Event information, Event
+        """
+        events = self.schedule.get(key)
+
+        # Keep the days in order
+        if events is None:
+            events = self.schedule[key] = {}
+
+            if self._schedule_days and self._schedule_days[-1] < key:
+                self._schedule_days.append(key)
+            else:
+                bisect.insort(self._schedule_days, key)
+
+        events[event_id] = event_info
+        self.recurrence_index.setdefault(event_info.recurrence_id, set()).add((key, event_id))
+
+        totals = self._day_totals.setdefault(key, [0, 0])
+        totals[0] += 1
+        totals[1] += event_info.duration
+
+        if self._search_index is not None:
+            self._search_index.add((key, event_id), event_info.description)
+
+    def _unindex_event(self, key, event_id):
+        """
+        Removes an event from the in-memory schedule and from the recurrence index
+
+        key: Day ordinal, int
+        event_id: Unique identifier of the event, UUID, string
+        """
+        events = self.schedule.get(key)
+
+        if events is None or event_id not in events:
+            return
+
+        event_info = events.pop(event_id)
+
+        # Do not keep days without events
+        if not events:
+            del self.schedule[key]
+            del self._schedule_days[bisect.bisect_left(self._schedule_days, key)]
+            del self._day_totals[key]
+        else:
+            totals = self._day_totals[key]
+            totals[0] -= 1
+            totals[1] -= event_info.duration
+
+        if self._search_index is not None:
+            self._search_index.remove((key, event_id))
+
+        recurrence_id = event_info.recurrence_id
+        occurrences = self.recurrence_index.get(recurrence_id)
+
+        if occurrences is not None:
+            occurrences.discard((key, event_id))
+
+            if not occurrences:
+                del self.recurrence_index[recurrence_id]
+
+    def schedule_add_event(self, key, event_id, event_info):
+        """
+        Adds an event to the schedule
+
+        key: Day ordinal, int
+        event_id: Unique identifier of the event, UUID, string
+        event_info: Event information, Event
+        """
+        self._index_event(key, event_id, event_info)
+        self._journal_append('A' + schedule_line(key, event_id, event_info)[:-1])
+        self._changed(key, event_id, event_info)
+
+        if self._storage is not None:
+            self._storage.add_event(key, event_id, event_info)
+
+    def schedule_edit_event(self, key, event_id, event_info):
+        """
+        Replaces the information of a scheduled event
+
+        key: Day ordinal, int
+        event_id: Unique identifier of the event, UUID, string
+        event_info: New event information, Event
+        """
+        self._unindex_event(key, event_id)
+        self._index_event(key, event_id, event_info)
+        self._journal_append('A' + schedule_line(key, event_id, event_info)[:-1])
+        self._changed(key, event_id, event_info)
+
+        if self._storage is not None:
+            self._storage.add_event(key, event_id, event_info)
+
+    def schedule_remove_event(self, key, event_id):
+        """
+        Removes an event from the schedule
+
+        key: Day ordinal, int
+        event_id: Unique identifier of the event, UUID, string
+        """
+        event_info = self.schedule.get(key, {}).get(event_id)
+
+        if event_info is not None:
+            self._unindex_event(key, event_id)
+            self._journal_append('X' + key_to_string(key) + event_id)
+            self._changed(key, event_id, None)
+
+        if self._storage is not None:
+            self._storage.remove_event(event_id)
+
+    def schedule_recurrences(self, recurrence_id):
+        """
+        Returns all scheduled occurrences sharing the given recurrence identifier
+
+        With a storage backend, only occurrences on days already read are returned
+
+        recurrence_id: Unique identifier of the recurrence, UUID, string
+        return: List of tuples, (key, event_id)
+        """
+        return list(self.recurrence_index.get(recurrence_id, ()))
+
+    def schedule_add_recurrence(self, recurrence_id, rule):
+        """
+        Adds a recurring event to the schedule as a single rule
+
+        recurrence_id: Unique identifier of the recurrence, UUID, string
+        rule: Recurrence rule, dict with the keys 'key', 'leap_years', 'exceptions', and 'event_info'
+        """
+        self.recurrences[recurrence_id] = rule
+        self._journal_append('R' + recurrence_line(recurrence_id, rule)[:-1])
+        self._changed(None, None, None)
+
+        if self._storage is not None:
+            self._storage.add_recurrence(recurrence_id, rule)
+
+    def schedule_event(self, key, event_id):
+        """
+        Returns the information of a scheduled event or of an occurrence of a recurring event
+
+        key: Day ordinal, int
+        event_id: Unique identifier of the event, or of the recurrence for occurrences of recurring events, UUID, string
+        return: Event information, Event, or None if there is no such event
+        """
+        event_info = self.schedule.get(key, {}).get(event_id)
+
+        if event_info is None and event_id in self.recurrences:
+            event_info = self.events_between(key_to_date(key), key_to_date(key)).get(key, {}).get(event_id)
+
+        return event_info
+
+    def schedule_edit_occurrence(self, key, event_id, event_info):
+        """
+        Edits a single scheduled event or a single occurrence of a recurring event
+
+        An edited occurrence of a recurring event is removed from its rule and stored as a regular event with the same recurrence identifier
+
+        key: Day ordinal, int
+        event_id: Unique identifier of the event, or of the recurrence for occurrences of recurring events, UUID, string
+        event_info: New event information, Event
+        """
+        if event_id in self.schedule.get(key, {}):
+            self.schedule_edit_event(key, event_id, event_info)
+        elif event_id in self.recurrences:
+            self.recurrences[event_id]['exceptions'].add(key)
+            self._journal_append('R' + recurrence_line(event_id, self.recurrences[event_id])[:-1])
+            self._changed(key, event_id, None)
+            self.schedule_add_event(key, str(uuid.uuid4()), event_info)
+
+            if self._storage is not None:
+                self._storage.add_recurrence(event_id, self.recurrences[event_id])
+
+    def schedule_remove_occurrence(self, key, event_id):
+        """
+        Removes a single scheduled event or a single occurrence of a recurring event
+
+        key: Day ordinal, int
+        event_id: Unique identifier of the event, or of the recurrence for occurrences of recurring events, UUID, string
+        """
+        if event_id in self.schedule.get(key, {}):
+            self.schedule_remove_event(key, event_id)
+        elif event_id in self.recurrences:
+            self.recurrences[event_id]['exceptions'].add(key)
+            self._journal_append('R' + recurrence_line(event_id, self.recurrences[event_id])[:-1])
+            self._changed(key, event_id, None)
+
+            if self._storage is not None:
+                self._storage.add_recurrence(event_id, self.recurrences[event_id])
+
+    def schedule_edit_series(self, recurrence_id, event_info):
+        """
+        Edits every occurrence of a recurring event
+
+        recurrence_id: Unique identifier of the recurrence, UUID, string
+        event_info: New event information, Event
+        """
+        for key, event_id in self.schedule_recurrences(recurrence_id):
+            self._unindex_event(key, event_id)
+            self._index_event(key, event_id, event_info)
+
+        if recurrence_id in self.recurrences:
+            self.recurrences[recurrence_id]['event_info'] = event_info
+
+        # The day is not used for a series
+        self._journal_append('U' + '0' * 8 + ''.join(event_info.fields()))
+        self._changed(None, None, None)
+
+        if self._storage is not None:
+            self._storage.edit_series(recurrence_id, event_info)
+
+    def schedule_remove_series(self, recurrence_id):
+        """
+        Removes every occurrence of a recurring event
+
+        recurrence_id: Unique identifier of the recurrence, UUID, string
+        """
+        for key, event_id in self.schedule_recurrences(recurrence_id):
+            self._unindex_event(key, event_id)
+
+        self.recurrences.pop(recurrence_id, None)
+        self._journal_append('S' + recurrence_id)
+        self._changed(None, None, None)
+
+        if self._storage is not None:
+            self._storage.remove_series(recurrence_id)
+
+    @profiled('model.import_ics')
+    def import_ics(self, file_location):
+        """
+        Adds the events of an iCalendar file to the schedule
+
+        The file is read one event at a time, and events are added in batches, each with a single journal write and storage
+        transaction; listeners are called once at the end
+
+        Events of the file with the same UID share a recurrence identifier, and occurrences they replace are removed from their
+        recurring event
+
+        file_location: Location of the calendar file, string
+        return: Statistics of the import, ImportReport
+        """
+        # Imported events would otherwise be merged with days not read yet
+        self.poll_rest(wait=True)
+
+        report = ImportReport(file_location)
+
+        # Recurrence identifiers by UID, and replaced occurrences by recurrence identifier
+        series = {}
+        overridden = {}
+        rules = {}
+        batch = []
+
+        try:
+            for uid, key, start, duration, color, description, recurrence, overridden_key, cancelled in read_events(file_location, report):
+                if recurrence is not None or overridden_key is not None:
+                    recurrence_id = series.setdefault(uid or str(uuid.uuid4()), str(uuid.uuid4()))
+                else:
+                    recurrence_id = str(uuid.uuid4())
+
+                if overridden_key is not None:
+                    overridden.setdefault(recurrence_id, set()).add(overridden_key)
+
+                if cancelled:
+                    continue
+
+                if recurrence is not None:
+                    frequency, amount, leap_years, exceptions = recurrence
+                    event_info = Event(start, duration, color, recurrence_id, frequency, amount, description)
+                    rules[recurrence_id] = {'key': key, 'leap_years': leap_years, 'exceptions': exceptions, 'event_info': event_info}
+                else:
+                    batch.append((key, str(uuid.uuid4()), Event(start, duration, color, recurrence_id, 'none', 1, description)))
+
+                    if len(batch) >= ICS_IMPORT_BATCH_SIZE:
+                        self._schedule_add_events(batch)
+                        report.events += len(batch)
+                        batch = []
+        except (OSError, UnicodeError) as exception:
+            raise StorageError('unable to read from calendar file.') from exception
+        finally:
+            # Keep the events read before an error
+            self._schedule_add_events(batch)
+            report.events += len(batch)
+
+            for recurrence_id, keys in overridden.items():
+                if recurrence_id in rules:
+                    rules[recurrence_id]['exceptions'].update(keys)
+
+            self._schedule_add_recurrences(rules)
+            report.recurrences += len(rules)
+
+            self._changed(None, None, None)
+
+        return report
+
+    def _schedule_add_events(self, events):
+        """
+        Adds several events to the schedule with a single journal write and storage transaction, without calling listeners
+
+        events: List of tuples, (key, event_id, event_info)
+        """
+        # With a storage backend, days not read yet are read with the new events when first needed
+        for key, event_id, event_info in events:
+            if self._storage is None or key in self._loaded_days:
+                self._index_event(key, event_id, event_info)
+
+        if self._journal is not None:
+            self._journal.append_many('A' + schedule_line(key, event_id, event_info)[:-1] for key, event_id, event_info in events)
+
+        if self._storage is not None:
+            self._storage.add_events(events)
+
+    def _schedule_add_recurrences(self, rules):
+        """
+        Adds several recurring events to the schedule with a single journal write, without calling listeners
+
+        rules: Dictionary, {recurrence_id: rule}
+        """
+        self.recurrences.update(rules)
+
+        if self._journal is not None:
+            self._journal.append_many('R' + recurrence_line(recurrence_id, rule)[:-1] for recurrence_id, rule in rules.items())
+
+        if self._storage is not None:
+            for recurrence_id, rule in rules.items():
+                self._storage.add_recurrence(recurrence_id, rule)
+
+    @profiled('model.export_ics')
+    def export_ics(self, file_location):
+        """
+        Writes the schedule and recurring events to an iCalendar file, one event at a time
+
+        file_location: Location of the calendar file, string
+        """
+        self.poll_rest(wait=True)
+
+        # The storage backend holds all days, while only some may be in memory
+        if self._storage is not None:
+            events = self._storage.events_between(1, datetime.date.max.toordinal())
+        else:
+            events = ((key, event_id, event_info) for key in self._schedule_days for event_id, event_info in self.schedule[key].items())
+
+        try:
+            write_lines_atomic(file_location, calendar_lines(events, list(self.recurrences.items())), encoding='utf-8', newline='')
+        except OSError as exception:
+            raise StorageError('unable to write to calendar file.') from exception
+
+    def events_between(self, first, last):
+        """
+        Returns all scheduled events and occurrences of recurring events between two dates, inclusive
+
+        Occurrences of recurring events are keyed by the identifier of their recurrence
+
+        first: First date, datetime.date
+        last: Last date, datetime.date
+        return: Dictionary, {day ordinal: {event_id: Event, ... }, ... }
+        """
+        days = {}
+        first_key = date_to_key(first)
+        last_key = date_to_key(last)
+
+        # Read the range from the storage backend if needed
+        if self._storage is not None:
+            self._load_days(first, last)
+
+        # Regular events, only visiting days that have events
+        start = bisect.bisect_left(self._schedule_days, first_key)
+        end = bisect.bisect_right(self._schedule_days, last_key)
+
+        for key in self._schedule_days[start:end]:
+            days[key] = dict(self.schedule[key])
+
+        # Recurring events, expanded only within the range
+        for recurrence_id, rule in self.recurrences.items():
+            event_info = rule.get('event_info')
+
+            for key in recurrence_keys(rule.get('key'), event_info.frequency, event_info.amount, rule.get('leap_years'), first_key, last_key):
+                if key not in rule.get('exceptions'):
+                    days.setdefault(key, {})[recurrence_id] = event_info
+
+        return days
+
+    def day_totals(self, first, last):
+        """
+        Returns the number of events and booked minutes of each day between two dates, inclusive, including occurrences of recurring events
+
+        Days of the schedule are looked up in totals kept up to date with it; only recurring events are expanded within the range
+
+        first: First date, datetime.date
+        last: Last date, datetime.date
+        return: Dictionary, {day ordinal: (events, minutes), ... }, without days that have no events
+        """
+        first_key = date_to_key(first)
+        last_key = date_to_key(last)
+
+        # Read the range from the storage backend if needed
+        if self._storage is not None:
+            self._load_days(first, last)
+
+        totals = {}
+
+        for key in range(first_key, last_key + 1):
+            day = self._day_totals.get(key)
+
+            if day is not None:
+                totals[key] = tuple(day)
+
+        # Recurring events, expanded only within the range
+        for recurrence_id, rule in self.recurrences.items():
+            event_info = rule.get('event_info')
+
+            for key in recurrence_keys(rule.get('key'), event_info.frequency, event_info.amount, rule.get('leap_years'), first_key, last_key):
+                if key not in rule.get('exceptions'):
+                    events, minutes = totals.get(key, (0, 0))
+                    totals[key] = (events + 1, minutes + event_info.duration)
+
+        return totals
+
+    def search_events(self, query, limit=None):
+        """
+        Returns the scheduled events and occurrences of recurring events whose description matches a search query
+
+        Every word of the query must be a word of the description; the last one may also be the start of a word
+
+        query: Search query, string
+        limit: Largest number of events to return, int, or None for all of them
+        return: List of tuples in order of day and start time, (key, event_id, event_info); occurrences of recurring events use the identifier of their recurrence
+        """
+        if not query_tokens(query):
+            return []
+
+        # Regular events; the storage backend holds all of them, while only some days may be in memory
+        if self._storage is not None:
+            hits = self._storage.events_matching(query_tokens(query), limit)
+        else:
+            if self._search_index is None:
+                self._search_index = SearchIndex()
+
+                for key in self._schedule_days:
+                    for event_id, event_info in self.schedule[key].items():
+                        self._search_index.add((key, event_id), event_info.description)
+
+            hits = [(key, event_id, self.schedule[key][event_id]) for key, event_id in self._search_index.matches(query)]
+
+        # Recurring events, expanded only if their description matches
+        for recurrence_id, rule in self.recurrences.items():
+            event_info = rule.get('event_info')
+
+            if text_matches(query, event_info.description):
+                for key in recurrence_keys(rule.get('key'), event_info.frequency, event_info.amount, rule.get('leap_years'), rule.get('key'), datetime.date.max.toordinal()):
+                    if key not in rule.get('exceptions'):
+                        hits.append((key, recurrence_id, event_info))
+
+        if limit is not None:
+            return heapq.nsmallest(limit, hits, key=lambda hit: (hit[0], hit[2].start))
+
+        return sorted(hits, key=lambda hit: (hit[0], hit[2].start))
+
+    def search_to_do(self, query):
+        """
+        Returns the items of the to-do list whose description matches a search query, with the same rules as search_events
+
+        query: Search query, string
+        return: List of tuples in to-do list order, (index, item)
+        """
+        if self._to_do_search_index is None:
+            self._to_do_search_index = SearchIndex()
+
+            for item in self.to_do_list:
+                self._to_do_search_index.add(item.get('key'), item.get('description'))
+
+        return sorted((self.to_do_index(key), self._to_do_items[key]) for key in self._to_do_search_index.matches(query))
+
+    def _to_do_reindex(self):
+        """
+        Rebuilds the lookups by key after the whole to-do list was replaced
+        """
+        self._to_do_items = {item.get('key'): item for item in self.to_do_list}
+        self._to_do_positions = {}
+        self._to_do_positions_valid = 0
+        self._to_do_search_index = None
+
+    def to_do_item(self, key):
+        """
+        Returns an item of the to-do list
+
+        key: Unique identifier of the item, UUID, string
+        return: To-do list item, dict
+        """
+        return self._to_do_items[key]
+
+    def to_do_index(self, key):
+        """
+        Returns the index of an item in the to-do list
+
+        Indices are remembered, and only found again past the first item moved or removed since, so repeated lookups take constant time
+
+        key: Unique identifier of the item, UUID, string
+        return: Index of the item in the to-do list, int
+        """
+        index = self._to_do_positions.get(key)
+
+        # An item moved past the known indices may still have its old index
+        if index is not None and index < self._to_do_positions_valid and self.to_do_list[index].get('key') == key:
+            return index
+
+        if key not in self._to_do_items:
+            raise KeyError(key)
+
+        # Find indices from the first one not known until the item is reached
+        for index in range(self._to_do_positions_valid, len(self.to_do_list)):
+            item_key = self.to_do_list[index].get('key')
+            self._to_do_positions[item_key] = index
+            self._to_do_positions_valid = index + 1
+
+            if item_key == key:
+                return index
+
+        raise KeyError(key)
+
+    def to_do_toggle(self, key):
+        """
+        Checks or unchecks an item of the to-do list
+
+        key: Unique identifier of the item, UUID, string
+        return: Tuple, (index, item), of the toggled item
+        """
+        index = self.to_do_index(key)
+        item = self._to_do_items[key]
+
+        if item.get('completion') == str(CHECKBUTTON_OFF):
+            item = dict(item, completion=str(CHECKBUTTON_ON))
+        else:
+            item = dict(item, completion=str(CHECKBUTTON_OFF))
+
+        self.to_do_edit(index, index, item)
+
+        return (index, item)
+
+    def to_do_add(self, item):
+        """
+        Adds an item to the end of the to-do list
+
+        item: To-do list item, dict
+        """
+        self.to_do_list.append(item)
+        self._to_do_items[item.get('key')] = item
+        self.to_do_generation += 1
+
+        # Indices are still known if they were known for every other item
+        if self._to_do_positions_valid == len(self.to_do_list) - 1:
+            self._to_do_positions[item.get('key')] = len(self.to_do_list) - 1
+            self._to_do_positions_valid = len(self.to_do_list)
+
+        if self._to_do_search_index is not None:
+            self._to_do_search_index.add(item.get('key'), item.get('description'))
+
+        if self._storage is not None:
+            self._storage.add_task(len(self.to_do_list) - 1, item)
+
+    def to_do_edit(self, index, new_index, item):
+        """
+        Edits and, optionally, moves an item of the to-do list
+
+        index: Current index of the item in the to-do list, int
+        new_index: New index of the item in the to-do list, int
+        item: New to-do list item, dict
+        """
+        old_item = self.to_do_list[index]
+        self.to_do_generation += 1
+
+        # Editing in place does not change any index
+        if index == new_index:
+            self.to_do_list[index] = item
+        else:
+            del self.to_do_list[index]
+            self.to_do_list.insert(new_index, item)
+            self._to_do_positions_valid = min(self._to_do_positions_valid, index, new_index)
+
+        del self._to_do_items[old_item.get('key')]
+        self._to_do_items[item.get('key')] = item
+
+        if old_item.get('key') != item.get('key'):
+            self._to_do_positions.pop(old_item.get('key'), None)
+            self._to_do_positions_valid = min(self._to_do_positions_valid, index)
+
+        # Checking or unchecking an item does not change its words
+        if self._to_do_search_index is not None and (old_item.get('key'), old_item.get('description')) != (item.get('key'), item.get('description')):
+            self._to_do_search_index.remove(old_item.get('key'))
+            self._to_do_search_index.add(item.get('key'), item.get('description'))
+
+        if self._storage is not None:
+            self._storage.edit_task(index, new_index, item)
+
+    def to_do_remove(self, index):
+        """
+        Removes an item from the to-do list
+
+        index: Index of the item in the to-do list, int
+        """
+        item = self.to_do_list.pop(index)
+        self.to_do_generation += 1
+
+        del self._to_do_items[item.get('key')]
+        self._to_do_positions.pop(item.get('key'), None)
+        self._to_do_positions_valid = min(self._to_do_positions_valid, index)
+
+        if self._to_do_search_index is not None:
+            self._to_do_search_index.remove(item.get('key'))
+
+        if self._storage is not None:
+            self._storage.remove_task(index, item.get('key'))
+
+    def save(self, background=False):
+        """
+        Saves current schedule and to-do list to the backup files
+
+        In the background, a copy of the schedule and to-do list is taken on the calling thread and written on the writer thread;
+        a save requested while another is waiting replaces it, and the outcome is reported by poll_saves
+
+        background: Whether to write on the writer thread, boolean
+        """
+        if self._storage is not None:
+            job = functools.partial(self._storage.backup, os.path.join(self._file_location, self._database_old_file_name))
+        else:
+            self.poll_rest(wait=True)
+
+            # Event information is replaced rather than changed, so copying references is enough
+            days = [(key, dict(self.schedule[key])) for key in self._schedule_days]
+            rules = [(recurrence_id, dict(rule, exceptions=set(rule.get('exceptions')))) for recurrence_id, rule in self.recurrences.items()]
+            items = list(self.to_do_list)
+
+            job = functools.partial(self._snapshot_save, days, rules, items)
+
+        if background:
+            self._writer.submit('save', job)
+            return
+
+        try:
+            job()
+        except Exception as exception:
+            raise StorageError('unable to write to schedule or to-do list files.') from exception
+
+    @profiled('model._snapshot_save')
+    def _snapshot_save(self, days, rules, items):
+        """
+        Replaces the backup files with a copy of the schedule and to-do list; safe to run on a separate thread
+
+        days: List of tuples, (key, {event_id: event_info, ... })
+        rules: List of tuples, (recurrence_id, rule)
+        items: List of to-do list items, [item, ... ]
+        """
+        write_lines_atomic(os.path.join(self._file_location, self._schedule_old_file_name), itertools.chain([header_line()], (schedule_line(key, event_id, event_info) for key, events in days for event_id, event_info in events.items())))
+        write_lines_atomic(os.path.join(self._file_location, self._recurrences_old_file_name), itertools.chain([header_line()], (recurrence_line(recurrence_id, rule) for recurrence_id, rule in rules)))
+        self._to_do_write(self._to_do_list_old_file_name, items)
+
+    def autosave(self):
+        """
+        Stores the changes made since the last autosave, if any
+
+        Changes to the schedule are already in the journal, which is synced to disk; the to-do list is copied on the calling thread
+        and written on the writer thread. With a storage backend, every change is already stored
+
+        return: Whether a write was queued on the writer thread, to be reported by poll_saves, boolean
+        """
+        if self._storage is not None:
+            return False
+
+        if self.schedule_generation != self._schedule_saved_generation:
+            self._schedule_saved_generation = self.schedule_generation
+            self._journal.sync()
+
+        if self.to_do_generation == self._to_do_saved_generation:
+            return False
+
+        self._to_do_saved_generation = self.to_do_generation
+        items = list(self.to_do_list)
+        self._writer.submit('to-do', functools.partial(self._to_do_write, self._to_do_list_file_name, items))
+
+        return True
+
+    def poll_saves(self):
+        """
+        Returns the outcome of the saves written in the background since the last poll
+
+        return: Tuple, (whether saves are still being written, [error message, ... ] of failed saves)
+        """
+        # Saves finishing between the two calls are reported by the next poll
+        busy = self._writer.is_busy()
+        errors = []
+
+        for name, error in self._writer.poll():
+            if error is None:
+                continue
+
+            # Write the to-do list again at the next autosave
+            if name == 'to-do':
+                self._to_do_saved_generation = None
+
+            errors.append(str(error) if isinstance(error, StorageError) else 'unable to write to schedule or to-do list files.')
+
+        return (busy, errors)
@@ -0,0 +1,452 @@
+import os
+import re
+import time
+import datetime
+
+from utilities.constants import EVENT_RECURRENCE_FREQUENCY_DAYS, NUMBER_HOURS_IN_DAY, NUMBER_MINUTES_IN_HOUR, ICS_DEFAULT_COLOR, ICS_RECURRENCE_LIMIT
+
+from core.recurrence import key_to_date, date_to_key, recurrence_keys
+
+try:
+    import zoneinfo
+except ImportError:
+    zoneinfo = None
+
+# Largest recurrence amount the schedule files can hold
+MAX_RECURRENCE_AMOUNT = 999
+
+# Longest line of a calendar file in bytes, without its line break
+MAX_LINE_LENGTH = 75
+
+# Recurrence frequencies by number of days between occurrences
+FREQUENCIES_BY_DAYS = {days: frequency for frequency, days in EVENT_RECURRENCE_FREQUENCY_DAYS.items() if days is not None}
+
+# Days between occurrences of each iCalendar frequency with a fixed period
+ICS_FREQUENCY_DAYS = {'DAILY': 1, 'WEEKLY': 7}
+
+DURATION_PATTERN = re.compile(r'^([+-])?P(?:(\d+)W)?(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?$')
+
+class ImportReport:
+    """
+    Class for the statistics of importing a calendar file
+    """
+    def __init__(self, file_location):
+        """
+        Initializes the ImportReport class
+
+        file_location: Location of the file imported, string
+        """
+        self.file_location = file_location
+        self.components = 0
+        self.events = 0
+        self.recurrences = 0
+        self.skipped = 0
+        self.approximated = 0
+        self.seconds = 0.0
+
+    def summary(self):
+        """
+        Returns a description of the import for the user
+
+        return: Summary, string
+        """
+        summary = 'imported ' + str(self.events) + ' events and ' + str(self.recurrences) + ' recurring events from ' + os.path.basename(self.file_location) + ' in ' + '{:.2f}'.format(self.seconds) + ' s'
+
+        if self.approximated:
+            summary = summary + '; ' + str(self.approximated) + ' recurrences were approximated'
+
+        if self.skipped:
+            summary = summary + '; skipped ' + str(self.skipped) + ' events that could not be read'
+
+        return summary
+
+def escape_text(text):
+    """
+    Returns text escaped for a calendar file property value
+
+    text: Text, string
+    return: Escaped text, string
+    """
+    return text.replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,').replace('\n', '\\n')
+
+def unescape_text(text):
+    """
+    Returns the text of an escaped calendar file property value
+
+    text: Escaped text, string
+    return: Text, string
+    """
+    characters = []
+    escaped = False
+
+    for character in text:
+        if escaped:
+            characters.append('\n' if character in 'nN' else character)
+            escaped = False
+        elif character == '\\':
+            escaped = True
+        else:
+            characters.append(character)
+
+    return ''.join(characters)
+
+def fold_line(line):
+    """
+    Returns a line of a calendar file split into lines of at most MAX_LINE_LENGTH bytes, each continuation starting with a space
+
+    line: Line, string without line breaks
+    return: Folded line, string ending with a line break
+    """
+    if len(line.encode('utf-8')) <= MAX_LINE_LENGTH:
+        return line + '\r\n'
+
+    parts = []
+    part = []
+    length = 0
+
+    for character in line:
+        size = len(character.encode('utf-8'))
+
+        # Continuation lines lose one byte to their leading space
+        if length + size > MAX_LINE_LENGTH - (1 if parts else 0):
+            parts.append(''.join(part))
+            part = []
+            length = 0
+
+        part.append(character)
+        length += size
+
+    parts.append(''.join(part))
+
+    return '\r\n '.join(parts) + '\r\n'
+
+def unfolded_lines(opened_file):
+    """
+    Yields the lines of a calendar file with folded lines joined, one at a time
+
+    opened_file: Calendar file opened for reading, file
+    """
+    line = None
+
+    for physical_line in opened_file:
+        physical_line = physical_line.rstrip('\r\n')
+
+        if physical_line[:1] in (' ', '\t') and line is not None:
+            line = line + physical_line[1:]
+            continue
+
+        if line:
+            yield line
+
+        line = physical_line
+
+    if line:
+        yield line
+
+def parse_property(line):
+    """
+    Returns the parts of a calendar file property
+
+    line: Unfolded line, NAME;PARAMETER=VALUE:VALUE, string
+    return: Tuple, (name, {parameter: value}, value)
+    """
+    # The value starts at the first colon outside of quoted parameter values
+    if '"' in line:
+        quoted = False
+
+        for index, character in enumerate(line):
+            if character == '"':
+                quoted = not quoted
+            elif character == ':' and not quoted:
+                break
+        else:
+            raise ValueError('invalid calendar property')
+    else:
+        index = line.find(':')
+
+        if index < 0:
+            raise ValueError('invalid calendar property')
+
+    if ';' not in line[:index]:
+        return (line[:index].upper(), {}, line[index + 1:])
+
+    name, *parameters = line[:index].split(';')
+    parameters = dict(parameter.split('=', 1) for parameter in parameters if '=' in parameter)
+
+    return (name.upper(), {name.upper(): value.strip('"') for name, value in parameters.items()}, line[index + 1:])
+
+def read_components(file_location):
+    """
+    Yields the events of a calendar file one at a time, without reading the whole file
+
+    Components inside events, such as alarms, are left out
+
+    file_location: Location of the calendar file, string
+    return: Dictionaries of the properties of each event, {name: [(parameters, value), ... ]}
+    """
+    with open(file_location, 'r', encoding='utf-8', errors='replace') as opened_file:
+        component = None
+        depth = 0
+
+        for line in unfolded_lines(opened_file):
+            try:
+                name, parameters, value = parse_property(line)
+            except ValueError:
+                continue
+
+            if name == 'BEGIN':
+                if component is None and value.upper() == 'VEVENT':
+                    component = {}
+                elif component is not None:
+                    depth += 1
+
+            elif name == 'END':
+                if component is not None and depth > 0:
+                    depth -= 1
+                elif component is not None and value.upper() == 'VEVENT':
+                    yield component
+                    component = None
+
+            elif component is not None and depth == 0:
+                component.setdefault(name, []).append((parameters, value))
+
+def parse_date_time(value, parameters):
+    """
+    Returns the local date and time of a calendar file date or date-time value
+
+    value: Value, yyyymmdd or yyyymmddThhmmss with an optional Z for UTC, string
+    parameters: Parameters of the property, {parameter: value}
+    return: Tuple, (local date and time, whether the value is a date only), (datetime, boolean)
+    """
+    if parameters.get('VALUE') == 'DATE' or len(value) == 8:
+        return (datetime.datetime(int(value[:4]), int(value[4:6]), int(value[6:8])), True)
+
+    if len(value) < 15 or value[8] != 'T':
+        raise ValueError('invalid calendar date-time')
+
+    moment = datetime.datetime(int(value[:4]), int(value[4:6]), int(value[6:8]), int(value[9:11]), int(value[11:13]), int(value[13:15]))
+
+    # Convert times in UTC or in a named time zone to local time; times without a time zone are already local
+    if value.endswith('Z'):
+        moment = moment.replace(tzinfo=datetime.timezone.utc).astimezone().replace(tzinfo=None)
+    elif 'TZID' in parameters and zoneinfo is not None:
+        try:
+            moment = moment.replace(tzinfo=zoneinfo.ZoneInfo(parameters.get('TZID'))).astimezone().replace(tzinfo=None)
+        except (zoneinfo.ZoneInfoNotFoundError, ValueError):
+            pass
+
+    return (moment, False)
+
+def parse_duration(value):
+    """
+    Returns a calendar file duration
+
+    value: Duration, such as P1DT2H30M, string
+    return: Duration, timedelta
+    """
+    match = DURATION_PATTERN.match(value.strip())
+
+    if match is None:
+        raise ValueError('invalid calendar duration')
+
+    sign, weeks, days, hours, minutes, seconds = match.groups()
+    duration = datetime.timedelta(weeks=int(weeks or 0), days=int(days or 0), hours=int(hours or 0), minutes=int(minutes or 0), seconds=int(seconds or 0))
+
+    return -duration if sign == '-' else duration
+
+def parse_recurrence(value, key):
+    """
+    Returns the Hourglass recurrence closest to a calendar file recurrence rule
+
+    Rules with a fixed number of days between occurrences that Hourglass has a frequency for, and yearly rules, are kept as they are;
+    monthly rules become recurrences every 30 days, and rules limited to some days, by hour, or with other intervals are approximated
+
+    value: Recurrence rule, such as FREQ=WEEKLY;COUNT=10, string
+    key: Day of the first occurrence, day ordinal, int
+    return: Tuple, (frequency, amount, leap_years, whether the rule was approximated)
+    """
+    parts = dict(part.split('=', 1) for part in value.upper().split(';') if '=' in part)
+    ics_frequency = parts.get('FREQ')
+    interval = int(parts.get('INTERVAL', '1'))
+
+    # Parts narrowing the occurrences down are not kept
+    approximated = any(part.startswith('BY') and part != 'BYDAY' for part in parts) or ('BYDAY' in parts and ics_frequency != 'WEEKLY')
+
+    if ics_frequency == 'WEEKLY' and 'BYDAY' in parts and parts.get('BYDAY') != ['MO', 'TU', 'WE', 'TH', 'FR', 'SA', 'SU'][key_to_date(key).weekday()]:
+        approximated = True
+
+    if ics_frequency in ICS_FREQUENCY_DAYS and ICS_FREQUENCY_DAYS.get(ics_frequency) * interval in FREQUENCIES_BY_DAYS:
+        frequency = FREQUENCIES_BY_DAYS.get(ICS_FREQUENCY_DAYS.get(ics_frequency) * interval)
+        leap_years = False
+    elif ics_frequency == 'MONTHLY' and interval == 1:
+        frequency = 'monthly'
+        leap_years = False
+        approximated = True
+    elif ics_frequency == 'YEARLY' and interval == 1:
+        frequency = 'yearly'
+        leap_years = True
+    else:
+        raise ValueError('unsupported calendar recurrence rule')
+
+    # Number of occurrences, either given, up to a last day, or, for rules recurring forever, a fixed number
+    if 'COUNT' in parts:
+        amount = int(parts.get('COUNT'))
+    elif 'UNTIL' in parts:
+        last = date_to_key(parse_date_time(parts.get('UNTIL'), {})[0])
+        amount = sum(1 for _ in recurrence_keys(key, frequency, MAX_RECURRENCE_AMOUNT + 1, leap_years, key, last))
+    else:
+        amount = ICS_RECURRENCE_LIMIT
+        approximated = True
+
+    if amount > MAX_RECURRENCE_AMOUNT:
+        amount = MAX_RECURRENCE_AMOUNT
+        approximated = True
+
+    return (frequency, max(1, amount), leap_years, approximated)
+
+def read_events(file_location, report):
+    """
+    Yields the events of a calendar file in Hourglass terms one at a time, without reading the whole file
+
+    Events that cannot be read are counted in the report and left out, as are recurrence rules Hourglass cannot approximate, whose
+    first occurrence is kept
+
+    file_location: Location of the calendar file, string
+    report: Statistics of the import, updated as events are read, ImportReport
+    return: Tuples, (uid, key, start, duration, color, description, recurrence, overridden_key, cancelled), where recurrence is
+            None or a tuple (frequency, amount, leap_years, exceptions) and overridden_key is the day of the occurrence of a
+            recurring event that the event replaces, or None
+    """
+    start_time = time.perf_counter()
+
+    for component in read_components(file_location):
+        report.components += 1
+
+        try:
+            uid = component.get('UID', [({}, '')])[0][1]
+            parameters, value = component.get('DTSTART')[0]
+            start, all_day = parse_date_time(value, parameters)
+            key = date_to_key(start)
+
+            # Events lasting all day are shown at the start of the day
+            if all_day:
+                duration = 0
+            elif 'DTEND' in component:
+                parameters, value = component.get('DTEND')[0]
+                duration = int((parse_date_time(value, parameters)[0] - start).total_seconds() // 60)
+            elif 'DURATION' in component:
+                duration = int(parse_duration(component.get('DURATION')[0][1]).total_seconds() // 60)
+            else:
+                duration = 0
+
+            # Events are shown within their first day
+            minutes = start.hour * NUMBER_MINUTES_IN_HOUR + start.minute
+            duration = max(0, min(duration, NUMBER_HOURS_IN_DAY * NUMBER_MINUTES_IN_HOUR - minutes))
+
+            description = ' '.join(unescape_text(component.get('SUMMARY', [({}, '')])[0][1]).split())
+
+            # Colors written by Hourglass, or CSS hex colors
+            color = int(ICS_DEFAULT_COLOR[1:], 16)
+
+            for name in ['X-HOURGLASS-COLOR', 'COLOR']:
+                hex_color = component.get(name, [({}, '')])[0][1].strip()
+
+                if len(hex_color) == 7 and hex_color[0] == '#':
+                    color = int(hex_color[1:], 16)
+                    break
+
+            cancelled = component.get('STATUS', [({}, '')])[0][1].upper() == 'CANCELLED'
+
+            # Replaced occurrence of a recurring event
+            overridden_key = None
+
+            if 'RECURRENCE-ID' in component:
+                parameters, value = component.get('RECURRENCE-ID')[0]
+                overridden_key = date_to_key(parse_date_time(value, parameters)[0])
+
+            # Recurrence rule and removed occurrences
+            recurrence = None
+
+            if 'RRULE' in component and overridden_key is None:
+                try:
+                    frequency, amount, leap_years, approximated = parse_recurrence(component.get('RRULE')[0][1], key)
+                except ValueError:
+                    frequency, amount, leap_years, approximated = ('none', 1, False, True)
+
+                exceptions = set()
+
+                for parameters, value in component.get('EXDATE', []):
+                    for exception in value.split(','):
+                        exceptions.add(date_to_key(parse_date_time(exception, parameters)[0]))
+
+                report.approximated += approximated
+
+                if frequency != 'none':
+                    recurrence = (frequency, amount, leap_years, exceptions)
+        except (TypeError, ValueError, OverflowError):
+            report.skipped += 1
+            continue
+
+        yield (uid, key, minutes, duration, color, description, recurrence, overridden_key, cancelled)
+
+    report.seconds = time.perf_counter() - start_time
+
+def event_lines(uid, key, event_info, stamp, rule=None):
+    """
+    Returns the lines describing an event in a calendar file
+
+    uid: Unique identifier of the event in the calendar file, string
+    key: Day of the event, or of the first occurrence of a recurring event, day ordinal, int
+    event_info: Event information, Event
+    stamp: Time the calendar file is written, yyyymmddThhmmssZ, string
+    rule: Recurrence rule for recurring events, dict with the keys 'key', 'leap_years', 'exceptions', and 'event_info', or None
+    return: Lines, list of strings
+    """
+    start = key_to_date(key).strftime('%Y%m%d') + 'T' + str(event_info.hour).zfill(2) + str(event_info.minute).zfill(2) + '00'
+
+    lines = ['BEGIN:VEVENT',
+                'UID:' + uid + '@hourglass',
+                'DTSTAMP:' + stamp,
+                'DTSTART:' + start,
+                'DURATION:PT' + str(event_info.duration // NUMBER_MINUTES_IN_HOUR) + 'H' + str(event_info.duration % NUMBER_MINUTES_IN_HOUR) + 'M',
+                'SUMMARY:' + escape_text(event_info.description),
+                'X-HOURGLASS-COLOR:' + event_info.hex_color]
+
+    if rule is not None:
+        days = EVENT_RECURRENCE_FREQUENCY_DAYS.get(event_info.frequency)
+
+        # Same month and day every year, otherwise a fixed number of days between occurrences
+        if event_info.frequency == 'yearly' and rule.get('leap_years'):
+            lines.append('RRULE:FREQ=YEARLY;COUNT=' + str(event_info.amount))
+        elif days == 7:
+            lines.append('RRULE:FREQ=WEEKLY;COUNT=' + str(event_info.amount))
+        else:
+            lines.append('RRULE:FREQ=DAILY;INTERVAL=' + str(days) + ';COUNT=' + str(event_info.amount))
+
+        if rule.get('exceptions'):
+            lines.append('EXDATE:' + ','.join(key_to_date(exception).strftime('%Y%m%d') + start[8:] for exception in sorted(rule.get('exceptions'))))
+
+    lines.append('END:VEVENT')
+
+    return [fold_line(line) for line in lines]
+
+def calendar_lines(events, rules):
+    """
+    Yields the lines of a calendar file holding the given events and recurring events, one event at a time
+
+    events: Iterable of tuples, (key, event_id, event_info)
+    rules: Iterable of tuples, (recurrence_id, rule)
+    """
+    stamp = datetime.datetime.now(datetime.timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+    yield fold_line('BEGIN:VCALENDAR')
+    yield fold_line('VERSION:2.0')
+    yield fold_line('PRODID:-//hourglass//hourglass//EN')
+
+    for key, event_id, event_info in events:
+        yield ''.join(event_lines(event_id, key, event_info, stamp))
+
+    for recurrence_id, rule in rules:
+        yield ''.join(event_lines(recurrence_id, rule.get('key'), rule.get('event_info'), stamp, rule=rule))
+
+    yield fold_line('END:VCALENDAR')
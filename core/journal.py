@@ -0,0 +1,95 @@
+import os
+
+from core.file_format import FILE_ENCODING
+
+class Journal:
+    """
+    Class for the append-only schedule journal
+
+    Records every change to the schedule as one line as it happens; records are replayed after reading the schedule files
+    """
+    def __init__(self, file_location):
+        """
+        Opens the journal for appending, creating it if needed
+
+        file_location: Location of the journal file, string
+        """
+        self._file_location = file_location
+
+        # Records moved aside while a compaction writes the schedule files
+        self._compacting_file_location = file_location + '.compacting'
+
+        self._file = open(self._file_location, 'a', encoding=FILE_ENCODING)
+
+    def records(self):
+        """
+        Yields all records, including those of an unfinished compaction, in the order they were appended
+        """
+        for file_location in [self._compacting_file_location, self._file_location]:
+            if os.path.exists(file_location):
+                with open(file_location, 'r', encoding=FILE_ENCODING, errors='replace') as opened_file:
+                    for line in opened_file:
+                        if line.endswith('\n'):
+                            yield line[:-1]
+
+    def append(self, record):
+        """
+        Appends a record
+
+        record: Record, string without line breaks
+        """
+        self._file.write(record + '\n')
+        self._file.flush()
+
+    def append_many(self, records):
+        """
+        Appends several records with a single write
+
+        records: Iterable of records, strings without line breaks
+        """
+        self._file.write(''.join(record + '\n' for record in records))
+        self._file.flush()
+
+    def sync(self):
+        """
+        Makes sure the records appended so far are on disk, not only handed to the operating system
+        """
+        os.fsync(self._file.fileno())
+
+    def is_empty(self):
+        """
+        Returns whether there are no records since the last compaction
+
+        return: Whether the journal is empty, boolean
+        """
+        return self._file.tell() == 0 and not os.path.exists(self._compacting_file_location)
+
+    def rotate(self):
+        """
+        Moves the current records aside for a compaction and starts appending to an empty journal
+        """
+        self._file.close()
+
+        # Keep the records of an unfinished compaction, as the new compaction has to cover them as well
+        if os.path.exists(self._compacting_file_location):
+            with open(self._file_location, 'r', encoding=FILE_ENCODING) as opened_file, open(self._compacting_file_location, 'a', encoding=FILE_ENCODING) as compacting_file:
+                compacting_file.write(opened_file.read())
+
+            os.remove(self._file_location)
+        else:
+            os.replace(self._file_location, self._compacting_file_location)
+
+        self._file = open(self._file_location, 'a', encoding=FILE_ENCODING)
+
+    def compacted(self):
+        """
+        Discards the records moved aside once a compaction has written them into the schedule files
+        """
+        if os.path.exists(self._compacting_file_location):
+            os.remove(self._compacting_file_location)
+
+    def close(self):
+        """
+        Closes the journal
+        """
+        self._file.close()
@@ -0,0 +1,131 @@
+import heapq
+import datetime
+
+# Minutes before the start of an event at which notifications are shown
+NOTIFICATION_MINUTES = (10, 1)
+
+class NotificationScheduler:
+    """
+    Class for planning event notifications
+
+    Keeps a min-heap of upcoming notification times so that only the next one has to be waited for
+    """
+    def __init__(self):
+        """
+        Initializes the NotificationScheduler class
+        """
+        # Heap of upcoming notifications
+        # [(time, order, key, event_id, minutes, start, event_info), ... ]
+        self._heap = []
+        self._order = 0
+
+        # Events that may be notified, {(key, event_id): event_info}
+        self._events = {}
+
+        # Notifications already shown, {(key, event_id, minutes), ... }
+        self._notified = set()
+
+    def plan(self, days, now):
+        """
+        Replaces all planned notifications with those of the given events
+
+        days: Dictionary, {day ordinal: {event_id: Event, ... }, ... }
+        now: Current moment, datetime
+        """
+        self._events = {(key, event_id): event_info for key, events in days.items() for event_id, event_info in events.items()}
+        self._notified = set(notified for notified in self._notified if (notified[0], notified[1]) in self._events)
+        self._heap = []
+
+        for (key, event_id), event_info in self._events.items():
+            self._push(key, event_id, event_info, now, heapify=False)
+
+        heapq.heapify(self._heap)
+
+    def update(self, key, event_id, event_info, now):
+        """
+        Adds, replaces, or removes the notifications of a single event
+
+        key: Day ordinal, int
+        event_id: Unique identifier of the event, UUID, string
+        event_info: Event information, Event, or None if the event was removed
+        now: Current moment, datetime
+        """
+        # Notifications of replaced or removed events are discarded when they reach the top of the heap
+        if event_info is None:
+            self._events.pop((key, event_id), None)
+        else:
+            self._events[(key, event_id)] = event_info
+            self._push(key, event_id, event_info, now)
+
+    def next_time(self):
+        """
+        Returns the time of the next planned notification
+
+        return: Time of the next notification, datetime, or None if there is none
+        """
+        while self._heap and not self._is_current(self._heap[0]):
+            heapq.heappop(self._heap)
+
+        return self._heap[0][0] if self._heap else None
+
+    def due(self, now, mark=True):
+        """
+        Removes and returns the notifications due at the given moment
+
+        now: Current moment, datetime
+        mark: Whether the returned notifications count as shown, boolean
+        return: List of tuples, (seconds until the event starts, minutes, event_info)
+        """
+        notifications = []
+
+        while self._heap and self._heap[0][0] <= now:
+            entry = heapq.heappop(self._heap)
+            time, order, key, event_id, minutes, start, event_info = entry
+
+            if not self._is_current(entry) or (key, event_id, minutes) in self._notified:
+                continue
+
+            seconds = (start - now).total_seconds()
+
+            # Ten minute notifications only while more than a minute is left, one minute notifications until the event starts
+            if (minutes > 1 and 60 < seconds <= minutes * 60) or (minutes == 1 and 0 < seconds <= 60):
+                notifications.append((seconds, minutes, event_info))
+
+                if mark:
+                    self._notified.add((key, event_id, minutes))
+
+        return notifications
+
+    def _push(self, key, event_id, event_info, now, heapify=True):
+        """
+        Adds the notifications of an event that are still to come
+
+        key: Day ordinal, int
+        event_id: Unique identifier of the event, UUID, string
+        event_info: Event information, Event
+        now: Current moment, datetime
+        heapify: Whether to keep the heap ordered after each addition, boolean
+        """
+        start = datetime.datetime.fromordinal(key) + datetime.timedelta(minutes=event_info.start)
+
+        for minutes in NOTIFICATION_MINUTES:
+            # Skip notifications whose window has already passed
+            if (start - now).total_seconds() <= (60 if minutes > 1 else 0):
+                continue
+
+            entry = (start - datetime.timedelta(minutes=minutes), self._order, key, event_id, minutes, start, event_info)
+            self._order += 1
+
+            if heapify:
+                heapq.heappush(self._heap, entry)
+            else:
+                self._heap.append(entry)
+
+    def _is_current(self, entry):
+        """
+        Returns whether a heap entry belongs to an event that was not replaced or removed since it was added
+
+        entry: Heap entry, tuple
+        return: Whether the entry is current, boolean
+        """
+        return self._events.get((entry[2], entry[3])) is entry[6]
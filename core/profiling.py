@@ -0,0 +1,95 @@
+import json
+import time
+import functools
+import threading
+
+class Profiler:
+    """
+    Class for recording the wall time and number of calls of instrumented functions
+
+    Records nothing until enabled, so instrumented functions only pay for a single check
+    """
+    def __init__(self):
+        """
+        Initializes the Profiler class
+        """
+        # Whether calls are recorded
+        self.enabled = False
+
+        # Recorded calls, {name: [calls, total seconds, longest seconds]}
+        self._records = {}
+
+        # Instrumented functions may run on separate threads
+        self._lock = threading.Lock()
+
+    def record(self, name, seconds):
+        """
+        Records a call
+
+        name: Name of the instrumented function, string
+        seconds: Wall time of the call, float
+        """
+        with self._lock:
+            record = self._records.get(name)
+
+            if record is None:
+                self._records[name] = [1, seconds, seconds]
+            else:
+                record[0] += 1
+                record[1] += seconds
+                record[2] = max(record[2], seconds)
+
+    def records(self):
+        """
+        Returns the recorded calls, longest total wall time first
+
+        return: List of dictionaries with the keys 'name', 'calls', 'total_seconds', 'mean_seconds', and 'max_seconds'
+        """
+        with self._lock:
+            records = [{'name': name, 'calls': calls, 'total_seconds': total, 'mean_seconds': total / calls, 'max_seconds': longest}
+                        for name, (calls, total, longest) in self._records.items()]
+
+        return sorted(records, key=lambda record: record.get('total_seconds'), reverse=True)
+
+    def reset(self):
+        """
+        Discards all recorded calls
+        """
+        with self._lock:
+            self._records = {}
+
+    def dump(self, file_location):
+        """
+        Writes the recorded calls to a JSON file
+
+        file_location: Location of the file to write to, string
+        """
+        with open(file_location, 'w') as opened_file:
+            json.dump({'enabled': self.enabled, 'records': self.records()}, opened_file, indent=4)
+
+# Profiler shared by the whole application
+PROFILER = Profiler()
+
+def profiled(name):
+    """
+    Returns a decorator recording the wall time and number of calls of a function while profiling is enabled
+
+    name: Name to record calls under, string
+    return: Decorator, function
+    """
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not PROFILER.enabled:
+                return function(*args, **kwargs)
+
+            start = time.perf_counter()
+
+            try:
+                return function(*args, **kwargs)
+            finally:
+                PROFILER.record(name, time.perf_counter() - start)
+
+        return wrapper
+
+    return decorator
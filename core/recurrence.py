@@ -0,0 +1,83 @@
+import datetime
+
+from utilities.constants import EVENT_RECURRENCE_FREQUENCY_DAYS
+
+def key_to_date(key):
+    """
+    Returns the date corresponding to the given schedule key
+
+    key: Day ordinal, int
+    return: Date, datetime.date
+    """
+    return datetime.date.fromordinal(key)
+
+def date_to_key(date):
+    """
+    Returns the schedule key corresponding to the given date
+
+    date: Date, datetime.date or datetime.datetime
+    return: Day ordinal, int
+    """
+    return date.toordinal()
+
+def key_to_string(key):
+    """
+    Returns the date corresponding to the given schedule key as written in files
+
+    key: Day ordinal, int
+    return: Date, yyyymmdd, string
+    """
+    date = datetime.date.fromordinal(key)
+    return str(date.year).zfill(4) + str(date.month).zfill(2) + str(date.day).zfill(2)
+
+def string_to_key(string):
+    """
+    Returns the schedule key corresponding to a date as written in files
+
+    string: Date, yyyymmdd, string
+    return: Day ordinal, int
+    """
+    return datetime.date(int(string[:4]), int(string[4:6]), int(string[6:8])).toordinal()
+
+def recurrence_keys(start, frequency, amount, leap_years, first, last):
+    """
+    Yields the schedule keys of a recurring event that fall within the given range, in order
+
+    Only the occurrences inside the range are computed, so the cost does not depend on the number of recurrences
+
+    start: Day of the first occurrence, day ordinal, int
+    frequency: Event recurrence frequency, string
+    amount: Event recurrence amount, int
+    leap_years: Whether yearly recurrences keep the same month and day, skipping years without that day, boolean
+    first: First day of the range, day ordinal, int
+    last: Last day of the range, day ordinal, int
+    """
+    delta = EVENT_RECURRENCE_FREQUENCY_DAYS.get(frequency)
+
+    # Not recurring
+    if delta is None:
+        if first <= start <= last:
+            yield start
+
+    # Same month and day every year
+    elif leap_years and frequency == 'yearly':
+        start_date = datetime.date.fromordinal(start)
+        first_year = datetime.date.fromordinal(first).year
+        last_year = datetime.date.fromordinal(last).year
+
+        for i in range(max(0, first_year - start_date.year), min(amount, last_year - start_date.year + 1)):
+            try:
+                key = start_date.replace(year=start_date.year + i).toordinal()
+            except ValueError:
+                continue
+
+            if first <= key <= last:
+                yield key
+
+    # Fixed number of days between occurrences
+    else:
+        lowest = max(0, -((start - first) // delta))
+        highest = min(amount - 1, (last - start) // delta)
+
+        for i in range(lowest, highest + 1):
+            yield start + i * delta
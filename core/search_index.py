@@ -0,0 +1,139 @@
+import re
+import bisect
+import functools
+
+# Words of a description; anything else separates them
+TOKEN_PATTERN = re.compile(r'\w+')
+
+@functools.lru_cache(maxsize=4096)
+def tokenize(text):
+    """
+    Returns the distinct lowercase words of a text; cached, as descriptions of recurring events repeat
+
+    text: Text, string
+    return: Words, frozenset of strings
+    """
+    return frozenset(TOKEN_PATTERN.findall(text.lower()))
+
+def query_tokens(query):
+    """
+    Returns the words of a search query in order
+
+    query: Search query, string
+    return: Words, list of strings
+    """
+    return TOKEN_PATTERN.findall(query.lower())
+
+def text_matches(query, text):
+    """
+    Returns whether a text matches a search query, with the same rules as SearchIndex.matches
+
+    query: Search query, string
+    text: Text, string
+    return: Whether every word of the query is a word of the text, the last one possibly only as a prefix, boolean
+    """
+    words = query_tokens(query)
+    tokens = tokenize(text)
+
+    if not words:
+        return False
+
+    return all(word in tokens for word in words[:-1]) and any(token.startswith(words[-1]) for token in tokens)
+
+class SearchIndex:
+    """
+    Class for an inverted index from words to the documents containing them
+
+    Documents are any hashable identifiers; the index is updated one document at a time
+    """
+    def __init__(self):
+        """
+        Initializes the SearchIndex class
+        """
+        # Documents containing each word, {word: {document, ... }}
+        self._postings = {}
+
+        # Words of each document, {document: frozenset of words}
+        self._documents = {}
+
+        # Indexed words in order, for prefix queries
+        self._words = []
+
+    def __len__(self):
+        """
+        Returns the number of indexed documents
+
+        return: Number of documents, int
+        """
+        return len(self._documents)
+
+    def add(self, document, text):
+        """
+        Indexes a document, replacing it if already indexed
+
+        document: Identifier of the document, hashable
+        text: Text of the document, string
+        """
+        if document in self._documents:
+            self.remove(document)
+
+        tokens = tokenize(text)
+        self._documents[document] = tokens
+
+        for token in tokens:
+            documents = self._postings.get(token)
+
+            if documents is None:
+                documents = self._postings[token] = set()
+                bisect.insort(self._words, token)
+
+            documents.add(document)
+
+    def remove(self, document):
+        """
+        Removes a document from the index, if indexed
+
+        document: Identifier of the document, hashable
+        """
+        tokens = self._documents.pop(document, ())
+
+        for token in tokens:
+            documents = self._postings.get(token)
+            documents.discard(document)
+
+            # Do not keep words without documents
+            if not documents:
+                del self._postings[token]
+                del self._words[bisect.bisect_left(self._words, token)]
+
+    def matches(self, query):
+        """
+        Returns the documents containing every word of a search query; the last word also matches as a prefix, for searching while typing
+
+        query: Search query, string
+        return: Documents, set
+        """
+        words = query_tokens(query)
+
+        if not words:
+            return set()
+
+        # Documents containing a word starting with the last word of the query
+        prefix = words[-1]
+        start = bisect.bisect_left(self._words, prefix)
+        end = bisect.bisect_left(self._words, prefix + '\U0010ffff')
+
+        candidates = [set().union(*(self._postings[word] for word in self._words[start:end]))]
+        candidates.extend(self._postings.get(word, set()) for word in words[:-1])
+
+        # Intersect starting from the fewest documents
+        candidates.sort(key=len)
+        result = set(candidates[0])
+
+        for documents in candidates[1:]:
+            if not result:
+                break
+
+            result &= documents
+
+        return result
@@ -0,0 +1,281 @@
+import sqlite3
+
+from core.event import Event
+from core.recurrence import key_to_string, string_to_key
+from core.search_index import tokenize
+
+# Number of events containing a word above which checking each event for the word is faster than looking up every event containing it
+COMMON_WORD_EVENTS = 10000
+
+def _words(events):
+    """
+    Yields the rows of the words table for events
+
+    events: Iterable of tuples, (event_id, description)
+    """
+    for event_id, description in events:
+        for word in tokenize(description):
+            yield (word, event_id)
+
+class SQLiteStorage:
+    """
+    Class for the SQLite storage backend
+
+    Stores events, recurring events, and to-do list tasks in a single database file; every change is its own transaction
+    """
+    def __init__(self, file_location):
+        """
+        Opens the database, creating its tables and indices if needed
+
+        file_location: Location of the database file, string
+        """
+        self._file_location = file_location
+        self._connection = sqlite3.connect(file_location)
+
+        # Databases created before events were indexed by word have their words indexed once
+        index_words = self._connection.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'words'").fetchone() is None
+
+        with self._connection:
+            self._connection.execute('CREATE TABLE IF NOT EXISTS events (event_id TEXT PRIMARY KEY, day TEXT NOT NULL, hour TEXT, minute TEXT, duration_hour TEXT, duration_minute TEXT, hex_color TEXT, recurrence_id TEXT, frequency TEXT, amount TEXT, description TEXT)')
+            self._connection.execute('CREATE INDEX IF NOT EXISTS events_day ON events (day)')
+            self._connection.execute('CREATE INDEX IF NOT EXISTS events_recurrence_id ON events (recurrence_id)')
+            self._connection.execute('CREATE TABLE IF NOT EXISTS words (word TEXT NOT NULL, event_id TEXT NOT NULL, PRIMARY KEY (word, event_id)) WITHOUT ROWID')
+            self._connection.execute('CREATE INDEX IF NOT EXISTS words_event_id ON words (event_id)')
+            self._connection.execute('CREATE TABLE IF NOT EXISTS recurrences (recurrence_id TEXT PRIMARY KEY, day TEXT NOT NULL, hour TEXT, minute TEXT, duration_hour TEXT, duration_minute TEXT, hex_color TEXT, frequency TEXT, amount TEXT, description TEXT, leap_years INTEGER, exceptions TEXT)')
+            self._connection.execute('CREATE TABLE IF NOT EXISTS tasks (key TEXT PRIMARY KEY, position INTEGER NOT NULL, completion TEXT, description TEXT)')
+            self._connection.execute('CREATE INDEX IF NOT EXISTS tasks_position ON tasks (position)')
+
+            if index_words:
+                self._connection.executemany('INSERT OR IGNORE INTO words VALUES (?, ?)', _words(self._connection.execute('SELECT event_id, description FROM events').fetchall()))
+
+    def is_empty(self):
+        """
+        Returns whether the database holds no events, recurring events, or tasks
+
+        return: Whether the database is empty, boolean
+        """
+        for table in ['events', 'recurrences', 'tasks']:
+            if self._connection.execute('SELECT 1 FROM ' + table + ' LIMIT 1').fetchone() is not None:
+                return False
+
+        return True
+
+    def events_between(self, first, last):
+        """
+        Returns all events between two days, inclusive
+
+        first: First day, day ordinal, int
+        last: Last day, day ordinal, int
+        return: List of tuples in day order, (key, event_id, event_info)
+        """
+        rows = self._connection.execute('SELECT day, event_id, hour, minute, duration_hour, duration_minute, hex_color, recurrence_id, frequency, amount, description FROM events WHERE day BETWEEN ? AND ? ORDER BY day', (key_to_string(first), key_to_string(last)))
+        return [(string_to_key(row[0]), row[1], Event.from_fields(*row[2:])) for row in rows]
+
+    def events_matching(self, words, limit=None):
+        """
+        Returns the events whose description has every given word as a word, the last one possibly only as the start of a word
+
+        Looks the words up in the words table instead of scanning every description; events are found from their rare words,
+        and checked for their common words, or, if every word is common, gone through in day order until enough of them match
+
+        words: Lowercase words, as returned by query_tokens, list of strings
+        limit: Largest number of events to return, int, or None for all of them
+        return: List of tuples in order of day and start time, (key, event_id, event_info)
+        """
+        if not words:
+            return []
+
+        # Words starting with the last word, and each other word
+        word_conditions = [('word >= ? AND word < ?', (words[-1], words[-1] + '\U0010ffff'))]
+        word_conditions.extend(('word = ?', (word,)) for word in set(words[:-1]))
+
+        conditions = []
+        parameters = []
+
+        for word_condition, word_parameters in word_conditions:
+            common = self._connection.execute('SELECT COUNT(*) FROM (SELECT 1 FROM words WHERE ' + word_condition + ' LIMIT ?)', word_parameters + (COMMON_WORD_EVENTS,)).fetchone()[0] == COMMON_WORD_EVENTS
+
+            if common:
+                conditions.append('EXISTS (SELECT 1 FROM words WHERE words.event_id = events.event_id AND ' + word_condition + ')')
+            else:
+                conditions.append('event_id IN (SELECT event_id FROM words WHERE ' + word_condition + ')')
+
+            parameters.extend(word_parameters)
+
+        query = 'SELECT day, event_id, hour, minute, duration_hour, duration_minute, hex_color, recurrence_id, frequency, amount, description FROM events WHERE ' + ' AND '.join(conditions) + ' ORDER BY day, hour, minute'
+
+        if limit is not None:
+            query = query + ' LIMIT ?'
+            parameters.append(limit)
+
+        rows = self._connection.execute(query, parameters)
+        return [(string_to_key(row[0]), row[1], Event.from_fields(*row[2:])) for row in rows]
+
+    def add_event(self, key, event_id, event_info):
+        """
+        Adds an event
+
+        key: Day ordinal, int
+        event_id: Unique identifier of the event, UUID, string
+        event_info: Event information, Event
+        """
+        with self._connection:
+            self._connection.execute('INSERT OR REPLACE INTO events VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', (event_id, key_to_string(key)) + event_info.fields())
+            self._connection.execute('DELETE FROM words WHERE event_id = ?', (event_id,))
+            self._connection.executemany('INSERT OR IGNORE INTO words VALUES (?, ?)', _words([(event_id, event_info.description)]))
+
+    def add_events(self, events):
+        """
+        Adds many events in a single transaction
+
+        events: Iterable of tuples, (key, event_id, event_info)
+        """
+        events = list(events)
+
+        with self._connection:
+            self._connection.executemany('INSERT OR REPLACE INTO events VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', ((event_id, key_to_string(key)) + event_info.fields() for key, event_id, event_info in events))
+            self._connection.executemany('DELETE FROM words WHERE event_id = ?', ((event_id,) for key, event_id, event_info in events))
+            self._connection.executemany('INSERT OR IGNORE INTO words VALUES (?, ?)', _words((event_id, event_info.description) for key, event_id, event_info in events))
+
+    def remove_event(self, event_id):
+        """
+        Removes an event
+
+        event_id: Unique identifier of the event, UUID, string
+        """
+        with self._connection:
+            self._connection.execute('DELETE FROM events WHERE event_id = ?', (event_id,))
+            self._connection.execute('DELETE FROM words WHERE event_id = ?', (event_id,))
+
+    def edit_series(self, recurrence_id, event_info):
+        """
+        Edits every event and the recurring event sharing a recurrence identifier
+
+        recurrence_id: Unique identifier of the recurrence, UUID, string
+        event_info: New event information, Event
+        """
+        row = event_info.fields()
+
+        with self._connection:
+            self._connection.execute('DELETE FROM words WHERE event_id IN (SELECT event_id FROM events WHERE recurrence_id = ?)', (recurrence_id,))
+            self._connection.executemany('INSERT OR IGNORE INTO words SELECT ?, event_id FROM events WHERE recurrence_id = ?', ((word, recurrence_id) for word in tokenize(event_info.description)))
+            self._connection.execute('UPDATE events SET hour = ?, minute = ?, duration_hour = ?, duration_minute = ?, hex_color = ?, recurrence_id = ?, frequency = ?, amount = ?, description = ? WHERE recurrence_id = ?', row + (recurrence_id,))
+            self._connection.execute('UPDATE recurrences SET hour = ?, minute = ?, duration_hour = ?, duration_minute = ?, hex_color = ?, frequency = ?, amount = ?, description = ? WHERE recurrence_id = ?', row[:5] + row[6:] + (recurrence_id,))
+
+    def remove_series(self, recurrence_id):
+        """
+        Removes every event and the recurring event sharing a recurrence identifier
+
+        recurrence_id: Unique identifier of the recurrence, UUID, string
+        """
+        with self._connection:
+            self._connection.execute('DELETE FROM words WHERE event_id IN (SELECT event_id FROM events WHERE recurrence_id = ?)', (recurrence_id,))
+            self._connection.execute('DELETE FROM events WHERE recurrence_id = ?', (recurrence_id,))
+            self._connection.execute('DELETE FROM recurrences WHERE recurrence_id = ?', (recurrence_id,))
+
+    def recurrences(self):
+        """
+        Returns all recurring events
+
+        return: List of tuples, (recurrence_id, rule)
+        """
+        rules = []
+
+        for row in self._connection.execute('SELECT recurrence_id, day, hour, minute, duration_hour, duration_minute, hex_color, frequency, amount, description, leap_years, exceptions FROM recurrences'):
+            event_info = Event.from_fields(*(row[2:7] + (row[0],) + row[7:10]))
+            exceptions = set(string_to_key(exception) for exception in row[11].split())
+            rules.append((row[0], {'key': string_to_key(row[1]), 'leap_years': bool(row[10]), 'exceptions': exceptions, 'event_info': event_info}))
+
+        return rules
+
+    def add_recurrence(self, recurrence_id, rule):
+        """
+        Adds or replaces a recurring event
+
+        recurrence_id: Unique identifier of the recurrence, UUID, string
+        rule: Recurrence rule, dict with the keys 'key', 'leap_years', 'exceptions', and 'event_info'
+        """
+        row = rule.get('event_info').fields()
+        exceptions = ' '.join(key_to_string(exception) for exception in sorted(rule.get('exceptions')))
+
+        with self._connection:
+            self._connection.execute('INSERT OR REPLACE INTO recurrences VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)', (recurrence_id, key_to_string(rule.get('key'))) + row[:5] + row[6:] + (int(rule.get('leap_years')), exceptions))
+
+    def tasks(self):
+        """
+        Returns all to-do list tasks in order
+
+        return: List of to-do list items, dict
+        """
+        return [{'key': row[0], 'completion': row[1], 'description': row[2]} for row in self._connection.execute('SELECT key, completion, description FROM tasks ORDER BY position')]
+
+    def add_task(self, index, item):
+        """
+        Inserts a to-do list task
+
+        index: Position of the task in the to-do list, int
+        item: To-do list item, dict
+        """
+        with self._connection:
+            self._connection.execute('UPDATE tasks SET position = position + 1 WHERE position >= ?', (index,))
+            self._connection.execute('INSERT OR REPLACE INTO tasks VALUES (?, ?, ?, ?)', (item.get('key'), index, item.get('completion'), item.get('description')))
+
+    def add_tasks(self, items):
+        """
+        Appends many to-do list tasks in a single transaction
+
+        items: List of to-do list items, dict
+        """
+        with self._connection:
+            start = self._connection.execute('SELECT COUNT(*) FROM tasks').fetchone()[0]
+            self._connection.executemany('INSERT OR REPLACE INTO tasks VALUES (?, ?, ?, ?)', ((item.get('key'), start + i, item.get('completion'), item.get('description')) for i, item in enumerate(items)))
+
+    def edit_task(self, index, new_index, item):
+        """
+        Edits and, optionally, moves a to-do list task
+
+        index: Current position of the task in the to-do list, int
+        new_index: New position of the task in the to-do list, int
+        item: New to-do list item, dict
+        """
+        with self._connection:
+            if new_index > index:
+                self._connection.execute('UPDATE tasks SET position = position - 1 WHERE position > ? AND position <= ?', (index, new_index))
+            elif new_index < index:
+                self._connection.execute('UPDATE tasks SET position = position + 1 WHERE position >= ? AND position < ?', (new_index, index))
+
+            self._connection.execute('UPDATE tasks SET position = ?, completion = ?, description = ? WHERE key = ?', (new_index, item.get('completion'), item.get('description'), item.get('key')))
+
+    def remove_task(self, index, key):
+        """
+        Removes a to-do list task
+
+        index: Position of the task in the to-do list, int
+        key: Unique identifier of the task, UUID, string
+        """
+        with self._connection:
+            self._connection.execute('DELETE FROM tasks WHERE key = ?', (key,))
+            self._connection.execute('UPDATE tasks SET position = position - 1 WHERE position > ?', (index,))
+
+    def backup(self, file_location):
+        """
+        Copies the whole database, as of its last committed change, to another file
+
+        Reads through a connection of its own, so it is safe to run on a separate thread
+
+        file_location: Location of the backup database file, string
+        """
+        source = sqlite3.connect(self._file_location)
+        destination = sqlite3.connect(file_location)
+
+        with destination:
+            source.backup(destination)
+
+        source.close()
+        destination.close()
+
+    def close(self):
+        """
+        Closes the database
+        """
+        self._connection.close()
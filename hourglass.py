@@ -1,8 +1,7 @@
 # Libraries
 import os
 import sys
-import uuid
-import calendar
+import time
 import datetime
 
 import tkinter as tk
@@ -15,7 +14,13 @@ from widgets.to_do_widget import ToDoWidget
 from widgets.week_widget import WeekWidget
 
 from utilities.functions import show_info, show_error, handle_exception, widget_focus
-from utilities.constants import NUMBER_DAYS_IN_WEEK
+from utilities.theme import PALETTES, STYLES, theme_mode, set_option_defaults
+from utilities.constants import NUMBER_DAYS_IN_WEEK, STORAGE_BACKEND, JOURNAL_COMPACTION_INTERVAL, AUTOSAVE_INTERVAL, STARTUP_MODE, STARTUP_POLL_INTERVAL, SAVE_POLL_INTERVAL, PROFILING, PROFILE_FILE_NAME
+
+from core.hourglass_model import HourglassModel, StorageError
+from core.recurrence import date_to_key
+from core.notification_scheduler import NotificationScheduler
+from core.profiling import PROFILER, profiled
 
 class Hourglass:
     """
@@ -27,6 +32,10 @@ class Hourglass:
         """
         Initializes the Hourglass class
         """
+        # Startup phases and the seconds from the start at which they ended, [(phase, seconds), ... ]
+        self.startup_times = []
+        self._startup_start = time.perf_counter()
+
         # Current moment
         self.now = datetime.datetime.now()
 
@@ -36,27 +45,42 @@ class Hourglass:
         # Default mode is dark mode
         self.is_dark_mode = True
         
-        # Colorway used by application
+        # Colorway used by application, and widget options by role computed from it
         self.colors = {}
+        self.styles = {}
 
-        # Schedule dictionary
-        # {(year, month, day): {{event_id: {event_info}},
-        #                       {event_id: {event_info}}, ... }}
-        self.schedule = {}
+        # Time hot paths from startup if configured
+        PROFILER.enabled = PROFILING
 
-        # To-do list
-        self.to_do_list = []
-
-        # Location and name of schedule and tasks files
+        # Schedule, recurring events, and to-do list
         self._file_location = os.path.join(os.path.dirname('__file__'), 'data/')
-        self._schedule_file_name = 'schedule.txt'
-        self._to_do_list_file_name = 'tasks.txt'
-        self._schedule_old_file_name = 'schedule_old.txt'
-        self._to_do_list_old_file_name = 'tasks_old.txt'
+        self.model = HourglassModel(self._file_location)
+
+        # Upcoming notifications for the current day and the next day
+        self._notification_scheduler = NotificationScheduler()
+        self._notification_window = None
+        self._notification_after = None
+
+        # Check for saves written in the background, None while none are
+        self._save_after = None
+
+        # Read from schedule, recurrences, and to-do list; in fast mode, only the displayed week and the notified days at first
+        try:
+            if STARTUP_MODE == 'fast':
+                first = self.displayed_sunday.date()
+                last = max(first + datetime.timedelta(days=NUMBER_DAYS_IN_WEEK - 1), self.now.date() + datetime.timedelta(days=1))
+                self.model.open(STORAGE_BACKEND, first, last)
+            else:
+                self.model.open(STORAGE_BACKEND)
+        except StorageError as error:
+            # Display an error message then exit the application
+            show_error(str(error))
+            sys.exit(1)
+
+        self._startup_phase('read')
 
-        # Read from schedule and to-do list files
-        self._schedule_read(self._schedule_file_name)
-        self._to_do_read(self._to_do_list_file_name)
+        # Keep notifications up to date with the schedule
+        self.model.add_listener(self._schedule_changed)
 
         # GUI
         self._root = tk.Tk()
@@ -64,6 +88,9 @@ class Hourglass:
         # Font
         self._root.option_add('*Font', 'helvetica')
 
+        # Set the colorway, so widgets start in the theme
+        self._set_colors()
+
         # Adjust default GUI size based on screen size
         self._screen_width = self._root.winfo_screenwidth()
         self._screen_height = self._root.winfo_screenheight()
@@ -94,9 +121,6 @@ class Hourglass:
         self._to_do_widget = ToDoWidget(self, self._root)
         self._settings_widget = SettingsWidget(self, self._root)
 
-        # Set the colorway
-        self._set_colors()
-
         # Change display colors to set colorway
         self.change_colors()
 
@@ -105,220 +129,292 @@ class Hourglass:
 
         # Set up notification function
         self.notify_mode = True
-        self._notify()
+        self.notifications_replan()
+
+        # Show the window before reading the rest of the schedule
+        self._root.update()
+        self._startup_phase('first paint')
 
+        self.model.load_rest()
+        self._poll_rest()
+
+        # Periodically compact the journal into the schedule files
+        self._root.after(JOURNAL_COMPACTION_INTERVAL, self._schedule_compact)
+
+        # Periodically store changes made since the last autosave
+        self._root.after(AUTOSAVE_INTERVAL, self._autosave)
+
+    def run(self):
+        """
+        Runs the application loop until the window is closed, then stores the schedule and to-do list
+        """
         # Application loop
         self._root.mainloop()
 
-        # Write to schedule and to-do list files
+        self.close()
+
+    def close(self):
+        """
+        Stores the schedule and to-do list; the window must already be closed
+        """
+        # Write to schedule, recurrences, and to-do list
         try:
-            self._schedule_write(self._schedule_file_name)
-            self._to_do_write(self._to_do_list_file_name)
-        except:
+            self.model.close()
+        except StorageError:
             # Display an error message then exit the application
             show_error('unable to write to schedule or to-do list files.')
             sys.exit(1)
     
+    def _startup_phase(self, phase):
+        """
+        Records the end of a startup phase
+
+        phase: Name of the phase, string
+        """
+        self.startup_times.append((phase, time.perf_counter() - self._startup_start))
+
+    def _poll_rest(self):
+        """
+        Merges the rest of the schedule once it has been read in the background, then redraws the week; calls itself until then
+        """
+        try:
+            loaded = self.model.poll_rest()
+        except StorageError as error:
+            # Display an error message then exit the application
+            show_error(str(error))
+            sys.exit(1)
+
+        if not loaded:
+            self._root.after(STARTUP_POLL_INTERVAL, self._poll_rest)
+            return
+
+        self._startup_phase('whole schedule')
+        self.update_week()
+
+        # Tell the user about malformed lines moved out of the schedule files
+        quarantined = [report.summary() for report in self.model.read_reports if report.quarantined]
+
+        if quarantined:
+            show_error('\n'.join(quarantined) + '.')
+
     def _set_title(self):
         """
-        Sets the title of the GUI window; calls itself each second to update
+        Sets the title of the GUI window; calls itself at the start of each day to update
         """
         # Set title using current month and year
         self.now = datetime.datetime.now()
         self._root.title('hourglass  -  ' + self.now.strftime('%B %Y').lower())
 
-        # Update again after 1 second
-        self._root.after(1000, self._set_title)
+        # Update again at midnight
+        self._root.after(self._milliseconds_until(self._next_midnight()), self._set_title)
     
+    @profiled('Hourglass._notify')
     def _notify(self):
         """
-        Checks for upcoming events and notifies user
+        Shows notifications that are due, then waits until the next notification or until the notified days change
         """
+        self._notification_after = None
         self.now = datetime.datetime.now()
-        
+
+        # Plan notifications for the new current day and next day
+        if self._notification_window != self.now.date():
+            self.notifications_replan()
+            return
+
         try:
-            if self.notify_mode:
-                # Check for upcoming events in the current day and the next day
-                for i in range(2):
-                    date = self.now + datetime.timedelta(days=i)
-                    year = date.strftime('%Y')
-                    month = date.strftime('%m')
-                    day = date.strftime('%d')
-
-                    key = (year, month, day)
-                    value = self.schedule.get(key)
-
-                    if value is not None:
-                        for event_id, event_info in value.items():
-                            delta = datetime.datetime(year=int(year), month=int(month), day=int(day), hour=int(event_info.get('hour')), minute=int(event_info.get('minute'))) - self.now
-                            
-                            # Ten minute notification
-                            if delta.total_seconds() < 600 and delta.total_seconds() > 60 and event_info.get('ten_minute_notified') is False:
-                                event_info['ten_minute_notified'] = True
-                                show_info(message='in ' + str(max(2, int(delta.total_seconds() / 60))) + ' minutes:\n' + event_info.get('description'))
-                            
-                            # One minute notification
-                            elif delta.total_seconds() < 60 and delta.total_seconds() > 0 and event_info.get('one_minute_notified') is False:
-                                event_info['one_minute_notified'] = True
-                                show_info(message='in 1 minute:\n' + event_info.get('description'))
+            for seconds, minutes, event_info in self._notification_scheduler.due(self.now, mark=self.notify_mode):
+                if not self.notify_mode:
+                    continue
+
+                # Ten minute notification
+                if minutes > 1:
+                    show_info(message='in ' + str(max(2, int(seconds / 60))) + ' minutes:\n' + event_info.description)
+                
+                # One minute notification
+                else:
+                    show_info(message='in 1 minute:\n' + event_info.description)
         except:
             pass
         
-        # Update again after 1 second
-        self._root.after(1000, self._notify)
+        self._notify_arm()
 
-    def _schedule_read(self, file_name):
+    def _notify_arm(self):
         """
-        Reads from schedule file
+        Waits until the next planned notification, or until midnight if it comes first
+        """
+        if self._notification_after is not None:
+            self._root.after_cancel(self._notification_after)
+
+        wake = self._next_midnight()
+        next_time = self._notification_scheduler.next_time()
+
+        if next_time is not None and next_time < wake:
+            wake = next_time
+
+        self._notification_after = self._root.after(self._milliseconds_until(wake), self._notify)
 
-        file_name: Name of the file to read from, string
+    def notifications_replan(self):
         """
+        Plans notifications for all events in the current day and the next day
+        """
+        self.now = datetime.datetime.now()
+        today = self.now.date()
+
         try:
-            # If the schedule file does not exist, create it
-            self._schedule_file_location = os.path.join(self._file_location, file_name)
-
-            if not os.path.exists(self._schedule_file_location):
-                with open(self._schedule_file_location, 'x') as opened_file:
-                    self._schedule_file = opened_file
-            
-            # Open and read
-            with open(self._schedule_file_location, 'r') as opened_file:
-                self._schedule_file = opened_file
-                
-                # Schedule dictionary
-                # {(year, month, day): {{event_id: {event_info}},
-                #                       {event_id: {event_info}}, ... }}
-                self.schedule = {}
-
-                # Read events from file
-                lines = self._schedule_file.readlines()
-
-                for line in lines:
-                    key = (line[:4], line[4:6], line[6:8])
-                    event_id = str(uuid.uuid4())
-                    event_info = {'hour': line[8:10], 'minute': line[10:12], 'duration_hour': line[12:14], 'duration_minute': line[14:16], 'hex_color': line[16:23], 'recurrence_id': line[23:59], 'frequency': line[59:66], 'amount': line[66:69], 'description': line[69:].strip(), 'ten_minute_notified': False, 'one_minute_notified': False}
-                    
-                    self.schedule.setdefault(key, {}).update({event_id: event_info})
-                
-                # Close schedule file
-                self._schedule_file.close()
+            self._notification_scheduler.plan(self.model.events_between(today, today + datetime.timedelta(days=1)), self.now)
+            self._notification_window = today
         except:
-            # Display an error message then exit the application
-            show_error('unable to read from schedule file.')
-            sys.exit(1)
-    
-    def _schedule_write(self, file_name):
+            pass
+
+        self._notify_arm()
+
+    def _notifications_update(self, key, event_id, event_info):
         """
-        Writes to schedule file
+        Updates the notifications of a single event after it was added, edited, or removed
 
-        file_name: Name of the file to write to, string
+        key: Day ordinal, int
+        event_id: Unique identifier of the event, UUID, string
+        event_info: Event information, Event, or None if the event was removed
         """
-        try:
-            # If the schedule file does not exist, create it
-            self._schedule_file_location = os.path.join(self._file_location, file_name)
-
-            if not os.path.exists(self._schedule_file_location):
-                with open(self._schedule_file_location, 'x') as opened_file:
-                    self._schedule_file = opened_file
-            
-            # Open and write
-            with open(self._schedule_file_location, 'w') as opened_file:
-                self._schedule_file = opened_file
-
-                # Clear schedule file
-                self._schedule_file.seek(0)
-                self._schedule_file.truncate()
-
-                # Write events into file
-                for key in self.schedule:
-                    for event_id, event_info in self.schedule[key].items():
-                        line = key[0] + key[1] + key[2] + event_info.get('hour') + event_info.get('minute') + event_info.get('duration_hour') + event_info.get('duration_minute') + event_info.get('hex_color') + event_info.get('recurrence_id') + event_info.get('frequency') + event_info.get('amount') + event_info.get('description').strip() + '\n'
-                        self._schedule_file.write(line)
-                
-                # Close schedule file
-                self._schedule_file.close()
-        except:
-            # Display an error message then exit the application
-            show_error('unable to write to schedule file.')
-            sys.exit(1)
-    
-    def _to_do_read(self, file_name):
+        if self._notification_window is None:
+            return
+
+        # Only the current day and the next day are notified
+        if 0 <= key - date_to_key(self._notification_window) <= 1:
+            self.now = datetime.datetime.now()
+            self._notification_scheduler.update(key, event_id, event_info, self.now)
+            self._notify_arm()
+
+    def _schedule_changed(self, key, event_id, event_info):
+        """
+        Updates notifications after a change to the schedule
+
+        key: Day ordinal, int, or None after a change that may affect several days
+        event_id: Unique identifier of the event, UUID, string, or None
+        event_info: Event information, Event, or None
+        """
+        if key is None:
+            self._notifications_update_recurrence()
+        else:
+            self._notifications_update(key, event_id, event_info)
+
+    def _notifications_update_recurrence(self):
+        """
+        Updates notifications after a change that may affect several days, such as a change to a recurring event
+        """
+        if self._notification_window is not None:
+            self.notifications_replan()
+
+    def set_notify_mode(self, mode):
+        """
+        Turns notifications on or off
+
+        mode: Whether to show notifications, boolean
+        """
+        self.notify_mode = mode
+
+        # Notifications skipped while turned off are shown if still upcoming
+        if self.notify_mode:
+            self.notifications_replan()
+
+    def _next_midnight(self):
+        """
+        Returns the start of the next day
+
+        return: Next midnight, datetime
+        """
+        return datetime.datetime.combine(self.now.date() + datetime.timedelta(days=1), datetime.time())
+
+    def _milliseconds_until(self, moment):
+        """
+        Returns the number of milliseconds from now until the given moment, at least one
+
+        moment: Moment, datetime
+        return: Milliseconds, int
+        """
+        return max(1, int((moment - datetime.datetime.now()).total_seconds() * 1000) + 1)
+
+    def _schedule_compact(self):
+        """
+        Compacts the schedule journal into the schedule files in the background; calls itself periodically
+        """
+        if self.model.compaction_failed:
+            show_error('unable to write to schedule file; changes are kept in the schedule journal.')
+
+        self.model.compact()
+        self._root.after(JOURNAL_COMPACTION_INTERVAL, self._schedule_compact)
+
+    def _autosave(self):
+        """
+        Stores changes made since the last autosave in the background; calls itself periodically
+        """
+        if self.model.autosave() and self._save_after is None:
+            self._save_after = self._root.after(SAVE_POLL_INTERVAL, self._poll_save)
+
+        self._root.after(AUTOSAVE_INTERVAL, self._autosave)
+
+    def save(self):
+        """
+        Saves current schedule and to-do list in the background, keeping the window responsive
+        """
+        self.model.save(background=True)
+
+        if self._save_after is None:
+            self._save_after = self._root.after(SAVE_POLL_INTERVAL, self._poll_save)
+
+    def _poll_save(self):
+        """
+        Reports saves that failed; calls itself until all saves are written
         """
-        Reads from to-do list file
+        busy, errors = self.model.poll_saves()
 
-        file_name: Name of the file to read from, string
+        if busy:
+            self._save_after = self._root.after(SAVE_POLL_INTERVAL, self._poll_save)
+        else:
+            self._save_after = None
+
+        for error in errors:
+            show_error(error)
+
+    def import_calendar(self, file_location):
+        """
+        Adds the events of an iCalendar file to the schedule, then redraws the week once
+
+        file_location: Location of the calendar file, string
         """
         try:
-            # If the to-do list file does not exist, create it
-            self._to_do_list_file_location = os.path.join(self._file_location, file_name)
-
-            if not os.path.exists(self._to_do_list_file_location):
-                with open(self._to_do_list_file_location, 'x') as opened_file:
-                    self._to_do_list_file = opened_file
-            
-            # Open and read
-            with open(self._to_do_list_file_location, 'r') as opened_file:
-                self._to_do_list_file = opened_file
-
-                # To-do list
-                self.to_do_list = []
-
-                # Read from to-do list file
-                lines = self._to_do_list_file.readlines()
-
-                for line in lines:
-                    key = str(uuid.uuid4())
-                    contents = line.strip()
-                    item = {'key': key, 'completion': contents[0], 'description': contents[1:]}
-                    self.to_do_list.append(item)
-                
-                # Close to-do list file
-                self._to_do_list_file.close()
-        except:
-            # Display an error message then exit the application
-            show_error('unable to read from to-do list file.')
-            sys.exit(1)
+            report = self.model.import_ics(file_location)
+        except StorageError as error:
+            # Events read before the error are kept
+            self.update_week()
+            show_error(str(error))
+            return
+
+        self.update_week()
+        show_info(report.summary() + '.')
 
-    def _to_do_write(self, file_name):
+    def export_calendar(self, file_location):
         """
-        Writes to to-do list file
+        Writes the schedule to an iCalendar file
 
-        file_name: Name of the file to write to, string
+        file_location: Location of the calendar file, string
         """
         try:
-            # If the to-do list file does not exist, create it
-            self._to_do_list_file_location = os.path.join(self._file_location, file_name)
-
-            if not os.path.exists(self._to_do_list_file_location):
-                with open(self._to_do_list_file_location, 'x') as opened_file:
-                    self._to_do_list_file = opened_file
-            
-            # Open and write
-            with open(self._to_do_list_file_location, 'w') as opened_file:
-                self._to_do_list_file = opened_file
-            
-                # Clear to-do list file
-                self._to_do_list_file.seek(0)
-                self._to_do_list_file.truncate()
-
-                # Write to to-do list file
-                for item in self.to_do_list:
-                    self._to_do_list_file.write(item.get('completion') + item.get('description').strip() + '\n')
-                
-                # Close to-do list file
-                self._to_do_list_file.close()
-        except:
-            # Display an error message then exit the application
-            show_error('unable to write to to-do list file.')
-            sys.exit(1)
+            self.model.export_ics(file_location)
+        except StorageError as error:
+            show_error(str(error))
 
-    def save(self):
+    def profile_dump(self):
         """
-        Saves current schedule and to-do list
+        Writes the wall time and number of calls of instrumented functions to the profile file
+
+        return: Location of the profile file, string
         """
-        self._schedule_write(self._schedule_old_file_name)
-        self._to_do_write(self._to_do_list_old_file_name)
-    
+        file_location = os.path.join(self._file_location, PROFILE_FILE_NAME)
+        PROFILER.dump(file_location)
+
+        return file_location
+
     def update_event_entry_date(self, days):
         """
         Updates event entry date based on the displayed day clicked by the user
@@ -345,35 +441,17 @@ class Hourglass:
     
     def _set_colors(self):
         """
-        Sets colors used by application based on light or dark mode
-        """
-        if self.is_dark_mode:
-            # Dark mode colors
-            self.colors = {
-                        'prompt_text_color': '#838383',
-                        'entry_text_color': '#c2c2c2',
-                        'label_text_color': '#c2c2c2',
-                        'menu_text_color': '#ebebeb',
-                        'background_color': '#2c2c2c',
-                        'widget_color': '#383838',
-                        'pressed_widget_color': '#2e2e2e',
-                        'faint_text_color': '#494949',
-                        'faint_display_color': '#424242'
-                        }
-        else:
-            # Light mode colors
-            self.colors = {
-                        'prompt_text_color': '#797979',
-                        'entry_text_color': '#4b4b4b',
-                        'label_text_color': '#4b4b4b',
-                        'menu_text_color': '#505050',
-                        'background_color': '#d3d3d3',
-                        'widget_color': '#b3b3b3',
-                        'pressed_widget_color': '#969696',
-                        'faint_text_color': '#a5a5a5',
-                        'faint_display_color': '#a1a1a1'
-                        }
+        Sets colors and widget styles used by application based on light or dark mode
+        """
+        mode = theme_mode(self.is_dark_mode)
+
+        self.colors = PALETTES.get(mode)
+        self.styles = STYLES.get(mode)
+
+        # Widgets created from now on start in the theme
+        set_option_defaults(self._root, mode)
     
+    @profiled('Hourglass.change_colors')
     def change_colors(self):
         """
         Changes colors for window and megawidgets based on current theme mode
@@ -382,7 +460,7 @@ class Hourglass:
         self._set_colors()
 
         # Change root color
-        self._root.config({'background': self.colors.get('background_color')})
+        self._root.config(self.styles.get('background'))
         
         # Change color for all megawidgets
         self._week_widget.change_colors()
@@ -392,4 +470,4 @@ class Hourglass:
         self._settings_widget.change_colors()
 
 if __name__ == '__main__':
-    Hourglass()
\ No newline at end of file
+    Hourglass().run()
\ No newline at end of file
@@ -0,0 +1,46 @@
+import os
+import sys
+import uuid
+import datetime
+
+import pytest
+
+# The core package is imported from the repository root, as hourglass.py does
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.event import Event
+from core.recurrence import date_to_key
+
+def event(start=540, duration=60, description='event', frequency='none', amount=1, recurrence_id=None):
+    """
+    Returns an event with a new recurrence identifier unless one is given
+
+    return: Event information, Event
+    """
+    return Event(start, duration, 0x4080c0, recurrence_id or str(uuid.uuid4()), frequency, amount, description)
+
+def recurrence(date, description, frequency, amount, exceptions=(), leap_years=False, start=600):
+    """
+    Returns a recurring event starting on a date
+
+    return: Tuple, (recurrence_id, rule)
+    """
+    recurrence_id = str(uuid.uuid4())
+    rule = {'key': date_to_key(date), 'leap_years': leap_years, 'exceptions': set(date_to_key(exception) for exception in exceptions), 'event_info': event(start, 30, description, frequency, amount, recurrence_id)}
+
+    return (recurrence_id, rule)
+
+def snapshot(model, first=datetime.date(2020, 1, 1), last=datetime.date(2030, 12, 31)):
+    """
+    Returns the events and occurrences of a model between two dates in a comparable form
+
+    return: Sorted list of tuples, (key, event_id, fields)
+    """
+    return sorted((key, event_id, event_info.fields()) for key, events in model.events_between(first, last).items() for event_id, event_info in events.items())
+
+@pytest.fixture
+def directory(tmp_path):
+    """
+    Returns an empty directory for the schedule, recurrences, and to-do list files
+    """
+    return str(tmp_path)
@@ -0,0 +1,20 @@
+from core.day_layout import overlap_columns
+
+def test_separate_intervals_take_the_whole_width():
+    assert overlap_columns([(60, 120, 'a'), (120, 180, 'b'), (600, 660, 'c')]) == {'a': (0, 1), 'b': (0, 1), 'c': (0, 1)}
+
+def test_overlapping_intervals_sit_side_by_side():
+    assert overlap_columns([(60, 180, 'a'), (90, 150, 'b'), (100, 120, 'c')]) == {'a': (0, 3), 'b': (1, 3), 'c': (2, 3)}
+
+def test_freed_columns_are_reused_within_a_group():
+    layout = overlap_columns([(0, 100, 'a'), (10, 30, 'b'), (40, 60, 'c'), (50, 120, 'd')])
+
+    assert layout == {'a': (0, 3), 'b': (1, 3), 'c': (1, 3), 'd': (2, 3)}
+
+def test_groups_have_their_own_number_of_columns():
+    layout = overlap_columns([(0, 60, 'a'), (30, 90, 'b'), (90, 150, 'c'), (200, 260, 'd'), (210, 230, 'e'), (220, 240, 'f')])
+
+    assert layout == {'a': (0, 2), 'b': (1, 2), 'c': (0, 1), 'd': (0, 3), 'e': (1, 3), 'f': (2, 3)}
+
+def test_no_intervals():
+    assert overlap_columns([]) == {}
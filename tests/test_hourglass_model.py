@@ -0,0 +1,154 @@
+import os
+import uuid
+import random
+import datetime
+
+from conftest import event, recurrence, snapshot
+
+from core.event import Event
+from core.file_format import HEADER_PREFIX, recurrence_line
+from core.recurrence import date_to_key, key_to_string
+from core.hourglass_model import HourglassModel
+
+def opened(directory, *arguments):
+    """
+    Returns a model opened on a directory
+
+    return: Model, HourglassModel
+    """
+    model = HourglassModel(directory)
+    model.open(*arguments)
+
+    return model
+
+def test_journal_replay_after_unclosed_model(directory):
+    model = opened(directory)
+
+    kept = str(uuid.uuid4())
+    edited = str(uuid.uuid4())
+    removed = str(uuid.uuid4())
+    key = date_to_key(datetime.date(2026, 3, 2))
+
+    model.schedule_add_event(key, kept, event(description='kept'))
+    model.schedule_add_event(key, edited, event(description='before edit'))
+    model.schedule_add_event(key + 1, removed, event(description='removed'))
+    model.schedule_edit_event(key, edited, event(720, 30, 'after edit'))
+    model.schedule_remove_event(key + 1, removed)
+
+    recurrence_id, rule = recurrence(datetime.date(2026, 3, 1), 'standup', 'daily', 10)
+    model.schedule_add_recurrence(recurrence_id, rule)
+    model.schedule_remove_occurrence(key, recurrence_id)
+
+    # The model is never closed, so only the journal holds the changes
+    assert os.path.getsize(os.path.join(directory, 'schedule.txt')) == 0
+
+    reopened = opened(directory)
+
+    assert snapshot(reopened) == snapshot(model)
+    assert {event_id for event_id in reopened.events_between(datetime.date(2026, 3, 2), datetime.date(2026, 3, 3)).get(key)} == {kept, edited}
+
+    reopened.close()
+
+def test_journal_replay_before_database_import(directory):
+    model = opened(directory)
+    event_id = str(uuid.uuid4())
+    model.schedule_add_event(date_to_key(datetime.date(2026, 3, 2)), event_id, event(description='journaled'))
+
+    database = opened(directory, 'sqlite')
+
+    assert snapshot(database) == snapshot(model)
+    database.close()
+
+    # The journal was compacted into the schedule files, so reading them again does not replay it twice
+    text = opened(directory)
+
+    assert snapshot(text) == snapshot(model)
+    text.close()
+
+def test_partial_open_and_poll_rest_equal_full_open(directory):
+    generator = random.Random(1)
+    model = opened(directory)
+    first = date_to_key(datetime.date(2025, 1, 1))
+
+    for i in range(2000):
+        model.schedule_add_event(first + generator.randrange(1000), str(uuid.uuid4()), event(generator.randrange(1380), 30, 'event ' + str(i)))
+
+    model.schedule_add_recurrence(*recurrence(datetime.date(2025, 2, 1), 'weekly', 'weekly', 52))
+    model.close()
+
+    full = opened(directory)
+    week = (datetime.date(2026, 1, 4), datetime.date(2026, 1, 10))
+    partial = opened(directory, 'text', *week)
+
+    assert snapshot(partial, *week) == snapshot(full, *week)
+    assert partial.poll_rest(wait=True)
+    assert snapshot(partial) == snapshot(full)
+    assert partial.day_totals(datetime.date(2025, 1, 1), datetime.date(2027, 12, 31)) == full.day_totals(datetime.date(2025, 1, 1), datetime.date(2027, 12, 31))
+
+    partial.close()
+    full.close()
+
+def test_partial_open_reads_non_ascii_descriptions(directory):
+    model = opened(directory)
+    key = date_to_key(datetime.date(2026, 5, 5))
+    model.schedule_add_event(key, str(uuid.uuid4()), event(description='café ☕'))
+    model.close()
+
+    partial = opened(directory, 'text', datetime.date(2026, 5, 5), datetime.date(2026, 5, 5))
+
+    assert [event_info.description for event_info in partial.events_between(datetime.date(2026, 5, 5), datetime.date(2026, 5, 5)).get(key).values()] == ['café ☕']
+    partial.close()
+
+def test_version_1_migration_keeps_events(directory):
+    key = date_to_key(datetime.date(2026, 4, 1))
+    events = [event(540, 60, 'first'), event(600, 90, 'second; with ä')]
+    recurrence_id, rule = recurrence(datetime.date(2026, 4, 6), 'weekly', 'weekly', 4, exceptions=[datetime.date(2026, 4, 13)])
+
+    # Version 1 files have no header line, and their lines no event or task identifiers
+    with open(os.path.join(directory, 'schedule.txt'), 'w', encoding='utf-8') as opened_file:
+        opened_file.writelines(key_to_string(key) + ''.join(event_info.fields()) + '\n' for event_info in events)
+
+    with open(os.path.join(directory, 'recurrences.txt'), 'w', encoding='utf-8') as opened_file:
+        opened_file.write(recurrence_line(recurrence_id, rule))
+
+    with open(os.path.join(directory, 'tasks.txt'), 'w', encoding='utf-8') as opened_file:
+        opened_file.write('0buy milk\n1call back\n')
+
+    model = opened(directory)
+
+    assert sorted(event_info.fields() for event_info in model.events_between(datetime.date(2026, 4, 1), datetime.date(2026, 4, 1)).get(key).values()) == sorted(event_info.fields() for event_info in events)
+    assert sorted(model.events_between(datetime.date(2026, 4, 1), datetime.date(2026, 4, 30))) == [key] + [date_to_key(datetime.date(2026, 4, day)) for day in (6, 20, 27)]
+    assert [(item.get('completion'), item.get('description')) for item in model.to_do_list] == [('0', 'buy milk'), ('1', 'call back')]
+
+    # The files are rewritten in the current version, so identifiers stay the same from now on
+    for file_name in ['schedule.txt', 'recurrences.txt', 'tasks.txt']:
+        with open(os.path.join(directory, file_name), encoding='utf-8') as opened_file:
+            assert opened_file.readline().startswith(HEADER_PREFIX)
+
+    before = snapshot(model)
+    model.close()
+
+    reopened = opened(directory)
+
+    assert snapshot(reopened) == before
+    reopened.close()
+
+def test_search_events_matches_in_both_backends(directory):
+    for backend in ['text', 'sqlite']:
+        os.mkdir(os.path.join(directory, backend))
+        model = opened(os.path.join(directory, backend), backend)
+        key = date_to_key(datetime.date(2026, 6, 1))
+
+        model.schedule_add_event(key + 1, str(uuid.uuid4()), event(600, 30, 'Team meeting'))
+        model.schedule_add_event(key, str(uuid.uuid4()), event(540, 30, 'team_lunch'))
+        model.schedule_add_event(key, str(uuid.uuid4()), event(480, 30, 'meetings review'))
+        model.schedule_add_recurrence(*recurrence(datetime.date(2026, 6, 2), 'weekly team meeting', 'weekly', 3, start=660))
+
+        # Every word but the last has to be a whole word of the description
+        assert [hit[2].description for hit in model.search_events('team mee')] == ['Team meeting', 'weekly team meeting', 'weekly team meeting', 'weekly team meeting']
+        assert [hit[2].description for hit in model.search_events('meeting')] == ['meetings review', 'Team meeting', 'weekly team meeting', 'weekly team meeting', 'weekly team meeting']
+        assert [hit[2].description for hit in model.search_events('mee', limit=2)] == ['meetings review', 'Team meeting']
+        assert [hit[2].description for hit in model.search_events('team_')] == ['team_lunch']
+        assert model.search_events('lunch') == []
+
+        model.close()
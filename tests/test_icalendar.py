@@ -0,0 +1,82 @@
+import uuid
+import datetime
+
+from conftest import event, recurrence, snapshot
+
+from core.recurrence import date_to_key
+from core.hourglass_model import HourglassModel
+
+def events(model):
+    """
+    Returns the events and occurrences of a model without their identifiers
+
+    return: Sorted list of tuples, (key, fields without the recurrence identifier)
+    """
+    return sorted((key, fields[:5] + fields[6:]) for key, event_id, fields in snapshot(model))
+
+def rules(model):
+    """
+    Returns the recurring events of a model without their identifiers
+
+    return: Sorted list of tuples, (key, leap_years, exceptions, fields without the recurrence identifier)
+    """
+    return sorted((rule.get('key'), rule.get('leap_years'), sorted(rule.get('exceptions')), rule.get('event_info').fields()[:5] + rule.get('event_info').fields()[6:]) for rule in model.recurrences.values())
+
+def test_export_import_round_trip(tmp_path):
+    (tmp_path / 'exported').mkdir()
+    (tmp_path / 'imported').mkdir()
+
+    model = HourglassModel(str(tmp_path / 'exported'))
+    model.open()
+
+    key = date_to_key(datetime.date(2026, 2, 10))
+    model.schedule_add_event(key, str(uuid.uuid4()), event(0, 15, 'midnight'))
+    model.schedule_add_event(key, str(uuid.uuid4()), event(1425, 15, 'escaped, text; with \\ backslash'))
+
+    # Descriptions longer than a line of the calendar file are folded, possibly within a multibyte character
+    model.schedule_add_event(key + 1, str(uuid.uuid4()), event(600, 120, 'long ' + 'é' * 60 + ' ☕ description'))
+
+    model.schedule_add_recurrence(*recurrence(datetime.date(2026, 1, 1), 'daily', 'daily', 20, exceptions=[datetime.date(2026, 1, 5), datetime.date(2026, 1, 9)]))
+    model.schedule_add_recurrence(*recurrence(datetime.date(2026, 1, 2), 'weekly', 'weekly', 8, exceptions=[datetime.date(2026, 1, 16)]))
+    model.schedule_add_recurrence(*recurrence(datetime.date(2026, 1, 3), 'monthly', 'monthly', 6))
+    model.schedule_add_recurrence(*recurrence(datetime.date(2024, 2, 29), 'leap day', 'yearly', 5, leap_years=True))
+    model.schedule_add_recurrence(*recurrence(datetime.date(2026, 1, 4), 'every 365 days', 'yearly', 3))
+
+    file_location = str(tmp_path / 'calendar.ics')
+    model.export_ics(file_location)
+
+    with open(file_location, 'rb') as opened_file:
+        lines = opened_file.read().split(b'\r\n')
+
+    assert all(len(line) <= 75 for line in lines)
+    assert any(line.startswith(b' ') for line in lines)
+    assert any(line.startswith(b'EXDATE:') for line in lines)
+
+    imported = HourglassModel(str(tmp_path / 'imported'))
+    imported.open()
+    report = imported.import_ics(file_location)
+
+    assert (report.events, report.recurrences, report.skipped, report.approximated) == (3, 5, 0, 0)
+
+    # Identifiers are new, everything else is kept
+    assert rules(imported) == rules(model)
+    assert events(imported) == events(model)
+
+    model.close()
+    imported.close()
+
+def test_import_unfolds_lines(tmp_path):
+    file_location = str(tmp_path / 'calendar.ics')
+
+    with open(file_location, 'w', encoding='utf-8', newline='') as opened_file:
+        opened_file.write('BEGIN:VCALENDAR\r\nVERSION:2.0\r\nBEGIN:VEVENT\r\nUID:folded@example.com\r\nDTSTART:20260310T093000\r\nDURATION:PT45M\r\n'
+                          'SUMMARY:A summary folded \r\n over two lines\\, with a comma\r\nEND:VEVENT\r\nEND:VCALENDAR\r\n')
+
+    model = HourglassModel(str(tmp_path))
+    model.open()
+    report = model.import_ics(file_location)
+
+    assert report.events == 1
+    assert [(event_info.start, event_info.duration, event_info.description) for event_info in model.events_between(datetime.date(2026, 3, 10), datetime.date(2026, 3, 10)).get(date_to_key(datetime.date(2026, 3, 10))).values()] == [(570, 45, 'A summary folded over two lines, with a comma')]
+
+    model.close()
@@ -0,0 +1,57 @@
+import datetime
+
+from conftest import event
+
+from core.recurrence import date_to_key
+from core.notification_scheduler import NotificationScheduler
+
+DAY = datetime.date(2026, 7, 1)
+KEY = date_to_key(DAY)
+MIDNIGHT = datetime.datetime.combine(DAY, datetime.time())
+
+def planned(days):
+    """
+    Returns a scheduler planned at midnight
+
+    return: Scheduler, NotificationScheduler
+    """
+    scheduler = NotificationScheduler()
+    scheduler.plan(days, MIDNIGHT)
+
+    return scheduler
+
+def test_notifications_are_due_ten_and_one_minutes_before():
+    scheduler = planned({KEY: {'a': event(600, 30, 'standup')}})
+
+    assert scheduler.next_time() == MIDNIGHT + datetime.timedelta(minutes=590)
+    assert scheduler.due(MIDNIGHT + datetime.timedelta(minutes=589)) == []
+    assert [(minutes, event_info.description) for seconds, minutes, event_info in scheduler.due(MIDNIGHT + datetime.timedelta(minutes=590))] == [(10, 'standup')]
+    assert scheduler.next_time() == MIDNIGHT + datetime.timedelta(minutes=599)
+    assert [minutes for seconds, minutes, event_info in scheduler.due(MIDNIGHT + datetime.timedelta(minutes=599))] == [1]
+    assert scheduler.next_time() is None
+
+def test_edited_event_replaces_its_notifications():
+    scheduler = planned({KEY: {'a': event(600, 30, 'before')}})
+    scheduler.update(KEY, 'a', event(660, 30, 'after'), MIDNIGHT)
+
+    assert scheduler.next_time() == MIDNIGHT + datetime.timedelta(minutes=650)
+    assert scheduler.due(MIDNIGHT + datetime.timedelta(minutes=590)) == []
+    assert [event_info.description for seconds, minutes, event_info in scheduler.due(MIDNIGHT + datetime.timedelta(minutes=650))] == ['after']
+
+def test_removed_event_is_not_notified():
+    scheduler = planned({KEY: {'a': event(600, 30, 'removed'), 'b': event(720, 30, 'kept')}})
+    scheduler.update(KEY, 'a', None, MIDNIGHT)
+
+    assert scheduler.next_time() == MIDNIGHT + datetime.timedelta(minutes=710)
+    assert [event_info.description for seconds, minutes, event_info in scheduler.due(MIDNIGHT + datetime.timedelta(minutes=719))] == ['kept']
+
+def test_shown_notifications_are_not_repeated_after_planning_again():
+    days = {KEY: {'a': event(600, 30, 'standup')}}
+    scheduler = planned(days)
+    now = MIDNIGHT + datetime.timedelta(minutes=591)
+
+    assert len(scheduler.due(now)) == 1
+
+    scheduler.plan(days, now)
+
+    assert scheduler.due(now) == []
@@ -14,6 +14,73 @@ NUMBER_DISPLAY_WEEKS_IN_MONTH = 6
 # Maximum width of each event on the schedule in screen units
 EVENT_LABEL_WRAPLENGTH = 100
 
+# Shortest time given to an event when placing overlapping events side by side, so events without a duration still leave room for their text, in minutes
+EVENT_LABEL_MINIMUM_MINUTES = 30
+
+# Number of days whose placement of overlapping events is kept by the week view
+WEEK_LAYOUT_CACHE_DAYS = 56
+
+# Number of weeks whose layout is kept by the week view, including the adjacent weeks prepared in advance
+WEEK_LAYOUT_CACHE_WEEKS = 8
+
 # Constants for on/off values of check boxes
 CHECKBUTTON_ON = 1
-CHECKBUTTON_OFF = 0
\ No newline at end of file
+CHECKBUTTON_OFF = 0
+
+# Number of days between recurrences for each recurrence frequency (None for non-recurring events)
+EVENT_RECURRENCE_FREQUENCY_DAYS = {'none': None, 'daily': 1, 'weekly': 7, 'monthly': 30, 'yearly': 365}
+
+# Storage backend for the schedule and to-do list, either 'text' (whole text files written on exit) or 'sqlite' (every change stored as it happens)
+STORAGE_BACKEND = 'text'
+
+# Startup mode, either 'fast' (read the displayed week and the notified days, show the window, then read the rest of the schedule in the background) or 'full' (read the whole schedule before showing the window)
+STARTUP_MODE = 'fast'
+
+# Time between checks for the rest of the schedule read in the background during a fast startup in milliseconds
+STARTUP_POLL_INTERVAL = 50
+
+# Time between checks for saves written in the background in milliseconds
+SAVE_POLL_INTERVAL = 100
+
+# Time between autosaves of changes to the schedule and to-do list in milliseconds
+AUTOSAVE_INTERVAL = 60 * 1000
+
+# Time between compactions of the schedule journal into the schedule files in milliseconds
+JOURNAL_COMPACTION_INTERVAL = 5 * 60 * 1000
+
+# Whether hot paths are timed from startup; profiling can also be turned on from the debug panel (control-click the help label)
+PROFILING = False
+
+# Name of the file in the data directory that profiling results are dumped to
+PROFILE_FILE_NAME = 'profile.json'
+
+# Time between refreshes of the debug panel in milliseconds
+DEBUG_PANEL_REFRESH_INTERVAL = 1000
+
+# Measure by which days of the monthly calendar are tinted, either 'events' (number of events) or 'minutes' (booked minutes)
+CALENDAR_HEATMAP_MEASURE = 'minutes'
+
+# Number of events and booked minutes at which a day of the monthly calendar is tinted the most
+CALENDAR_HEATMAP_FULL_EVENTS = 8
+CALENDAR_HEATMAP_FULL_MINUTES = 8 * 60
+
+# Number of tints of days of the monthly calendar, including the untinted one for days without events
+CALENDAR_HEATMAP_LEVELS = 5
+
+# Largest number of scheduled events listed by a search
+SEARCH_RESULTS_LIMIT = 200
+
+# Time from the last key press to searching in milliseconds
+SEARCH_DELAY = 150
+
+# Number of to-do list rows scrolled by each step of the mouse wheel
+TO_DO_SCROLL_ROWS = 3
+
+# Color of events imported from calendar files that do not have one
+ICS_DEFAULT_COLOR = '#5b7fa6'
+
+# Number of occurrences given to recurring events imported from calendar files that recur forever
+ICS_RECURRENCE_LIMIT = 365
+
+# Number of imported events added to the schedule at a time
+ICS_IMPORT_BATCH_SIZE = 1000
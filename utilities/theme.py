@@ -0,0 +1,111 @@
+import functools
+
+from utilities.functions import light_or_dark_mode_text
+from utilities.constants import CALENDAR_HEATMAP_LEVELS
+
+# Colorways used by the application, by theme mode
+PALETTES = {
+    'dark': {
+            'prompt_text_color': '#838383',
+            'entry_text_color': '#c2c2c2',
+            'label_text_color': '#c2c2c2',
+            'menu_text_color': '#ebebeb',
+            'background_color': '#2c2c2c',
+            'widget_color': '#383838',
+            'pressed_widget_color': '#2e2e2e',
+            'faint_text_color': '#494949',
+            'faint_display_color': '#424242'
+            },
+    'light': {
+            'prompt_text_color': '#797979',
+            'entry_text_color': '#4b4b4b',
+            'label_text_color': '#4b4b4b',
+            'menu_text_color': '#505050',
+            'background_color': '#d3d3d3',
+            'widget_color': '#b3b3b3',
+            'pressed_widget_color': '#969696',
+            'faint_text_color': '#a5a5a5',
+            'faint_display_color': '#a1a1a1'
+            }
+}
+
+def _blend(hex_color, other_hex_color, fraction):
+    """
+    Returns a color between two colors
+
+    hex_color: Color at fraction 0, #rrggbb, string
+    other_hex_color: Color at fraction 1, #rrggbb, string
+    fraction: Position between the two colors, float
+    return: Hex color, string
+    """
+    channels = [round(int(hex_color[i:i + 2], 16) * (1 - fraction) + int(other_hex_color[i:i + 2], 16) * fraction) for i in (1, 3, 5)]
+
+    return '#' + ''.join(format(channel, '02x') for channel in channels)
+
+def _styles(colors):
+    """
+    Returns the widget options for each role a widget can play in the GUI
+
+    colors: Colorway, dictionary
+    return: Widget options by role, {role: {option: color}}, dictionary
+    """
+    return {
+            # Frames and buttons drawn on widgets
+            'frame': {'background': colors.get('widget_color')},
+            'label': {'foreground': colors.get('label_text_color'), 'background': colors.get('widget_color')},
+            'faint_label': {'foreground': colors.get('faint_text_color'), 'background': colors.get('widget_color')},
+            'faint_line': {'background': colors.get('faint_display_color')},
+            'prompt_entry': {'foreground': colors.get('prompt_text_color'), 'background': colors.get('widget_color')},
+            'scrollbar': {'background': colors.get('widget_color'), 'activebackground': colors.get('pressed_widget_color'), 'troughcolor': colors.get('background_color')},
+
+            # Frames and text drawn on the window background
+            'background': {'background': colors.get('background_color')},
+            'background_label': {'foreground': colors.get('label_text_color'), 'background': colors.get('background_color')},
+            'entry_label': {'foreground': colors.get('entry_text_color'), 'background': colors.get('background_color')},
+            'prompt': {'foreground': colors.get('prompt_text_color'), 'background': colors.get('background_color')},
+            'menu': {'foreground': colors.get('menu_text_color'), 'background': colors.get('background_color')},
+            'hidden': {'foreground': colors.get('background_color'), 'background': colors.get('background_color')},
+
+            # Days of the monthly calendar, from least to most booked; a list rather than a single options dict
+            'heatmap': [{'foreground': colors.get('label_text_color'),
+                            'background': _blend(colors.get('widget_color'), colors.get('label_text_color'), 0.4 * level / (CALENDAR_HEATMAP_LEVELS - 1))}
+                        for level in range(CALENDAR_HEATMAP_LEVELS)]
+            }
+
+# Widget options by role, by theme mode; computed once so theme switches only look them up
+STYLES = {mode: _styles(colors) for mode, colors in PALETTES.items()}
+
+def theme_mode(is_dark_mode):
+    """
+    Returns the name of the theme mode
+
+    is_dark_mode: Whether dark mode is used, boolean
+    return: Theme mode, either 'dark' or 'light', string
+    """
+    return 'dark' if is_dark_mode else 'light'
+
+@functools.lru_cache(maxsize=None)
+def contrast_text_color(color):
+    """
+    Returns the text color to be used on the given background color; cached, as events share few colors
+
+    color: Background color as a packed RGB integer, 0xrrggbb, int
+    return: Hex color, string
+    """
+    return light_or_dark_mode_text((color >> 16, (color >> 8) & 0xff, color & 0xff))
+
+def set_option_defaults(root, mode):
+    """
+    Sets the option database defaults so widgets created later, such as pooled labels and popups, start in the theme
+
+    Widgets that already exist keep their options; only their megawidgets restyle them
+
+    root: Root window, tkinter widget
+    mode: Theme mode, either 'dark' or 'light', string
+    """
+    styles = STYLES.get(mode)
+
+    for widget_class, role in [('Frame', 'frame'), ('Label', 'label'), ('Text', 'prompt_entry'), ('Entry', 'prompt_entry'),
+                                ('Menubutton', 'menu'), ('Checkbutton', 'label'), ('Toplevel', 'background')]:
+        for option, color in styles.get(role).items():
+            root.option_add('*' + widget_class + '.' + option, color)
@@ -1,11 +1,15 @@
+import math
 import calendar
 import datetime
 
 import tkinter as tk
 
-from utilities.constants import NUMBER_DISPLAY_WEEKS_IN_MONTH, NUMBER_DAYS_IN_WEEK, NUMBER_MONTHS_IN_YEAR
+from utilities.constants import NUMBER_DISPLAY_WEEKS_IN_MONTH, NUMBER_DAYS_IN_WEEK, NUMBER_MONTHS_IN_YEAR, CALENDAR_HEATMAP_MEASURE, CALENDAR_HEATMAP_FULL_EVENTS, CALENDAR_HEATMAP_FULL_MINUTES, CALENDAR_HEATMAP_LEVELS
 from utilities.functions import widget_pressed, widget_released
 
+from core.recurrence import date_to_key
+from core.profiling import profiled
+
 class CalendarWidget:
     """
     Class for the monthly calendar megawidget
@@ -76,6 +80,12 @@ class CalendarWidget:
         # Labels for days of the month
         self._calendar_month_days_labels = [[] for _ in range(NUMBER_DISPLAY_WEEKS_IN_MONTH)]
 
+        # Day ordinal displayed by each label, or None for labels outside the month
+        self._calendar_month_days = [[None for _ in range(NUMBER_DAYS_IN_WEEK)] for _ in range(NUMBER_DISPLAY_WEEKS_IN_MONTH)]
+
+        # Tint of each label, restored after the label is clicked
+        self._calendar_month_days_levels = [[0 for _ in range(NUMBER_DAYS_IN_WEEK)] for _ in range(NUMBER_DISPLAY_WEEKS_IN_MONTH)]
+
         for i in range(NUMBER_DISPLAY_WEEKS_IN_MONTH):
             for j in range(NUMBER_DAYS_IN_WEEK):
                 self._calendar_month_days_labels[i].append(tk.Label(self._calendar_frame, justify='right'))
@@ -84,6 +94,10 @@ class CalendarWidget:
         # Update displayed month with dates
         self._update_month()
 
+        # Keep the tints of the days up to date with the schedule
+        self._parent.model.add_listener(self._schedule_changed)
+
+    @profiled('CalendarWidget._update_month')
     def _update_month(self):
         """
         Updates calendar to display selected month
@@ -112,14 +126,80 @@ class CalendarWidget:
         for i in range(NUMBER_DISPLAY_WEEKS_IN_MONTH):
             for j in range(NUMBER_DAYS_IN_WEEK):
                 self._calendar_month_days_labels[i][j].config({'text': calendar_list[i * NUMBER_DAYS_IN_WEEK + j + 2 + NUMBER_DAYS_IN_WEEK]})
+                self._calendar_month_days[i][j] = None
 
                 try:
                     widget = self._calendar_month_days_labels[i][j]
                     day = datetime.datetime(self._displayed_year, self._displayed_month, int(self._calendar_month_days_labels[i][j].cget('text')))
                     self._calendar_month_days_labels[i][j].bind('<Button-1>', lambda event, day=day, widget=widget: self._parent.change_week(day=day, widget=widget))
-                    self._calendar_month_days_labels[i][j].bind('<ButtonRelease>', lambda event, widget=widget: widget_released(widget, self._parent.colors))
+                    self._calendar_month_days_labels[i][j].bind('<ButtonRelease>', lambda event, i=i, j=j: self._day_released(i, j))
+                    self._calendar_month_days[i][j] = date_to_key(day)
                 except:
                     pass
+
+        # Tint days by how booked they are
+        self._update_heatmap()
+
+    def _update_heatmap(self):
+        """
+        Tints each displayed day of the month by its number of events or booked minutes
+        """
+        first_key = date_to_key(datetime.date(self._displayed_year, self._displayed_month, 1))
+        last_key = first_key + calendar.monthrange(self._displayed_year, self._displayed_month)[1] - 1
+
+        # Totals of the month, one lookup per day
+        totals = self._parent.model.day_totals(datetime.date.fromordinal(first_key), datetime.date.fromordinal(last_key))
+        styles = self._parent.styles.get('heatmap')
+
+        for i in range(NUMBER_DISPLAY_WEEKS_IN_MONTH):
+            for j in range(NUMBER_DAYS_IN_WEEK):
+                key = self._calendar_month_days[i][j]
+                level = 0 if key is None else self._heatmap_level(totals.get(key, (0, 0)))
+
+                self._calendar_month_days_levels[i][j] = level
+                self._calendar_month_days_labels[i][j].config(styles[level])
+
+    def _heatmap_level(self, totals):
+        """
+        Returns the tint of a day from its totals
+
+        totals: Number of events and booked minutes of the day, tuple, (events, minutes)
+        return: Tint, from 0 for days without events to CALENDAR_HEATMAP_LEVELS - 1, int
+        """
+        events, minutes = totals
+
+        if events == 0:
+            return 0
+
+        if CALENDAR_HEATMAP_MEASURE == 'events':
+            fraction = events / CALENDAR_HEATMAP_FULL_EVENTS
+        else:
+            fraction = minutes / CALENDAR_HEATMAP_FULL_MINUTES
+
+        # Days with events are always tinted, even if they have no booked minutes
+        return max(1, min(CALENDAR_HEATMAP_LEVELS - 1, math.ceil(fraction * (CALENDAR_HEATMAP_LEVELS - 1))))
+
+    def _day_released(self, i, j):
+        """
+        Restores a clicked day of the month to its tint
+
+        i: Week of the clicked day in the displayed month, int
+        j: Day of the week of the clicked day, int
+        """
+        self._calendar_month_days_labels[i][j].config(self._parent.styles.get('heatmap')[self._calendar_month_days_levels[i][j]])
+
+    def _schedule_changed(self, key, event_id, event_info):
+        """
+        Updates the tints of the displayed days after a change to the schedule
+
+        key: Day ordinal, int, or None after a change that may affect several days
+        event_id: Unique identifier of the event, UUID, string, or None
+        event_info: Event information, Event, or None
+        """
+        first = date_to_key(datetime.date(self._displayed_year, self._displayed_month, 1))
+
+        if key is None or 0 <= key - first < calendar.monthrange(self._displayed_year, self._displayed_month)[1]:
+            self._update_heatmap()
     
     def _current_month(self, *args):
         """
@@ -166,22 +246,18 @@ class CalendarWidget:
         Changes colors for this megawidget and all descendant widgets based on current theme mode
         """
         # Change color for all descendant widgets
-        self._calendar_frame.config({'background': self._parent.colors.get('widget_color')})
+        self._calendar_frame.config(self._parent.styles.get('frame'))
 
-        self._month_buttons_frame.config({'background': self._parent.colors.get('widget_color')})
+        self._month_buttons_frame.config(self._parent.styles.get('frame'))
 
         for widget in [self._previous_month_label,
                         self._current_month_label,
                         self._next_month_label,
                         self._month_label]:
-            widget.config({'foreground': self._parent.colors.get('label_text_color')})
-            widget.config({'background': self._parent.colors.get('widget_color')})
+            widget.config(self._parent.styles.get('label'))
 
         for widget in self._calendar_week_days_labels:
-            widget.config({'foreground': self._parent.colors.get('label_text_color')})
-            widget.config({'background': self._parent.colors.get('widget_color')})
+            widget.config(self._parent.styles.get('label'))
 
-        for day in self._calendar_month_days_labels:
-            for widget in day:
-                widget.config({'foreground': self._parent.colors.get('label_text_color')})
-                widget.config({'background': self._parent.colors.get('widget_color')})
\ No newline at end of file
+        # Days of the month are tinted by how booked they are
+        self._update_heatmap()
\ No newline at end of file
@@ -0,0 +1,162 @@
+import tkinter as tk
+
+from utilities.constants import DEBUG_PANEL_REFRESH_INTERVAL
+from utilities.functions import widget_pressed, widget_released
+
+from core.profiling import PROFILER
+
+class DebugPanel:
+    """
+    Class for the debug panel showing the wall time and number of calls of instrumented functions
+
+    Creates a GUI popup for Hourglass
+    """
+    def __init__(self, parent, root):
+        """
+        Initializes the DebugPanel class
+
+        parent: Parent Hourglass
+        root: Root window, tkinter widget
+        """
+        # Parent Hourglass
+        self._parent = parent
+
+        # Window
+        self._root = tk.Toplevel(root)
+
+        # Title
+        self._root.title('hourglass debug')
+
+        # Set window size
+        self._width = 640
+        self._height = 360
+        self._root.geometry('{}x{}'.format(self._width, self._height))
+
+        # Row and column weights for widget placement
+        self._root.columnconfigure(0, weight=1)
+
+        self._root.rowconfigure(0, weight=1)
+        self._root.rowconfigure(1, weight=0)
+
+        # Table of recorded calls
+        self._text = tk.Text(self._root, width=1, height=1, borderwidth=0, highlightthickness=0, font=('courier', 11))
+        self._text.grid(row=0, column=0, padx=(6, 6), pady=(6, 3), sticky='NWSE')
+
+        # Frame for buttons
+        self._buttons_frame = tk.Frame(self._root, borderwidth=0, highlightthickness=0)
+        self._buttons_frame.grid(row=1, column=0, padx=(6, 6), pady=(3, 6), sticky='NWSE')
+
+        self._buttons_frame.columnconfigure(0, weight=1)
+        self._buttons_frame.columnconfigure(1, weight=1)
+        self._buttons_frame.columnconfigure(2, weight=1)
+        self._buttons_frame.columnconfigure(3, weight=3)
+
+        # Profiling on/off button
+        self._profiling_button = tk.Label(self._buttons_frame, borderwidth=0, highlightthickness=0)
+        self._profiling_button.bind('<Button-1>', self._toggle_profiling)
+        self._profiling_button.bind('<ButtonRelease>', lambda event: widget_released(event.widget, self._parent.colors))
+        self._profiling_button.grid(row=0, column=0, padx=(0, 3), sticky='NWSE')
+
+        # Reset button
+        self._reset_button = tk.Label(self._buttons_frame, text='reset', borderwidth=0, highlightthickness=0)
+        self._reset_button.bind('<Button-1>', self._reset)
+        self._reset_button.bind('<ButtonRelease>', lambda event: widget_released(event.widget, self._parent.colors))
+        self._reset_button.grid(row=0, column=1, padx=(3, 3), sticky='NWSE')
+
+        # Dump button
+        self._dump_button = tk.Label(self._buttons_frame, text='dump json', borderwidth=0, highlightthickness=0)
+        self._dump_button.bind('<Button-1>', self._dump)
+        self._dump_button.bind('<ButtonRelease>', lambda event: widget_released(event.widget, self._parent.colors))
+        self._dump_button.grid(row=0, column=2, padx=(3, 3), sticky='NWSE')
+
+        # Status of the last dump
+        self._status_label = tk.Label(self._buttons_frame, anchor='w', borderwidth=0, highlightthickness=0)
+        self._status_label.grid(row=0, column=3, padx=(3, 0), sticky='NWSE')
+
+        # Change display colors based on theme
+        self.change_colors()
+
+        # Show recorded calls until the window is closed
+        self._refresh()
+
+    def is_open(self):
+        """
+        Returns whether the panel window is still open
+
+        return: Whether the window is open, boolean
+        """
+        return bool(self._root.winfo_exists())
+
+    def lift(self):
+        """
+        Brings the panel window to the front
+        """
+        self._root.deiconify()
+        self._root.lift()
+
+    def _refresh(self):
+        """
+        Shows the recorded calls; calls itself periodically while the window is open
+        """
+        if not self.is_open():
+            return
+
+        self._profiling_button.config(text='profiling: on' if PROFILER.enabled else 'profiling: off')
+
+        lines = ['{:<28}{:>8}{:>12}{:>12}{:>12}'.format('function', 'calls', 'total ms', 'mean ms', 'max ms')]
+
+        for record in PROFILER.records():
+            lines.append('{:<28}{:>8}{:>12.2f}{:>12.3f}{:>12.3f}'.format(record.get('name'),
+                                                                            record.get('calls'),
+                                                                            record.get('total_seconds') * 1000,
+                                                                            record.get('mean_seconds') * 1000,
+                                                                            record.get('max_seconds') * 1000))
+
+        self._text.config({'state': 'normal'})
+        self._text.delete('1.0', tk.END)
+        self._text.insert(tk.END, '\n'.join(lines))
+        self._text.config({'state': 'disabled'})
+
+        self._root.after(DEBUG_PANEL_REFRESH_INTERVAL, self._refresh)
+
+    def _toggle_profiling(self, *args):
+        """
+        Turns recording of calls on or off
+        """
+        widget_pressed(self._profiling_button, self._parent.colors)
+
+        PROFILER.enabled = not PROFILER.enabled
+        self._profiling_button.config(text='profiling: on' if PROFILER.enabled else 'profiling: off')
+
+    def _reset(self, *args):
+        """
+        Discards all recorded calls
+        """
+        widget_pressed(self._reset_button, self._parent.colors)
+
+        PROFILER.reset()
+
+    def _dump(self, *args):
+        """
+        Writes the recorded calls to a JSON file in the data directory
+        """
+        widget_pressed(self._dump_button, self._parent.colors)
+
+        try:
+            self._status_label.config(text='written to ' + self._parent.profile_dump())
+        except OSError:
+            self._status_label.config(text='unable to write profile file.')
+
+    def change_colors(self):
+        """
+        Changes colors for the panel and all descendant widgets based on current theme mode
+        """
+        self._root.config(self._parent.styles.get('background'))
+        self._buttons_frame.config(self._parent.styles.get('background'))
+
+        self._text.config(self._parent.styles.get('label'))
+
+        for widget in [self._profiling_button, self._reset_button, self._dump_button]:
+            widget.config(self._parent.styles.get('label'))
+
+        self._status_label.config(self._parent.styles.get('prompt'))
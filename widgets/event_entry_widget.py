@@ -5,8 +5,11 @@ import datetime
 import tkinter as tk
 from tkinter.colorchooser import askcolor
 
-from utilities.constants import NUMBER_YEARS, NUMBER_MONTHS_IN_YEAR, NUMBER_HOURS_IN_DAY, NUMBER_MINUTES_IN_HOUR, NUMBER_EVENT_RECURRENCE, CHECKBUTTON_OFF, CHECKBUTTON_ON
-from utilities.functions import light_or_dark_mode_text
+from utilities.constants import NUMBER_YEARS, NUMBER_MONTHS_IN_YEAR, NUMBER_HOURS_IN_DAY, NUMBER_MINUTES_IN_HOUR, NUMBER_EVENT_RECURRENCE, EVENT_RECURRENCE_FREQUENCY_DAYS, CHECKBUTTON_OFF, CHECKBUTTON_ON
+from utilities.theme import contrast_text_color
+
+from core.event import Event
+from core.recurrence import date_to_key
 
 class EventEntryWidget:
     """
@@ -159,7 +162,6 @@ class EventEntryWidget:
         self._current_event_recurrence_frequency = tk.StringVar(self._event_entry_secondary_frame)
         self._current_event_recurrence_frequency.set('none')
         self._dropdown_event_recurrence_frequency = ['none', 'daily', 'weekly', 'monthly', 'yearly']
-        self._event_recurrence_frequency_dictionary = {'none': None, 'daily': 1, 'weekly': 7, 'monthly': 30, 'yearly': 365}
         self._event_recurrence_frequency_menu = tk.OptionMenu(self._event_entry_secondary_frame, self._current_event_recurrence_frequency, *self._dropdown_event_recurrence_frequency)
         self._event_recurrence_frequency_menu.grid(row=0, column=6, padx=(3, 2), sticky='NWSE')
 
@@ -195,18 +197,18 @@ class EventEntryWidget:
         Selects color for event
         """
         self._color_selection_dialog = askcolor(title='choose new event color...')
-        self._color_selection_label.config({'background': self._color_selection_dialog[1]})
-        self._current_event_hex = self._color_selection_dialog[1]
         
         if self._color_selection_dialog[0] is not None:
-            (r, g, b) = self._color_selection_dialog[0]
-            self._color_selection_label.config({'foreground': light_or_dark_mode_text((r, g, b))})
+            self._color_selection_label.config({'background': self._color_selection_dialog[1]})
+            self._current_event_hex = self._color_selection_dialog[1]
+
+            self._color_selection_label.config({'foreground': contrast_text_color(int(self._current_event_hex[1:], 16))})
     
     def _schedule_add(self, key, hour, minute, duration_hour, duration_minute, hex_color, description, frequency, amount, leap_years):
         """
         Adds an event to the schedule
 
-        key: Tuple of strings, (yyyy, mm, dd)
+        key: Day ordinal, int
         hour: Event start time hour, hh, string
         minute: Event start minute, mm, string
         duration_hour: Event duration hour, hh, string
@@ -222,46 +224,21 @@ class EventEntryWidget:
         recurrence_id = str(uuid.uuid4())
 
         # Whether event is recurring
-        delta = self._event_recurrence_frequency_dictionary.get(frequency)
+        delta = EVENT_RECURRENCE_FREQUENCY_DAYS.get(frequency)
 
-        # Recurrence amount formatting
+        # Non-recurring events occur once
         if delta is None:
             amount = '1'
-        
-        amount = amount.zfill(3)
 
-        # Add event
-        event_info = {'hour': hour, 'minute': minute, 'duration_hour': duration_hour, 'duration_minute': duration_minute, 'hex_color': hex_color, 'recurrence_id': recurrence_id, 'frequency': frequency.rjust(7), 'amount': amount, 'description': description, 'ten_minute_notified': False, 'one_minute_notified': False}
-        self._parent.schedule.setdefault(key, {}).update({event_id: event_info})
+        event_info = Event.from_fields(hour, minute, duration_hour, duration_minute, hex_color, recurrence_id, frequency, amount, description)
 
-        # If event is recurring, add its recurrences
+        # If event is recurring, add it as a single rule; its recurrences are expanded when displayed
         if delta is not None:
-            # Leap years mode
-            if leap_years == CHECKBUTTON_ON and frequency == 'yearly':
-                for i in range(1, int(amount)):
-                    try:
-                        # Recurrence date
-                        date = datetime.datetime(int(key[0]) + i, int(key[1]), int(key[2]))
-                        new_key = (str(date.year), str(date.month).zfill(2), str(date.day).zfill(2))
-
-                        # UUID of this recurrence
-                        event_id = str(uuid.uuid4())
-
-                        # Add recurrence
-                        self._parent.schedule.setdefault(new_key, {}).update({event_id: event_info})
-                    except:
-                        pass
-            else:
-                for i in range(1, int(amount)):
-                    # Recurrence date
-                    date = datetime.datetime(int(key[0]), int(key[1]), int(key[2])) + datetime.timedelta(days=i * delta)
-                    new_key = (str(date.year), str(date.month).zfill(2), str(date.day).zfill(2))
-
-                    # UUID of this recurrence
-                    event_id = str(uuid.uuid4())
-
-                    # Add recurrence
-                    self._parent.schedule.setdefault(new_key, {}).update({event_id: event_info})
+            self._parent.model.schedule_add_recurrence(recurrence_id, {'key': key, 'leap_years': leap_years == CHECKBUTTON_ON, 'exceptions': set(), 'event_info': event_info})
+
+        # Add event
+        else:
+            self._parent.model.schedule_add_event(key, event_id, event_info)
 
         # Update displayed week
         self._parent.update_week()
@@ -346,13 +323,13 @@ class EventEntryWidget:
     
     def _get_event_date(self):
         """
-        Returns the current event date entered as a tuple
+        Returns the current event date entered as a schedule key
 
-        return: Tuple of strings, (yyyy, mm, dd)
+        return: Day ordinal, int
         """
-        return (self._current_event_year.get(),
-                self._current_event_month.get(),
-                self._current_event_day.get())
+        return date_to_key(datetime.date(int(self._current_event_year.get()),
+                                        int(self._current_event_month.get()),
+                                        int(self._current_event_day.get())))
 
     def _get_event_hour(self):
         """
@@ -391,17 +368,15 @@ class EventEntryWidget:
         Changes colors for this megawidget and all descendant widgets based on current theme mode
         """
         # Change color for all descendant widgets
-        self._event_entry_frame.config({'background': self._parent.colors.get('background_color')})
+        self._event_entry_frame.config(self._parent.styles.get('background'))
 
-        self._event_entry_primary_frame.config({'background': self._parent.colors.get('background_color')})
+        self._event_entry_primary_frame.config(self._parent.styles.get('background'))
 
-        self._event_entry_secondary_frame.config({'background': self._parent.colors.get('background_color')})
+        self._event_entry_secondary_frame.config(self._parent.styles.get('background'))
 
-        self._event_entry.config({'foreground': self._parent.colors.get('prompt_text_color')})
-        self._event_entry.config({'background': self._parent.colors.get('widget_color')})
+        self._event_entry.config(self._parent.styles.get('prompt_entry'))
 
-        self._color_selection_label.config({'foreground': self._parent.colors.get('label_text_color')})
-        self._color_selection_label.config({'background': self._parent.colors.get('widget_color')})
+        self._color_selection_label.config(self._parent.styles.get('label'))
         self._current_event_hex = self._color_selection_label.cget('background')
 
         for widget in [self._year_selection_menu,
@@ -413,13 +388,11 @@ class EventEntryWidget:
                         self._duration_minute_menu,
                         self._event_recurrence_frequency_menu,
                         self._event_recurrence_amount_menu]:
-            widget.config({'foreground': self._parent.colors.get('menu_text_color')})
-            widget.config({'background': self._parent.colors.get('background_color')})
+            widget.config(self._parent.styles.get('menu'))
 
         for widget in [self._date_separator_label,
                         self._time_separator_label]:
-            widget.config({'foreground': self._parent.colors.get('label_text_color')})
-            widget.config({'background': self._parent.colors.get('background_color')})
+            widget.config(self._parent.styles.get('background_label'))
         
         for widget in [self._event_duration_label,
                         self._event_duration_label,
@@ -427,12 +400,9 @@ class EventEntryWidget:
                         self._event_duration_minute_label,
                         self._event_recurrence_prompt_label,
                         self._event_recurrence_times_label]:
-            widget.config({'foreground': self._parent.colors.get('prompt_text_color')})
-            widget.config({'background': self._parent.colors.get('background_color')})
+            widget.config(self._parent.styles.get('prompt'))
 
-        self._leap_years_checkbutton.config({'foreground': self._parent.colors.get('prompt_text_color')})
-        self._leap_years_checkbutton.config({'background': self._parent.colors.get('background_color')})
+        self._leap_years_checkbutton.config(self._parent.styles.get('prompt'))
 
         for widget in [self._placeholder_frame_widget, self._placeholder_text_widget]:
-            widget.config({'foreground': self._parent.colors.get('background_color')})
-            widget.config({'background': self._parent.colors.get('background_color')})
\ No newline at end of file
+            widget.config(self._parent.styles.get('hidden'))
\ No newline at end of file
@@ -4,7 +4,10 @@ import tkinter as tk
 from tkinter.colorchooser import askcolor
 
 from utilities.constants import NUMBER_HOURS_IN_DAY, NUMBER_MINUTES_IN_HOUR
-from utilities.functions import light_or_dark_mode_text, widget_pressed, widget_released
+from utilities.functions import widget_pressed, widget_released
+from utilities.theme import contrast_text_color
+
+from core.recurrence import key_to_date
 
 class EventMenu:
     """
@@ -18,8 +21,8 @@ class EventMenu:
 
         parent: Parent widget, tkinter widget
         darkmode: Whether the parent is currently in dark mode or not, boolean
-        key: Tuple of strings, (yyyy, mm, dd)
-        event_info: Event information, dict
+        key: Day ordinal, int
+        event_info: Event information, Event
         minutes_in_hour: The number of minutes in an hour, int
         hours_in_day: The number of hours in a day, int
         """
@@ -28,8 +31,8 @@ class EventMenu:
 
         # Set event information
         self._key = key
-        self._event_info = event_info.copy()
-        self._current_event_hex = self._event_info.get('hex_color')
+        self._event_info = event_info
+        self._current_event_hex = self._event_info.hex_color
         self._selected = None
 
         # Window
@@ -85,14 +88,15 @@ class EventMenu:
         self._date_recurrence_frame.columnconfigure(1, weight=0)
 
         # Event date
-        self._date_label = tk.Label(self._date_recurrence_frame, text=calendar.month_name[int(self._key[1])] + ' ' + self._key[2] + ', ' + self._key[0], borderwidth=0, highlightthickness=0)
+        date = key_to_date(self._key)
+        self._date_label = tk.Label(self._date_recurrence_frame, text=calendar.month_name[date.month] + ' ' + str(date.day).zfill(2) + ', ' + str(date.year), borderwidth=0, highlightthickness=0)
         self._date_label.grid(row=0, column=0, padx=(0, 3), sticky='NWSE')
 
         # Event recurrence
-        if self._event_info.get('frequency').strip() == 'none':
+        if self._event_info.frequency == 'none':
             recurrence_text = 'Not recurring'
         else:
-            recurrence_text = 'Recurring ' + self._event_info.get('frequency').strip() + ', ' + str(int(self._event_info.get('amount'))) + ' times'
+            recurrence_text = 'Recurring ' + self._event_info.frequency + ', ' + str(self._event_info.amount) + ' times'
         
         self._recurrence_label = tk.Label(self._date_recurrence_frame, text=recurrence_text, borderwidth=0, highlightthickness=0)
         self._recurrence_label.grid(row=0, column=1, padx=(3, 0), sticky='NWSE')
@@ -122,7 +126,7 @@ class EventMenu:
         # For selecting event start time
         # For selecting event start hour
         self._current_event_hour = tk.StringVar(self._time_color_frame)
-        self._current_event_hour.set(self._event_info.get('hour'))
+        self._current_event_hour.set(str(self._event_info.hour).zfill(2))
         self._dropdown_hours = [str(i).zfill(2) for i in range(0, NUMBER_HOURS_IN_DAY)]
         self._hour_selection_menu = tk.OptionMenu(self._time_color_frame, self._current_event_hour, *self._dropdown_hours)
         self._hour_selection_menu.config({'borderwidth': 0, 'highlightthickness': 0})
@@ -134,7 +138,7 @@ class EventMenu:
 
         # For selecting event start minute
         self._current_event_minute = tk.StringVar(self._time_color_frame)
-        self._current_event_minute.set(self._event_info.get('minute'))
+        self._current_event_minute.set(str(self._event_info.minute).zfill(2))
         self._dropdown_minutes = [str(i).zfill(2) for i in range(NUMBER_MINUTES_IN_HOUR)]
         self._minute_selection_menu = tk.OptionMenu(self._time_color_frame, self._current_event_minute, *self._dropdown_minutes)
         self._minute_selection_menu.config({'borderwidth': 0, 'highlightthickness': 0})
@@ -147,7 +151,7 @@ class EventMenu:
 
         # For selecting duration hour
         self._current_event_duration_hour = tk.StringVar(self._duration_frame)
-        self._current_event_duration_hour.set(self._event_info.get('duration_hour'))
+        self._current_event_duration_hour.set(str(self._event_info.duration // NUMBER_MINUTES_IN_HOUR).zfill(2))
         self._dropdown_duration_hour = [str(i).zfill(2) for i in range(NUMBER_HOURS_IN_DAY)]
         self._duration_hour_menu = tk.OptionMenu(self._duration_frame, self._current_event_duration_hour, *self._dropdown_duration_hour)
         self._duration_hour_menu.grid(row=0, column=1, padx=(3, 3), sticky='NWSE')
@@ -158,7 +162,7 @@ class EventMenu:
 
         # For selecting duration minute
         self._current_event_duration_minute = tk.StringVar(self._duration_frame)
-        self._current_event_duration_minute.set(self._event_info.get('duration_minute'))
+        self._current_event_duration_minute.set(str(self._event_info.duration % NUMBER_MINUTES_IN_HOUR).zfill(2))
         self._dropdown_duration_minute = [str(i).zfill(2) for i in range(NUMBER_MINUTES_IN_HOUR)]
         self._duration_minute_menu = tk.OptionMenu(self._duration_frame, self._current_event_duration_minute, *self._dropdown_duration_minute)
         self._duration_minute_menu.grid(row=0, column=3, padx=(3, 3), sticky='NWSE')
@@ -173,7 +177,7 @@ class EventMenu:
         """
         # Event description
         self._text = tk.Text(self._root, width=1, height=1, borderwidth=0, highlightthickness=0)
-        self._text.insert(tk.END, self._event_info.get('description'))
+        self._text.insert(tk.END, self._event_info.description)
         self._text.grid(row=3, column=0, padx=(6, 6), pady=(3, 3), sticky='NWSE')
 
     def _buttons_setup(self):
@@ -198,7 +202,7 @@ class EventMenu:
         # Edit all button
         self._edit_all_button = tk.Label(self._buttons_frame, text='edit all', borderwidth=0, highlightthickness=0)
 
-        if self._event_info.get('frequency').strip() != 'none':
+        if self._event_info.frequency != 'none':
             self._edit_all_button.bind('<Button-1>', lambda event: self._select(event.widget, 'edit_all'))
 
         self._edit_all_button.bind('<ButtonRelease>', lambda event: widget_released(event.widget, self._parent.colors))
@@ -213,7 +217,7 @@ class EventMenu:
         # Remove all button
         self._remove_all_button = tk.Label(self._buttons_frame, text='remove all', borderwidth=0, highlightthickness=0)
 
-        if self._event_info.get('frequency').strip() != 'none':
+        if self._event_info.frequency != 'none':
             self._remove_all_button.bind('<Button-1>', lambda event: self._select(event.widget, 'remove_all'))
 
         self._remove_all_button.bind('<ButtonRelease>', lambda event: widget_released(event.widget, self._parent.colors))
@@ -230,13 +234,13 @@ class EventMenu:
         Selects color for event
         """
         self._color_selection_dialog = askcolor(title='choose new event color...')
-        self._color_selection_label.config({'background': self._color_selection_dialog[1]})
-        self._current_event_hex = self._color_selection_dialog[1]
         
         # If a color was selected
         if self._color_selection_dialog[0] is not None:
-            (r, g, b) = self._color_selection_dialog[0]
-            self._color_selection_label.config({'foreground': light_or_dark_mode_text((r, g, b))})
+            self._color_selection_label.config({'background': self._color_selection_dialog[1]})
+            self._current_event_hex = self._color_selection_dialog[1]
+
+            self._color_selection_label.config({'foreground': contrast_text_color(int(self._current_event_hex[1:], 16))})
     
     def _select(self, widget, selection):
         """
@@ -250,12 +254,10 @@ class EventMenu:
         self._selected = selection
 
         if selection is not None:
-            self._event_info['hour'] = self._current_event_hour.get()
-            self._event_info['minute'] = self._current_event_minute.get()
-            self._event_info['duration_hour'] = self._current_event_duration_hour.get()
-            self._event_info['duration_minute'] = self._current_event_duration_minute.get()
-            self._event_info['hex_color'] = self._current_event_hex
-            self._event_info['description'] = self._text.get('1.0', tk.END).strip()
+            self._event_info = self._event_info.replace(start=int(self._current_event_hour.get()) * NUMBER_MINUTES_IN_HOUR + int(self._current_event_minute.get()),
+                                                        duration=int(self._current_event_duration_hour.get()) * NUMBER_MINUTES_IN_HOUR + int(self._current_event_duration_minute.get()),
+                                                        color=int(self._current_event_hex[1:], 16),
+                                                        description=self._text.get('1.0', tk.END).strip())
 
         self._root.destroy()
     
@@ -268,7 +270,7 @@ class EventMenu:
         # If no widget provided, start at root
         if parent is None:
             parent = self._root
-            parent.config({'background': self._parent.colors.get('background_color')})
+            parent.config(self._parent.styles.get('background'))
         
         # Change color for all descendant widgets
         for child in parent.winfo_children():
@@ -277,34 +279,26 @@ class EventMenu:
 
             if type(child) is tk.Label:
                 if child is self._color_selection_label:
-                    child.config({'foreground': light_or_dark_mode_text(tuple(int(self._current_event_hex[1:][i:i + 2], 16) for i in (0, 2, 4)))})
-                    child.config({'background': self._current_event_hex})
+                    child.config({'foreground': contrast_text_color(int(self._current_event_hex[1:], 16)), 'background': self._current_event_hex})
                 elif parent is self._date_recurrence_frame:
-                    child.config({'foreground': self._parent.colors.get('entry_text_color')})
-                    child.config({'background': self._parent.colors.get('background_color')})
+                    child.config(self._parent.styles.get('entry_label'))
                 elif parent is self._time_color_frame:
-                    child.config({'foreground': self._parent.colors.get('label_text_color')})
-                    child.config({'background': self._parent.colors.get('background_color')})
+                    child.config(self._parent.styles.get('background_label'))
                 elif parent is self._duration_frame:
-                    child.config({'foreground': self._parent.colors.get('prompt_text_color')})
-                    child.config({'background': self._parent.colors.get('background_color')})
-                elif self._event_info.get('frequency').strip() == 'none' and child in [self._edit_all_button, self._remove_all_button]:
-                    child.config({'foreground': self._parent.colors.get('faint_text_color')})
-                    child.config({'background': self._parent.colors.get('widget_color')})
+                    child.config(self._parent.styles.get('prompt'))
+                elif self._event_info.frequency == 'none' and child in [self._edit_all_button, self._remove_all_button]:
+                    child.config(self._parent.styles.get('faint_label'))
                 else:
-                    child.config({'foreground': self._parent.colors.get('label_text_color')})
-                    child.config({'background': self._parent.colors.get('widget_color')})
+                    child.config(self._parent.styles.get('label'))
             
             elif type(child) is tk.OptionMenu:
-                child.config({'foreground': self._parent.colors.get('menu_text_color')})
-                child.config({'background': self._parent.colors.get('background_color')})
+                child.config(self._parent.styles.get('menu'))
             
             elif type(child) is tk.Text:
-                child.config({'foreground': self._parent.colors.get('prompt_text_color')})
-                child.config({'background': self._parent.colors.get('widget_color')})
+                child.config(self._parent.styles.get('prompt_entry'))
 
             elif type(child) is tk.Frame:
-                child.config({'background': self._parent.colors.get('background_color')})
+                child.config(self._parent.styles.get('background'))
 
     def show(self):
         """
@@ -0,0 +1,176 @@
+import datetime
+
+import tkinter as tk
+
+from utilities.constants import SEARCH_RESULTS_LIMIT, SEARCH_DELAY
+
+from core.recurrence import key_to_date
+
+class SearchMenu:
+    """
+    Class for the search menu listing the events and tasks whose description matches a search query
+
+    Creates a GUI popup for Hourglass; selecting an event shows its week
+    """
+    def __init__(self, parent, root):
+        """
+        Initializes the SearchMenu class
+
+        parent: Parent Hourglass
+        root: Root window, tkinter widget
+        """
+        # Parent Hourglass
+        self._parent = parent
+
+        # What each listed result refers to, [('event', key), ('task', index), ... ]
+        self._results = []
+
+        # Pending search while the user types
+        self._search_after = None
+
+        # Window
+        self._root = tk.Toplevel(root)
+
+        # Title
+        self._root.title('search...')
+
+        # Set window size
+        self._width = 500
+        self._height = 360
+        self._root.geometry('{}x{}'.format(self._width, self._height))
+
+        # Set window position
+        self._x = root.winfo_x() + int(root.winfo_width() / 4)
+        self._y = root.winfo_y() + int(root.winfo_height() / 4)
+        self._root.geometry('+{}+{}'.format(self._x, self._y))
+
+        # Row and column weights for widget placement
+        self._root.columnconfigure(0, weight=1)
+
+        self._root.rowconfigure(0, weight=0)
+        self._root.rowconfigure(1, weight=1)
+        self._root.rowconfigure(2, weight=0)
+
+        # For entering the search query
+        self._search_entry = tk.Entry(self._root, borderwidth=0, highlightthickness=0)
+        self._search_entry.bind('<KeyRelease>', self._search_later)
+        self._search_entry.bind('<Return>', self._select_first)
+        self._search_entry.bind('<Down>', lambda event: self._results_list.focus_set())
+        self._search_entry.grid(row=0, column=0, padx=(6, 6), pady=(6, 3), sticky='NWSE')
+
+        # Matching events and tasks
+        self._results_list = tk.Listbox(self._root, activestyle='none', borderwidth=0, highlightthickness=0)
+        self._results_list.bind('<Double-Button-1>', self._select)
+        self._results_list.bind('<Return>', self._select)
+        self._results_list.grid(row=1, column=0, padx=(6, 6), pady=(3, 3), sticky='NWSE')
+
+        # Number of matches
+        self._status_label = tk.Label(self._root, anchor='w', borderwidth=0, highlightthickness=0)
+        self._status_label.grid(row=2, column=0, padx=(6, 6), pady=(3, 6), sticky='NWSE')
+
+        # Change display colors based on theme
+        self.change_colors()
+
+        self._search_entry.focus_set()
+
+    def is_open(self):
+        """
+        Returns whether the menu window is still open
+
+        return: Whether the window is open, boolean
+        """
+        return bool(self._root.winfo_exists())
+
+    def lift(self):
+        """
+        Brings the menu window to the front and focuses on the search entry
+        """
+        self._root.deiconify()
+        self._root.lift()
+        self._search_entry.focus_set()
+
+    def _search_later(self, event):
+        """
+        Searches once the user stops typing
+
+        event: Key release event, tkinter event
+        """
+        # Keys moving into the results do not change the query
+        if event.keysym in ['Return', 'Down']:
+            return
+
+        if self._search_after is not None:
+            self._root.after_cancel(self._search_after)
+
+        self._search_after = self._root.after(SEARCH_DELAY, self._search)
+
+    def _search(self):
+        """
+        Lists the events and tasks matching the search query
+        """
+        self._search_after = None
+        query = self._search_entry.get()
+
+        events = self._parent.model.search_events(query, limit=SEARCH_RESULTS_LIMIT + 1)
+        tasks = self._parent.model.search_to_do(query)
+
+        self._results = []
+        self._results_list.delete(0, tk.END)
+
+        # Events in order of day and start time
+        for key, event_id, event_info in events[:SEARCH_RESULTS_LIMIT]:
+            self._results.append(('event', key))
+            self._results_list.insert(tk.END, key_to_date(key).strftime('%m/%d/%Y') + '  ' + str(event_info.hour).zfill(2) + ':' + str(event_info.minute).zfill(2) + '  ' + event_info.description)
+
+        # Tasks in to-do list order
+        for index, item in tasks:
+            self._results.append(('task', index))
+            self._results_list.insert(tk.END, '✔︎  ' + item.get('description'))
+
+        if not query.strip():
+            self._status_label.config(text='')
+        elif len(events) > SEARCH_RESULTS_LIMIT:
+            self._status_label.config(text='first ' + str(SEARCH_RESULTS_LIMIT) + ' events and ' + str(len(tasks)) + ' tasks')
+        else:
+            self._status_label.config(text=str(len(events)) + ' events and ' + str(len(tasks)) + ' tasks')
+
+    def _select_first(self, *args):
+        """
+        Shows the week of the first matching event, searching first if the user is still typing
+        """
+        if self._search_after is not None:
+            self._root.after_cancel(self._search_after)
+            self._search()
+
+        if self._results:
+            self._results_list.selection_clear(0, tk.END)
+            self._results_list.selection_set(0)
+            self._select()
+
+    def _select(self, *args):
+        """
+        Shows the week of the selected event; tasks have no day, so selecting one does nothing
+        """
+        selection = self._results_list.curselection()
+
+        if not selection:
+            return
+
+        kind, reference = self._results[selection[0]]
+
+        if kind == 'event':
+            self._parent.change_week(day=datetime.datetime.combine(key_to_date(reference), datetime.time()))
+
+    def change_colors(self):
+        """
+        Changes colors for the menu and all descendant widgets based on current theme mode
+        """
+        self._root.config(self._parent.styles.get('background'))
+
+        self._search_entry.config(self._parent.styles.get('label'))
+        self._search_entry.config({'insertbackground': self._parent.colors.get('label_text_color')})
+
+        self._results_list.config(self._parent.styles.get('label'))
+        self._results_list.config({'selectforeground': self._parent.colors.get('label_text_color'), 'selectbackground': self._parent.colors.get('pressed_widget_color')})
+
+        self._status_label.config(self._parent.styles.get('prompt'))
@@ -1,5 +1,7 @@
 import tkinter as tk
-from tkinter import messagebox
+from tkinter import messagebox, filedialog
+
+from widgets.debug_panel import DebugPanel
 
 from utilities.functions import widget_pressed, widget_released
 
@@ -27,6 +29,7 @@ class SettingsWidget:
         self._settings_frame.columnconfigure(2, weight=1)
         self._settings_frame.columnconfigure(3, weight=1)
         self._settings_frame.columnconfigure(4, weight=1)
+        self._settings_frame.columnconfigure(5, weight=1)
 
         # For saving into text file
         self._save_label = tk.Label(self._settings_frame, text='save', borderwidth=0, highlightthickness=0)
@@ -34,21 +37,35 @@ class SettingsWidget:
         self._save_label.bind('<ButtonRelease>', lambda event: widget_released(self._save_label, self._parent.colors))
         self._save_label.grid(row=0, column=1, padx=(0, 3), sticky='NWSE')
 
+        # For importing and exporting calendar files
+        self._calendar_file_label = tk.Label(self._settings_frame, text='ics', borderwidth=0, highlightthickness=0)
+        self._calendar_file_label.bind('<Button-1>', self._show_calendar_file_menu)
+        self._calendar_file_label.bind('<ButtonRelease>', lambda event: widget_released(self._calendar_file_label, self._parent.colors))
+        self._calendar_file_label.grid(row=0, column=2, padx=(3, 3), sticky='NWSE')
+
+        self._calendar_file_menu = tk.Menu(self._root, tearoff=0)
+        self._calendar_file_menu.add_command(label='import .ics', command=self._import_calendar)
+        self._calendar_file_menu.add_command(label='export .ics', command=self._export_calendar)
+
         # For toggling notifications
         self._notification_label = tk.Label(self._settings_frame, text='⌛︎: on', borderwidth=0, highlightthickness=0)
         self._notification_label.bind('<Button-1>', self._toggle_notify)
         self._notification_label.bind('<ButtonRelease>', lambda event: widget_released(self._notification_label, self._parent.colors))
-        self._notification_label.grid(row=0, column=2, padx=(3, 3), sticky='NWSE')
+        self._notification_label.grid(row=0, column=3, padx=(3, 3), sticky='NWSE')
 
         # For switching between light/dark mode
         self._theme_mode_label = tk.Label(self._settings_frame, borderwidth=0, highlightthickness=0)
         self._theme_mode_label.bind('<Button-1>', self._set_theme_mode)
-        self._theme_mode_label.grid(row=0, column=3, padx=(3, 3), sticky='NWSE')
+        self._theme_mode_label.grid(row=0, column=4, padx=(3, 3), sticky='NWSE')
 
         # For how-to/help
         self._how_to_label = tk.Label(self._settings_frame, text='?', borderwidth=0, highlightthickness=0)
         self._how_to_label.bind('<Button-1>', self._show_how_to)
-        self._how_to_label.grid(row=0, column=4, padx=(3, 0), sticky='NWSE')
+        self._how_to_label.bind('<Control-Button-1>', self._show_debug_panel)
+        self._how_to_label.grid(row=0, column=5, padx=(3, 0), sticky='NWSE')
+
+        # Debug panel, hidden until opened
+        self._debug_panel = None
 
         # Set the theme
         self._set_theme_mode(change=False)
@@ -61,6 +78,34 @@ class SettingsWidget:
 
         # Save schedule and to-do list
         self._parent.save()
+
+    def _show_calendar_file_menu(self, event):
+        """
+        Shows the menu for importing and exporting calendar files
+
+        event: Click on the label, tkinter event
+        """
+        widget_pressed(self._calendar_file_label, self._parent.colors)
+
+        self._calendar_file_menu.post(event.x_root, event.y_root)
+
+    def _import_calendar(self):
+        """
+        Asks for an iCalendar file, then adds its events to the schedule
+        """
+        file_location = filedialog.askopenfilename(title='import calendar', filetypes=[('iCalendar', '*.ics'), ('all files', '*')])
+
+        if file_location:
+            self._parent.import_calendar(file_location)
+
+    def _export_calendar(self):
+        """
+        Asks for a file location, then writes the schedule to it as an iCalendar file
+        """
+        file_location = filedialog.asksaveasfilename(title='export calendar', defaultextension='.ics', initialfile='hourglass.ics', filetypes=[('iCalendar', '*.ics')])
+
+        if file_location:
+            self._parent.export_calendar(file_location)
     
     def _toggle_notify(self, *args):
         """
@@ -68,7 +113,7 @@ class SettingsWidget:
         """
         widget_pressed(self._notification_label, self._parent.colors)
 
-        self._parent.notify_mode = not self._parent.notify_mode
+        self._parent.set_notify_mode(not self._parent.notify_mode)
         
         if self._parent.notify_mode:
             self._notification_label.config({'text': '⌛︎: on'})
@@ -99,16 +144,34 @@ class SettingsWidget:
                                     'right click to edit/remove\n\n' +
                                     'click on days in monthly calendar ' +
                                     'to display events for that week\n\n' +
+                                    'control-f → search events and tasks\n' +
+                                    'ics → import/export calendar files\n' +
                                     'sun/moon → light/dark mode\n' +
                                     'pencil → custom event color')
     
+    def _show_debug_panel(self, *args):
+        """
+        Opens the debug panel, or brings it to the front if already open
+        """
+        if self._debug_panel is not None and self._debug_panel.is_open():
+            self._debug_panel.lift()
+        else:
+            self._debug_panel = DebugPanel(self._parent, self._root)
+
+        # Do not also show the how-to message
+        return 'break'
+
     def change_colors(self):
         """
         Changes colors for this megawidget and all descendant widgets based on current theme mode
         """
         # Change color for all descendant widgets
-        self._settings_frame.config({'background': self._parent.colors.get('background_color')})
+        self._settings_frame.config(self._parent.styles.get('background'))
+
+        self._calendar_file_menu.config(self._parent.styles.get('menu'))
+
+        for widget in [self._save_label, self._calendar_file_label, self._notification_label, self._theme_mode_label, self._how_to_label]:
+            widget.config(self._parent.styles.get('label'))
 
-        for widget in [self._save_label, self._notification_label, self._theme_mode_label, self._how_to_label]:
-            widget.config({'foreground': self._parent.colors.get('label_text_color')})
-            widget.config({'background': self._parent.colors.get('widget_color')})
\ No newline at end of file
+        if self._debug_panel is not None and self._debug_panel.is_open():
+            self._debug_panel.change_colors()
\ No newline at end of file
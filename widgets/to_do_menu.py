@@ -161,7 +161,7 @@ class ToDoMenu:
         # If no widget provided, start at root
         if parent is None:
             parent = self._root
-            parent.config({'background': self._parent.colors.get('background_color')})
+            parent.config(self._parent.styles.get('background'))
         
         # Change color for all descendant widgets
         for child in parent.winfo_children():
@@ -170,26 +170,21 @@ class ToDoMenu:
 
             if type(child) is tk.Label:
                 if parent is self._index_completion_frame:
-                    child.config({'foreground': self._parent.colors.get('label_text_color')})
-                    child.config({'background': self._parent.colors.get('background_color')})
+                    child.config(self._parent.styles.get('background_label'))
                 else:
-                    child.config({'foreground': self._parent.colors.get('label_text_color')})
-                    child.config({'background': self._parent.colors.get('widget_color')})
+                    child.config(self._parent.styles.get('label'))
             
             elif type(child) is tk.OptionMenu:
-                child.config({'foreground': self._parent.colors.get('menu_text_color')})
-                child.config({'background': self._parent.colors.get('background_color')})
+                child.config(self._parent.styles.get('menu'))
             
             elif type(child) is tk.Checkbutton:
-                child.config({'foreground': self._parent.colors.get('label_text_color')})
-                child.config({'background': self._parent.colors.get('background_color')})
+                child.config(self._parent.styles.get('background_label'))
             
             elif type(child) is tk.Text:
-                child.config({'foreground': self._parent.colors.get('prompt_text_color')})
-                child.config({'background': self._parent.colors.get('widget_color')})
+                child.config(self._parent.styles.get('prompt_entry'))
 
             elif type(child) is tk.Frame:
-                child.config({'background': self._parent.colors.get('background_color')})
+                child.config(self._parent.styles.get('background'))
 
     def show(self):
         """
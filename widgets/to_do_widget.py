@@ -4,9 +4,11 @@ import tkinter as tk
 
 from widgets.to_do_menu import ToDoMenu
 
-from utilities.constants import CHECKBUTTON_OFF, CHECKBUTTON_ON
+from utilities.constants import CHECKBUTTON_OFF, CHECKBUTTON_ON, TO_DO_SCROLL_ROWS
 from utilities.functions import show_error
 
+from core.profiling import profiled
+
 class ToDoWidget:
     """
     Class for to-do list megawidget
@@ -27,19 +29,39 @@ class ToDoWidget:
         self._to_do_frame.grid_propagate(False)
 
         self._to_do_frame.rowconfigure(0, weight=0)
-        self._to_do_frame.rowconfigure(1, weight=0)
-        self._to_do_frame.columnconfigure(0, weight=0)
+        self._to_do_frame.rowconfigure(1, weight=1)
+        self._to_do_frame.columnconfigure(0, weight=1)
+        self._to_do_frame.columnconfigure(1, weight=0)
 
         # Label for title
         self._to_do_label = tk.Label(self._to_do_frame, text='✔︎ to-do list', anchor='w', borderwidth=0, highlightthickness=0)
         self._to_do_label.grid(row=0, column=0, padx=(3, 0), pady=(3, 4), sticky='NWSE')
 
-        # Frame for tasks in to-do list
+        # Frame for tasks in to-do list, a viewport sized by the to-do frame rather than by its rows
         self._to_do_list_frame = tk.Frame(self._to_do_frame, borderwidth=0, highlightthickness=0)
         self._to_do_list_frame.grid(row=1, column=0, sticky='NWSE')
+        self._to_do_list_frame.grid_propagate(False)
+        self._to_do_list_frame.columnconfigure(0, weight=1)
+        self._to_do_list_frame.bind('<Configure>', self._to_do_list_resize)
+
+        # Scrollbar for tasks in to-do list
+        self._to_do_scrollbar = tk.Scrollbar(self._to_do_frame, orient='vertical', command=self._to_do_list_yview, borderwidth=0, highlightthickness=0)
+        self._to_do_scrollbar.grid(row=1, column=1, sticky='NS')
 
-        # List of checkbuttons for tasks
+        for widget in [self._to_do_list_frame, self._to_do_scrollbar]:
+            self._to_do_list_bind_wheel(widget)
+
+        # Checkbuttons for the tasks in view, the r-th one displaying the task at index _to_do_offset + r, and their states;
+        # only as many as fit in the viewport are created, and they are reused while scrolling
         self._to_do_list_display = []
+        self._to_do_list_button_states = []
+
+        # Index of the first task in view
+        self._to_do_offset = 0
+
+        # Number of rows that fit in the viewport, and the height of a row once known
+        self._to_do_rows_visible = 1
+        self._to_do_row_height = None
 
         # For entering tasks
         self._to_do_entry_variable = tk.StringVar(self._root)
@@ -53,23 +75,21 @@ class ToDoWidget:
         # Update to-do list to display tasks
         self._update_to_do()
     
-    def _to_do_list_toggle(self, item):
+    def _to_do_list_toggle(self, index):
         """
         Toggles the check box for an item
 
-        item: To-do list item, string
+        index: The index of the clicked item in the to-do list, int
         """
         try:
-            index = self._parent.to_do_list.index(item)
+            key = self._parent.model.to_do_list[index].get('key')
+            index, item = self._parent.model.to_do_toggle(key)
 
-            if self._parent.to_do_list[index].get('completion') == str(CHECKBUTTON_OFF):
-                self._parent.to_do_list[index]['completion'] = str(CHECKBUTTON_ON)
-            else:
-                self._parent.to_do_list[index]['completion'] = str(CHECKBUTTON_OFF)
+            # The check box already shows the new state; only make sure it matches the item
+            self._to_do_list_button_states[index - self._to_do_offset].set(int(item.get('completion')))
         except Exception as e:
             show_error('no such to-do list task.')
-        
-        self._update_to_do()
+            self._update_to_do()
     
     def _to_do_list_add(self, description):
         """
@@ -79,41 +99,53 @@ class ToDoWidget:
         """
         key = str(uuid.uuid4())
         item = {'key': key, 'completion': str(CHECKBUTTON_OFF), 'description': description}
-        self._parent.to_do_list.append(item)
+        self._parent.model.to_do_add(item)
 
-        self._update_to_do()
+        # Scroll to the new item, which is the only one displayed again unless scrolling was needed
+        self._to_do_scroll_to(len(self._parent.model.to_do_list) - self._to_do_rows_visible, first=len(self._parent.model.to_do_list) - 1)
     
-    def _to_do_list_edit_remove(self, index, total, item):
+    def _to_do_list_edit_remove(self, index):
         """
         Edits or removes an item from the to-do list
 
         index: The index of the clicked item in the to-do list, int
-        total: The number of items in the to-do list, int
-        item: Item to be removed, string
         """
+        # Items from the first one changed onwards are displayed again
+        first = index
+        last = index
+
         try:
             # Retrieve item key
-            key = self._parent.to_do_list[index].get('key')
+            total = len(self._parent.model.to_do_list)
+            item = self._parent.model.to_do_list[index]
+            key = item.get('key')
 
             if key is not None:
                 popup = ToDoMenu(self._parent, self._root, index, total, item)
                 result = popup.show()
                 popup = None
 
-                # Edit or remove item based on user response
+                # Edit or remove item based on user response, finding it again by key
                 if result[0] == 'remove':
-                    if self._parent.to_do_list[index]['key'] == key:
-                        del self._parent.to_do_list[index]
+                    index = self._parent.model.to_do_index(key)
+                    self._parent.model.to_do_remove(index)
+
+                    first = index
+                    last = None
 
                 elif result[0] == 'edit':
-                    if self._parent.to_do_list[index]['key'] == key:
-                        del self._parent.to_do_list[index]
-                        self._parent.to_do_list.insert(result[1], result[2])
+                    index = self._parent.model.to_do_index(key)
+                    self._parent.model.to_do_edit(index, result[1], result[2])
+
+                    first = min(index, result[1])
+                    last = max(index, result[1])
         except Exception as e:
             show_error('no such to-do list task.')
+            first = 0
+            last = None
         
         # Update displayed to-do list
-        self._update_to_do()
+        self._update_to_do_rows(first, last)
     
     def _to_do_entry_focus(self, *args):
         """
@@ -145,55 +177,165 @@ class ToDoWidget:
 
         self._to_do_entry_unfocus()
     
+    @profiled('ToDoWidget._update_to_do')
     def _update_to_do(self):
         """
         Updates to-do list to display current items
         """
-        self._to_do_list_display = []
-        self._to_do_list_button_states = [tk.IntVar() for _ in range(len(self._parent.to_do_list))]
+        self._update_to_do_rows(0)
+
+    @profiled('ToDoWidget._update_to_do_rows')
+    def _update_to_do_rows(self, first, last=None):
+        """
+        Updates the displayed items between two indices, inclusive; only items in view are displayed
 
+        first: Index of the first item to display again, int
+        last: Index of the last item to display again, int, or None for every item from first onwards
+        """
         try:
-            # Clear displayed items
-            self._clear_to_do_list_display()
-
-            # Display all to-do list items
-            total = len(self._parent.to_do_list)
-
-            for i in range(total):
-                item = self._parent.to_do_list[i]
-                self._to_do_list_button_states[i].set(int(item.get('completion')))
-
-                self._to_do_list_display.append(tk.Checkbutton(self._to_do_list_frame, text=item.get('description'), variable=self._to_do_list_button_states[i], onvalue=CHECKBUTTON_ON, offvalue=CHECKBUTTON_OFF, anchor='w', justify='left', command=lambda item=item: self._to_do_list_toggle(item)))
-                self._to_do_list_display[-1].config({'foreground': self._parent.colors.get('label_text_color')})
-                self._to_do_list_display[-1].config({'background': self._parent.colors.get('widget_color')})
-                self._to_do_list_display[-1].config({'highlightthickness': 0})
-                self._to_do_list_display[-1].bind('<Button-2>', lambda event, i=i, total=total, item=item: self._to_do_list_edit_remove(i, total, item))
-                self._to_do_list_display[-1].grid(row=i, column=0, padx=(2, 2), sticky='NWSE')
+            total = len(self._parent.model.to_do_list)
+
+            # Keep the view within the to-do list, for example after items at its end were removed
+            offset = max(0, min(self._to_do_offset, total - self._to_do_rows_visible))
+
+            if offset != self._to_do_offset:
+                self._to_do_offset = offset
+                first = 0
+                last = None
+
+            # Create the rows that fit in the viewport, then hide the ones that are not needed
+            while len(self._to_do_list_display) < self._to_do_rows_visible:
+                self._to_do_list_row_create(len(self._to_do_list_display))
+
+            if last is None:
+                last = total - 1
+
+            for r, row in enumerate(self._to_do_list_display):
+                i = self._to_do_offset + r
+
+                if r >= self._to_do_rows_visible or i >= total:
+                    row.grid_remove()
+                elif first <= i <= last:
+                    item = self._parent.model.to_do_list[i]
+
+                    row.config({'text': item.get('description')})
+                    self._to_do_list_button_states[r].set(int(item.get('completion')))
+                    row.grid()
+
+            self._to_do_scrollbar_update()
         except Exception as e:
             show_error('unable to load or update to-do list.')
-    
-    def _clear_to_do_list_display(self):
+
+    def _to_do_list_row_create(self, r):
+        """
+        Adds a row for displaying items of the to-do list
+
+        r: Position of the row in the viewport, int
+        """
+        self._to_do_list_button_states.append(tk.IntVar(self._root))
+
+        row = tk.Checkbutton(self._to_do_list_frame, variable=self._to_do_list_button_states[r], onvalue=CHECKBUTTON_ON, offvalue=CHECKBUTTON_OFF, anchor='w', justify='left', command=lambda r=r: self._to_do_list_toggle(self._to_do_offset + r))
+        row.config(self._parent.styles.get('label'))
+        row.config({'highlightthickness': 0})
+        row.bind('<Button-2>', lambda event, r=r: self._to_do_list_edit_remove(self._to_do_offset + r))
+        row.grid(row=r, column=0, padx=(2, 2), sticky='NWSE')
+        self._to_do_list_bind_wheel(row)
+
+        self._to_do_list_display.append(row)
+
+    def _to_do_list_resize(self, event):
+        """
+        Changes the number of rows in view to fit the viewport
+
+        event: Configure event of the viewport, tkinter event
+        """
+        # Measure a row the first time, as all rows have the same height
+        if self._to_do_row_height is None:
+            if not self._to_do_list_display:
+                self._to_do_list_row_create(0)
+
+            self._to_do_row_height = max(1, self._to_do_list_display[0].winfo_reqheight())
+
+        rows_visible = max(1, event.height // self._to_do_row_height)
+
+        if rows_visible != self._to_do_rows_visible:
+            self._to_do_rows_visible = rows_visible
+            self._update_to_do_rows(self._to_do_offset)
+
+    def _to_do_scroll_to(self, offset, first=None):
+        """
+        Scrolls the to-do list so the item at the given index is the first in view
+
+        offset: Index of the item, int
+        first: Index of the first item to display again if the view does not move, int, or None for none
+        """
+        offset = max(0, min(offset, len(self._parent.model.to_do_list) - self._to_do_rows_visible))
+
+        if offset != self._to_do_offset:
+            self._to_do_offset = offset
+            self._update_to_do_rows(offset)
+        elif first is not None:
+            self._update_to_do_rows(first)
+        else:
+            self._to_do_scrollbar_update()
+
+    def _to_do_list_yview(self, *args):
         """
-        Clears displayed to-do list items
+        Scrolls the to-do list as asked by the scrollbar
+
+        args: Either ('moveto', fraction) or ('scroll', number, 'units' or 'pages')
+        """
+        if args[0] == 'moveto':
+            self._to_do_scroll_to(round(float(args[1]) * len(self._parent.model.to_do_list)))
+        elif args[0] == 'scroll':
+            step = self._to_do_rows_visible if args[2] == 'pages' else 1
+            self._to_do_scroll_to(self._to_do_offset + int(args[1]) * step)
+
+    def _to_do_list_wheel(self, event):
+        """
+        Scrolls the to-do list with the mouse wheel
+
+        event: Mouse wheel event, tkinter event
+        """
+        if event.num == 4 or event.delta > 0:
+            self._to_do_scroll_to(self._to_do_offset - TO_DO_SCROLL_ROWS)
+        elif event.num == 5 or event.delta < 0:
+            self._to_do_scroll_to(self._to_do_offset + TO_DO_SCROLL_ROWS)
+
+    def _to_do_list_bind_wheel(self, widget):
         """
-        for child in self._to_do_list_frame.winfo_children():
-            child.destroy()
+        Scrolls the to-do list when the mouse wheel is used over the given widget
+
+        widget: Widget in the to-do list, tkinter widget
+        """
+        for sequence in ['<MouseWheel>', '<Button-4>', '<Button-5>']:
+            widget.bind(sequence, self._to_do_list_wheel)
+
+    def _to_do_scrollbar_update(self):
+        """
+        Sets the scrollbar to the part of the to-do list in view
+        """
+        total = len(self._parent.model.to_do_list)
+
+        if total <= self._to_do_rows_visible:
+            self._to_do_scrollbar.set(0, 1)
+        else:
+            self._to_do_scrollbar.set(self._to_do_offset / total, (self._to_do_offset + self._to_do_rows_visible) / total)
     
     def change_colors(self):
         """
         Changes colors for this megawidget and all descendant widgets based on current theme mode
         """
         # Change color for all descendant widgets
-        self._to_do_frame.config({'background': self._parent.colors.get('widget_color')})
+        self._to_do_frame.config(self._parent.styles.get('frame'))
 
-        self._to_do_label.config({'foreground': self._parent.colors.get('label_text_color')})
-        self._to_do_label.config({'background': self._parent.colors.get('widget_color')})
+        self._to_do_label.config(self._parent.styles.get('label'))
         
-        self._to_do_list_frame.config({'background': self._parent.colors.get('widget_color')})
+        self._to_do_list_frame.config(self._parent.styles.get('frame'))
 
         for widget in self._to_do_list_display:
-            widget.config({'foreground': self._parent.colors.get('label_text_color')})
-            widget.config({'background': self._parent.colors.get('widget_color')})
+            widget.config(self._parent.styles.get('label'))
+
+        self._to_do_scrollbar.config(self._parent.styles.get('scrollbar'))
         
-        self._to_do_entry.config({'foreground': self._parent.colors.get('prompt_text_color')})
-        self._to_do_entry.config({'background': self._parent.colors.get('widget_color')})
\ No newline at end of file
+        self._to_do_entry.config(self._parent.styles.get('prompt_entry'))
\ No newline at end of file
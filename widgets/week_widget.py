@@ -1,11 +1,18 @@
+import calendar
 import datetime
 
 import tkinter as tk
 
 from widgets.event_menu import EventMenu
+from widgets.search_menu import SearchMenu
 
-from utilities.functions import show_error, light_or_dark_mode_text, widget_pressed, widget_released
-from utilities.constants import NUMBER_DAYS_IN_WEEK, EVENT_LABEL_WRAPLENGTH
+from utilities.functions import show_error, widget_pressed, widget_released
+from utilities.theme import contrast_text_color
+from utilities.constants import NUMBER_DAYS_IN_WEEK, NUMBER_HOURS_IN_DAY, NUMBER_MINUTES_IN_HOUR, EVENT_LABEL_WRAPLENGTH, EVENT_LABEL_MINIMUM_MINUTES, WEEK_LAYOUT_CACHE_DAYS, WEEK_LAYOUT_CACHE_WEEKS
+
+from core.recurrence import date_to_key
+from core.day_layout import overlap_columns
+from core.profiling import profiled
 
 class WeekWidget:
     """
@@ -36,6 +43,17 @@ class WeekWidget:
         self._week_label = tk.Label(self._week_frame, anchor='w')
         self._week_label.grid(row=0, column=0, columnspan=2, padx=(3, 0), pady=(3, 0), sticky='NWS')
 
+        # Button to search events and tasks, also opened with control-f
+        self._search_label = tk.Label(self._week_frame, text=' ⌕ search ', borderwidth=0, highlightthickness=0)
+        self._search_label.bind('<Button-1>', self._show_search)
+        self._search_label.bind('<ButtonRelease>', lambda event: widget_released(event.widget, self._parent.colors))
+        self._search_label.grid(row=0, column=3, padx=(0, 6), sticky='NSE')
+
+        self._root.bind('<Control-f>', self._show_search)
+
+        # Search menu, opened by the search button
+        self._search_menu = None
+
         # Frame for previous, current, and next week buttons
         self._week_buttons_frame = tk.Frame(self._week_frame, borderwidth=0, highlightthickness=0)
         self._week_buttons_frame.grid(row=0, column=4, columnspan=3, sticky='NSE')
@@ -67,6 +85,27 @@ class WeekWidget:
         self._week_day_separators = [[] for _ in range(NUMBER_DAYS_IN_WEEK)]
         self._week_day_time_references = [[] for _ in range(NUMBER_DAYS_IN_WEEK)]
 
+        # Pools of event labels for each day, reused between updates
+        self._week_events_labels = [[] for _ in range(NUMBER_DAYS_IN_WEEK)]
+
+        # Event displayed by each pooled label, (key, event_id)
+        self._week_events_references = [[] for _ in range(NUMBER_DAYS_IN_WEEK)]
+
+        # Number of pooled labels currently displayed for each day; event labels are kept apart from the day decorations
+        self._week_events_shown = [0 for _ in range(NUMBER_DAYS_IN_WEEK)]
+
+        # Placement of overlapping events of recently displayed days, least recently used first, kept until the day changes
+        # {day: {event_id: (column, columns)}}
+        self._day_layouts = {}
+
+        # Layouts of recently displayed weeks and of the weeks next to the displayed one, least recently used first, with the
+        # schedule version they were computed at
+        # {sunday: (schedule_generation, layout)}
+        self._week_layouts = {}
+
+        # Pending preparation of the adjacent weeks, None if there is none
+        self._prefetch_after = None
+
         for i in range(NUMBER_DAYS_IN_WEEK):
             # Label for the day of the week and the date
             self._week_days_labels.append(tk.Label(self._week_frame, anchor='w'))
@@ -116,60 +155,185 @@ class WeekWidget:
             self._week_day_time_references[i].append(tk.Frame(self._week_days[i], borderwidth=0, highlightthickness=0))
             self._week_day_time_references[i][-1].place(relx=0.01, rely=0.7459, relwidth=1, relheight=0.001)
         
+        # Forget the placement of events of changed days
+        self._parent.model.add_listener(self._schedule_changed)
+
         # Update displayed week to include events
         self.update_week()
     
+    @profiled('WeekWidget.update_week')
     def update_week(self):
         """
         Updates displayed week and show all scheduled events for that week
         """
-        self._displayed_days = ['' for _ in range(NUMBER_DAYS_IN_WEEK)]
-        self._week_events_labels = [[] for _ in range(NUMBER_DAYS_IN_WEEK)]
-
-        # Date of first day of week
-        self._week_label.config(text='week of ' + self._parent.displayed_sunday.strftime('%m/%d') + ', ' + str(self._parent.displayed_sunday.year))
+        self._displayed_days = [None for _ in range(NUMBER_DAYS_IN_WEEK)]
 
         # Display scheduled events by day
         try:
-            for i in range(NUMBER_DAYS_IN_WEEK):
-                # Clear the day
-                self._clear_day(self._week_days[i])
+            week_layout = self._week_layout(self._parent.displayed_sunday)
 
-                # Display the day of the week and the date
-                displayed_day = self._parent.displayed_sunday + datetime.timedelta(days=i)
-                year = displayed_day.strftime('%Y')
-                month = displayed_day.strftime('%m')
-                day = displayed_day.strftime('%d')
-                key = (year, month, day)
+            # Date of first day of week
+            self._week_label.config(text=week_layout.get('title'))
 
+            for i, (key, title, events) in enumerate(week_layout.get('days')):
+                # Display the day of the week and the date
                 self._displayed_days[i] = key
-                self._week_days_labels[i].config(text=displayed_day.strftime('%A').lower() + ' ' + day)
-                
-                # Retrieve events for the day
-                events = self._parent.schedule.get(self._displayed_days[i])
-
-                # Display each event
-                if events is not None:
-                    for event_id, event_info in events.items():
-                        self._week_events_labels[i].append(tk.Label(self._week_days[i], text=event_info.get('hour') + ':' + event_info.get('minute') + ' ' + event_info.get('description').strip(), anchor='nw', justify='left'))
-                        self._week_events_labels[i][-1].config({'foreground': light_or_dark_mode_text(tuple(int(event_info.get('hex_color')[1:][j:j + 2], 16) for j in (0, 2, 4)))})
-                        self._week_events_labels[i][-1].config({'background': event_info.get('hex_color')})
-                        self._week_events_labels[i][-1].config({'wraplength': EVENT_LABEL_WRAPLENGTH})
-                        self._week_events_labels[i][-1].bind('<Button-1>', lambda event: event.widget.lift())
-                        self._week_events_labels[i][-1].bind('<Button-2>', lambda event, key=key, event_id=event_id: self._schedule_edit_remove(key, event_id))
-
-                        # Event display size based on duration
-                        y = self._fraction_of_day(int(event_info.get('hour')), int(event_info.get('minute')))
-
-                        if event_info.get('duration_hour') == '0'.zfill(2) and event_info.get('duration_minute') == '0'.zfill(2):
-                            self._week_events_labels[i][-1].place(relx=0.05, rely=y)
-                        else:
-                            h = self._fraction_of_day(int(event_info.get('duration_hour')), int(event_info.get('duration_minute')))
-                            self._week_events_labels[i][-1].place(relx=0.05, rely=y, relheight=h)
+                self._week_days_labels[i].config(text=title)
+
+                # Display each event, reusing pooled labels
+                for j, (event_id, options, place) in enumerate(events):
+                    if j == len(self._week_events_labels[i]):
+                        self._week_event_label_create(i)
+
+                    label = self._week_events_labels[i][j]
+                    self._week_events_references[i][j] = (key, event_id)
+
+                    label.config(options)
+                    label.place(place)
+
+                    self._week_events_shown[i] = max(self._week_events_shown[i], j + 1)
+
+                # Hide the labels no longer needed
+                self._clear_day(i, len(events))
 
         except Exception as e:
             show_error('unable to load or update events.')
 
+        # Prepare the adjacent weeks once the window is idle
+        if self._prefetch_after is None:
+            self._prefetch_after = self._root.after_idle(self._prefetch)
+
+    @profiled('WeekWidget._week_layout')
+    def _week_layout(self, sunday):
+        """
+        Returns the text, colors, and placement of everything displayed for a week; kept until the schedule changes
+
+        sunday: First day of the week, datetime
+        return: Dictionary with the keys 'title', the week label text, and 'days', a list of tuples for each day,
+                (key, day label text, [(event_id, label options, place options), ... ])
+        """
+        sunday_key = date_to_key(sunday)
+        generation = self._parent.model.schedule_generation
+        cached = self._week_layouts.pop(sunday_key, None)
+
+        if cached is not None and cached[0] == generation:
+            week_layout = cached[1]
+        else:
+            # Retrieve events for the week, expanding recurring events only within it
+            week = self._parent.model.events_between(sunday.date(), sunday.date() + datetime.timedelta(days=NUMBER_DAYS_IN_WEEK - 1))
+            days = []
+
+            for i in range(NUMBER_DAYS_IN_WEEK):
+                day = sunday + datetime.timedelta(days=i)
+                key = sunday_key + i
+
+                # Retrieve events for the day, and their columns
+                events = week.get(key, {})
+                layout = self._day_layout(key, events)
+                labels = []
+
+                for event_id, event_info in events.items():
+                    options = {'text': str(event_info.hour).zfill(2) + ':' + str(event_info.minute).zfill(2) + ' ' + event_info.description,
+                                'foreground': contrast_text_color(event_info.color),
+                                'background': event_info.hex_color}
+
+                    # Event display size based on duration
+                    y = self._fraction_of_day(event_info.start)
+                    h = self._fraction_of_day(event_info.duration) if event_info.duration > 0 else ''
+
+                    # Overlapping events side by side, each in an equal share of the width of the day
+                    column, columns = layout.get(event_id, (0, 1))
+
+                    if columns == 1:
+                        place = {'relx': 0.05, 'rely': y, 'relheight': h, 'relwidth': ''}
+                    else:
+                        place = {'relx': 0.05 + column * 0.95 / columns, 'rely': y, 'relheight': h, 'relwidth': 0.95 / columns}
+
+                    labels.append((event_id, options, place))
+
+                days.append((key, calendar.day_name[day.weekday()].lower() + ' ' + str(day.day).zfill(2), labels))
+
+            week_layout = {'title': 'week of ' + sunday.strftime('%m/%d') + ', ' + str(sunday.year), 'days': days}
+
+        # Keep the most recently used weeks last, and only the most recent ones
+        self._week_layouts[sunday_key] = (generation, week_layout)
+
+        if len(self._week_layouts) > WEEK_LAYOUT_CACHE_WEEKS:
+            del self._week_layouts[next(iter(self._week_layouts))]
+
+        return week_layout
+
+    def _prefetch(self):
+        """
+        Prepares the layout of a week next to the displayed one that is not ready, then waits for the window to be idle again
+        until both are ready
+        """
+        self._prefetch_after = None
+        generation = self._parent.model.schedule_generation
+
+        for num in [1, -1]:
+            sunday = self._parent.displayed_sunday + num * datetime.timedelta(days=NUMBER_DAYS_IN_WEEK)
+            cached = self._week_layouts.get(date_to_key(sunday))
+
+            if cached is None or cached[0] != generation:
+                try:
+                    self._week_layout(sunday)
+                except Exception:
+                    # The week is laid out again, reporting the error, when displayed
+                    return
+
+                self._prefetch_after = self._root.after_idle(self._prefetch)
+                return
+
+    def _day_layout(self, key, events):
+        """
+        Returns the columns of the events of a day, placing overlapping events side by side; kept until the day changes
+
+        key: Day ordinal, int
+        events: Events of the day, {event_id: Event}
+        return: Dictionary, {event_id: (column, number of columns)}
+        """
+        layout = self._day_layouts.pop(key, None)
+
+        if layout is None:
+            layout = overlap_columns((event_info.start, event_info.start + max(event_info.duration, EVENT_LABEL_MINIMUM_MINUTES), event_id) for event_id, event_info in events.items())
+
+        # Keep the most recently used days last, and only the most recent ones
+        self._day_layouts[key] = layout
+
+        if len(self._day_layouts) > WEEK_LAYOUT_CACHE_DAYS:
+            del self._day_layouts[next(iter(self._day_layouts))]
+
+        return layout
+
+    def _schedule_changed(self, key, event_id, event_info):
+        """
+        Forgets the placement of events of the changed days
+
+        key: Day ordinal, int, or None after a change that may affect several days
+        event_id: Unique identifier of the event, UUID, string, or None
+        event_info: Event information, Event, or None
+        """
+        if key is None:
+            self._day_layouts = {}
+        else:
+            self._day_layouts.pop(key, None)
+
+    def _week_event_label_create(self, i):
+        """
+        Adds a label to the pool of event labels of a day
+
+        i: The day as the number of days after the displayed Sunday, int
+        """
+        j = len(self._week_events_labels[i])
+
+        label = tk.Label(self._week_days[i], anchor='nw', justify='left', wraplength=EVENT_LABEL_WRAPLENGTH)
+        label.bind('<Button-1>', lambda event: event.widget.lift())
+        label.bind('<Button-2>', lambda event, i=i, j=j: self._schedule_edit_remove(*self._week_events_references[i][j]))
+
+        self._week_events_labels[i].append(label)
+        self._week_events_references[i].append(None)
+
     def change_week(self, num=None, day=None, widget=None):
         """
         Updates displayed week; accepts either, but not both, of the keyword arguments num and day
@@ -213,104 +377,105 @@ class WeekWidget:
         widget_pressed(self._next_week_label, self._parent.colors)
         self.change_week(num=1)
         
+    def _show_search(self, event):
+        """
+        Opens the search menu, or brings it to the front if already open
+
+        event: Click or key press event, tkinter event
+        """
+        if event.widget is self._search_label:
+            widget_pressed(self._search_label, self._parent.colors)
+
+        if self._search_menu is not None and self._search_menu.is_open():
+            self._search_menu.lift()
+        else:
+            self._search_menu = SearchMenu(self._parent, self._root)
+
     def _schedule_edit_remove(self, key, event_id):
         """
         Edits or removes a scheduled event and, optionally, its recurrences, if any
 
-        key: Tuple of strings, (yyyy, mm, dd)
-        event_id: unique identifier of the event, UUID, string
+        key: Day ordinal, int
+        event_id: unique identifier of the event, or of the recurrence for occurrences of recurring events, UUID, string
         """
         try:
             # Retrieve event info
-            value = self._parent.schedule.get(key)
-            event_info = value.get(event_id)
+            event_info = self._parent.model.schedule_event(key, event_id)
 
-            if value is not None and event_info is not None:
+            if event_info is not None:
                 popup = EventMenu(self._parent, self._root, key, event_info)
                 result = popup.show()
                 popup = None
 
                 # Edit or remove event(s) based on user response
                 if result[0] == 'remove':
-                    del self._parent.schedule[key][event_id]
+                    self._parent.model.schedule_remove_occurrence(key, event_id)
 
                 elif result[0] == 'remove_all':
-                    keys_list = []
-                    recurrence_id = event_info.get('recurrence_id')
-
-                    for date_key, events in self._parent.schedule.items():
-                        for uuid_key, info in events.items():
-                            if info.get('recurrence_id') == recurrence_id:
-                                keys_list.append((date_key, uuid_key))
-                    
-                    for item in keys_list:
-                        del self._parent.schedule[item[0]][item[1]]
+                    self._parent.model.schedule_remove_series(event_info.recurrence_id)
 
                 elif result[0] == 'edit':
-                    self._parent.schedule[key][event_id] = result[1]
+                    self._parent.model.schedule_edit_occurrence(key, event_id, result[1])
                 
                 elif result[0] == 'edit_all':
-                    recurrence_id = event_info.get('recurrence_id')
-
-                    for date_key, events in self._parent.schedule.items():
-                        for uuid_key, info in events.items():
-                            if info.get('recurrence_id') == recurrence_id:
-                                self._parent.schedule[date_key][uuid_key] = result[1]
+                    self._parent.model.schedule_edit_series(event_info.recurrence_id, result[1])
         except Exception as e:
             show_error('no such scheduled event.')
         
         # Update displayed week
         self.update_week()
     
-    def _clear_day(self, parent):
+    def _clear_day(self, i, start=0):
         """
-        Clears displayed events of a day
+        Hides displayed events of a day; their labels are kept for reuse
+
+        Only the pooled event labels of the day are visited, never its visual, non-event elements
 
-        parent: The day to clear, tk.Frame
+        i: The day to clear as the number of days after the displayed Sunday, int
+        start: Number of displayed event labels to keep, int
         """
-        for child in parent.winfo_children():
-            # Do not clear visual, non-event elements
-            if not any(child in element for element in self._week_day_time_references) and not any(child in element for element in self._week_day_separators):
-                child.destroy()
+        for label in self._week_events_labels[i][start:self._week_events_shown[i]]:
+            label.place_forget()
+
+        self._week_events_shown[i] = min(start, self._week_events_shown[i])
     
-    def _fraction_of_day(self, hour, minute):
+    def _fraction_of_day(self, minutes):
         """
         Returns the fraction of the day corresponding to the given time
 
-        hour: Hour, int
-        minute: Minute, int
+        minutes: Number of minutes, int
         return: Fraction of the day, float
         """
-        return (hour * 60 + minute) / (24 * 60)
+        return minutes / (NUMBER_HOURS_IN_DAY * NUMBER_MINUTES_IN_HOUR)
     
     def change_colors(self):
         """
         Changes colors for this megawidget and all descendant widgets based on current theme mode
         """
         # Change color for all descendant widgets
-        self._week_frame.config({'background': self._parent.colors.get('widget_color')})
+        self._week_frame.config(self._parent.styles.get('frame'))
 
         for widget in self._week_days:
-            widget.config({'background': self._parent.colors.get('widget_color')})
+            widget.config(self._parent.styles.get('frame'))
         
         for widget in self._week_days_labels:
-            widget.config({'foreground': self._parent.colors.get('label_text_color')})
-            widget.config({'background': self._parent.colors.get('widget_color')})
+            widget.config(self._parent.styles.get('label'))
 
         for day in self._week_day_separators:
             for widget in day:
-                widget.config({'background': self._parent.colors.get('background_color')})
+                widget.config(self._parent.styles.get('background'))
 
         for day in self._week_day_time_references:
             for widget in day:
                 if type(widget) is tk.LabelFrame:
-                    widget.config({'foreground': self._parent.colors.get('faint_text_color')})
-                    widget.config({'background': self._parent.colors.get('widget_color')})
+                    widget.config(self._parent.styles.get('faint_label'))
                 elif type(widget) is tk.Frame:
-                    widget.config({'background': self._parent.colors.get('faint_display_color')})
+                    widget.config(self._parent.styles.get('faint_line'))
+
+        self._week_buttons_frame.config(self._parent.styles.get('frame'))
 
-        self._week_buttons_frame.config({'background': self._parent.colors.get('widget_color')})
+        for widget in [self._week_label, self._search_label, self._previous_week_label, self._current_week_label, self._next_week_label]:
+            widget.config(self._parent.styles.get('label'))
 
-        for widget in [self._week_label, self._previous_week_label, self._current_week_label, self._next_week_label]:
-            widget.config({'foreground': self._parent.colors.get('label_text_color')})
-            widget.config({'background': self._parent.colors.get('widget_color')})
\ No newline at end of file
+        if self._search_menu is not None and self._search_menu.is_open():
+            self._search_menu.change_colors()
\ No newline at end of file